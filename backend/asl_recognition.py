@@ -1,14 +1,35 @@
 import cv2
 import numpy as np
 import random
-from typing import List, Tuple, Dict
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Dict, Iterable, Iterator, Optional
 import os
 
+from frame_cache import FrameCache
+from hand_tracking import HandTracker, check_available, landmark_bounds
+from landmarks import LANDMARK_DIMS, NUM_LANDMARKS, hands_present, load_landmark_classifier, normalize_landmarks
+from segmentation import LetterSegmenter
+from sampling import MotionSampler
+from telemetry import get_logger, record, span, current_trace
+
+logger = get_logger('recognition')
+
 class ASLRecognition:
-    def __init__(self):
-        """Initialize simplified ASL recognition system (MediaPipe not available)"""
-        print("✅ Simplified ASL Recognition initialized (MediaPipe not available)")
+    def __init__(self, frame_cache_dir: Optional[str] = None, frame_cache_max_bytes: int = 512 * 1024 * 1024,
+                 segmenter_options: Optional[Dict] = None, motion_options: Optional[Dict] = None,
+                 clip_classifier_options: Optional[Dict] = None, landmark_model_path: Optional[str] = None,
+                 hand_tracking_options: Optional[Dict] = None):
+        """Initialize ASL recognition, simplified unless clip_classifier_options select the MoViNet model
         
+        landmark_model_path is the .npz landmark classifier for client-extracted
+        hand landmarks (see landmarks.py); without it they get simplified predictions.
+        hand_tracking_options (HandTracker arguments) turn on MediaPipe hand landmarks
+        for videos and live frames, classified like client-extracted ones.
+        """
         # ASL alphabet mapping (26 letters)
         self.asl_alphabet = {
             0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H', 8: 'I', 9: 'J',
@@ -19,21 +40,95 @@ class ASLRecognition:
         # Sample ASL sequences for demonstration
         self.sample_sequences = ["HELLO", "WORLD", "THANK YOU", "PLEASE", "GOOD", "MORNING", "NIGHT", "YES", "NO", "HELP"]
         
-        print("✅ ASL Recognition ready with sample sequences")
+        # Optional on-disk cache of sampled hand regions, so re-recognition skips decoding
+        self.frame_cache = FrameCache(frame_cache_dir, frame_cache_max_bytes) if frame_cache_dir else None
+        
+        # Thresholds and gaps of the letter segmenter used by get_asl_sequence
+        self.segmenter_options = segmenter_options or {}
+        
+        # Motion-gated sampling settings, None samples every sample_rate-th frame
+        self.motion_options = motion_options
+        
+        # MoViNet clip classifier over whole frames, replaces the per-frame simplified classifier
+        self.clip_classifier = None
+        if clip_classifier_options is not None:
+            # TensorFlow is only imported when the MoViNet backend is selected
+            from movinet import get_clip_classifier
+            self.clip_classifier = get_clip_classifier(**clip_classifier_options)
+            logger.info(f"MoViNet clip classifier loaded from {self.clip_classifier.checkpoint_path}")
+        
+        # Classifier for hand landmarks extracted on the client, no video decoding involved
+        self.landmark_classifier = load_landmark_classifier(landmark_model_path)
+        
+        # MediaPipe hand tracking, one tracker per video or live session since it follows the hand across frames
+        self.hand_tracking_options = hand_tracking_options
+        if hand_tracking_options is not None:
+            check_available()
+            expected = hand_tracking_options.get('max_hands', 1) * NUM_LANDMARKS * LANDMARK_DIMS
+            if self.landmark_classifier is not None and self.landmark_classifier.input_size != expected:
+                raise ValueError(f"The landmark model takes {self.landmark_classifier.input_size} features, "
+                                 f"hand tracking produces {expected}")
+            logger.info("MediaPipe hand tracking enabled")
+        
+        # The pipeline actually in use, so operators can tell the demo classifier from the real models
+        if self.clip_classifier is not None:
+            video_classifier = 'movinet'
+        elif hand_tracking_options is not None and self.landmark_classifier is not None:
+            video_classifier = 'landmarks'
+        else:
+            video_classifier = 'simplified'
+        logger.info(f"ASL Recognition ready ({video_classifier} video classifier)", extra={'fields': {
+            'video_classifier': video_classifier,
+            'movinet_checkpoint': self.clip_classifier.checkpoint_path if self.clip_classifier is not None else None,
+            'hand_tracking': hand_tracking_options is not None,
+            'landmark_model': self.landmark_classifier.model_path if self.landmark_classifier is not None else None,
+            'motion_gating': motion_options is not None,
+            'frame_cache': frame_cache_dir
+        }})
         
     def load_asl_model(self):
         """Simplified model loading (no TensorFlow required)"""
-        print("✅ Using simplified ASL recognition (no deep learning model)")
+        logger.info("Using simplified ASL recognition (no deep learning model)")
         return "simplified"
     
-    def extract_hand_features(self, frame: np.ndarray) -> np.ndarray:
-        """Extract hand features from frame (simplified version)"""
-        # For demonstration, we'll just return a sample hand region
-        # In a real system, this would detect hands and extract features
-        
+    def extract_hand_features(self, frame: np.ndarray, landmarks: Optional[np.ndarray] = None) -> np.ndarray:
+        """Extract the 64x64 hand region of a frame, around the tracked hand when its landmarks are given"""
         # Get frame dimensions
         h, w, _ = frame.shape
+        bounds = landmark_bounds(landmarks, h, w) if landmarks is not None else None
+        
+        # Without tracked landmarks, fall back to a fixed region in the center of the frame
+        x_min, y_min, x_max, y_max = bounds or self._hand_region_bounds(h, w)
         
+        # Extract region and resize
+        hand_region = frame[y_min:y_max, x_min:x_max]
+        if hand_region.size > 0:
+            hand_region = cv2.resize(hand_region, (64, 64))
+            return hand_region
+        
+        return None
+    
+    def extract_hand_features_batch(self, frames: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """Extract 64x64 hand regions from an (N, H, W, 3) uint8 frame stack"""
+        n, h, w, c = frames.shape
+        x_min, y_min, x_max, y_max = self._hand_region_bounds(h, w)
+        
+        # Crop the whole stack with a single slice
+        crops = frames[:, y_min:y_max, x_min:x_max]
+        if crops.size == 0:
+            return None
+        
+        if out is None:
+            out = np.empty((n, 64, 64, c), dtype=frames.dtype)
+        
+        # Resize straight into the output buffer, no per-frame allocations
+        for i in range(n):
+            cv2.resize(crops[i], (64, 64), dst=out[i])
+        
+        return out
+    
+    def _hand_region_bounds(self, h: int, w: int) -> Tuple[int, int, int, int]:
+        """Get the (x_min, y_min, x_max, y_max) box of the hand region in a frame"""
         # Create a simple hand region (center of frame)
         center_x, center_y = w // 2, h // 2
         size = min(w, h) // 4
@@ -43,13 +138,7 @@ class ASLRecognition:
         x_max = min(w, center_x + size)
         y_max = min(h, center_y + size)
         
-        # Extract region and resize
-        hand_region = frame[y_min:y_max, x_min:x_max]
-        if hand_region.size > 0:
-            hand_region = cv2.resize(hand_region, (64, 64))
-            return hand_region
-        
-        return None
+        return x_min, y_min, x_max, y_max
     
     def predict_asl_letter(self, hand_features: np.ndarray) -> Tuple[str, float]:
         """Predict ASL letter from hand features (simplified version)"""
@@ -67,11 +156,124 @@ class ASLRecognition:
             return letter, confidence
             
         except Exception as e:
-            print(f"Error predicting ASL letter: {e}")
+            logger.error(f"Error predicting ASL letter: {e}")
             return None, 0.0
     
-    def process_video_frame(self, frame: np.ndarray) -> Dict:
-        """Process a single video frame for ASL recognition (simplified)"""
+    def predict_asl_letter_batch(self, hand_features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Predict ASL letters for an (N, 64, 64, 3) stack of hand regions (simplified version)"""
+        n = len(hand_features)
+        
+        # For demonstration, return random letters with high confidence
+        # In a real system, this would be one forward pass of the trained model
+        letters = np.array([self.asl_alphabet[i] for i in range(len(self.asl_alphabet))])
+        indices = np.random.randint(0, len(letters), size=n)
+        confidences = np.random.uniform(0.7, 0.95, size=n).astype(np.float32)
+        
+        return letters[indices], confidences
+    
+    def predict_landmarks_batch(self, features: np.ndarray) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Predict ASL letters for an (N, hands * 63) matrix of normalized landmarks"""
+        if self.landmark_classifier is not None:
+            return self.landmark_classifier.predict(features)
+        
+        # For demonstration, return random letters with high confidence like the other simplified paths
+        letters, confidences = self.predict_asl_letter_batch(features)
+        return [str(letter) for letter in letters], confidences
+    
+    def process_landmarks(self, landmarks: np.ndarray, timestamps: np.ndarray, trace=None) -> List[Dict]:
+        """Classify an (N, hands, 21, 3) array of per-frame hand landmarks taken at the given timestamps"""
+        present = hands_present(landmarks).any(axis=1)
+        results = [
+            {
+                'letter': None,
+                'confidence': 0.0,
+                'hand_detected': bool(detected),
+                'landmarks': [],
+                'frame_number': index,
+                'timestamp': float(timestamp)
+            }
+            for index, (detected, timestamp) in enumerate(zip(present, timestamps))
+        ]
+        
+        if not present.any():
+            return results
+        
+        # Frames without a hand are not classified
+        with span('feature_extraction', trace):
+            features = normalize_landmarks(landmarks[present])
+        
+        try:
+            with span('prediction', trace):
+                letters, confidences = self.predict_landmarks_batch(features)
+        except Exception as e:
+            logger.error(f"Error predicting ASL letters from landmarks: {e}")
+            return results
+        
+        for index, letter, confidence in zip(np.flatnonzero(present), letters, confidences):
+            results[index]['letter'] = letter
+            results[index]['confidence'] = float(confidence)
+        
+        return results
+    
+    def process_tracked_hands(self, frames: List[np.ndarray], landmarks: np.ndarray, timestamps: np.ndarray,
+                              trace=None) -> List[Dict]:
+        """Classify frames by their tracked (N, hands, 21, 3) landmarks
+        
+        With a landmark model the landmarks are classified directly; otherwise the
+        64x64 region around the tracked hand goes to the hand region classifier.
+        Each result carries the landmarks of its frame as nested (hands, 21, 3)
+        lists, so results stay JSON-serialisable like those of the other paths.
+        """
+        if self.landmark_classifier is not None:
+            results = self.process_landmarks(landmarks, timestamps, trace)
+        else:
+            results = [
+                {
+                    'letter': None,
+                    'confidence': 0.0,
+                    'hand_detected': False,
+                    'landmarks': [],
+                    'frame_number': index,
+                    'timestamp': float(timestamp)
+                }
+                for index, timestamp in enumerate(timestamps)
+            ]
+            indices = np.flatnonzero(hands_present(landmarks).any(axis=1))
+            if len(indices):
+                with span('feature_extraction', trace):
+                    regions = np.stack([self.extract_hand_features(frames[i], landmarks[i]) for i in indices])
+                with span('prediction', trace):
+                    classified = self.process_hand_regions(regions, len(indices))
+                for index, region_result in zip(indices, classified):
+                    results[index].update(region_result)
+        
+        for result, frame_landmarks in zip(results, landmarks):
+            result['landmarks'] = frame_landmarks.tolist()
+        return results
+    
+    def get_landmark_sequence(self, landmarks: np.ndarray, timestamps: np.ndarray) -> Tuple[str, float]:
+        """Extract the ASL letter sequence of per-frame hand landmarks and its confidence"""
+        return self._segment(self.process_landmarks(landmarks, timestamps), self.landmark_classifier is None)
+    
+    def create_hand_tracker(self) -> Optional[HandTracker]:
+        """Hand tracker for one sequence of frames, None when hand tracking is off or MoViNet classifies whole frames"""
+        if self.hand_tracking_options is None or self.clip_classifier is not None:
+            return None
+        return HandTracker(**self.hand_tracking_options)
+    
+    def create_stream(self):
+        """Per-session streaming state for process_video_frame, None when frames are classified independently
+        
+        That is a MoViNet stream with a streaming checkpoint, or a hand tracker with hand tracking on.
+        """
+        if self.clip_classifier is None:
+            return self.create_hand_tracker()
+        if self.clip_classifier.stream_checkpoint_path is None:
+            return None
+        return self.clip_classifier.create_stream()
+    
+    def process_video_frame(self, frame: np.ndarray, stream=None) -> Dict:
+        """Process a single video frame for ASL recognition, continuing a stream from create_stream if given"""
         result = {
             'letter': None,
             'confidence': 0.0,
@@ -79,6 +281,29 @@ class ASLRecognition:
             'landmarks': []
         }
         
+        if self.clip_classifier is not None:
+            if stream is not None:
+                letter, confidence = stream.push(frame)
+            else:
+                # Without a streaming checkpoint, the frame is classified as a clip of its own
+                letters, confidences = self.clip_classifier.predict_clips(frame[np.newaxis, np.newaxis])
+                letter, confidence = letters[0], float(confidences[0])
+            result['letter'] = letter
+            result['confidence'] = confidence
+            result['hand_detected'] = letter is not None
+            return result
+        
+        if stream is not None:
+            # The session's hand tracker, classify the landmarks of its tracked hands
+            with span('hand_tracking'):
+                landmarks = stream.process(frame)
+            tracked = self.process_tracked_hands([frame], landmarks[np.newaxis], np.zeros(1, dtype=np.float32))[0]
+            result['letter'] = tracked['letter']
+            result['confidence'] = tracked['confidence']
+            result['hand_detected'] = tracked['hand_detected']
+            result['landmarks'] = tracked['landmarks']
+            return result
+        
         # Extract hand features (simplified)
         hand_features = self.extract_hand_features(frame)
         
@@ -95,53 +320,379 @@ class ASLRecognition:
         
         return result
     
-    def process_video(self, video_path: str, sample_rate: int = 5) -> List[Dict]:
+    def process_video(self, video_path: str, sample_rate: int = 5, cache_key: Optional[str] = None,
+                      sampler: Optional[MotionSampler] = None) -> List[Dict]:
         """Process entire video and return ASL recognition results"""
-        cap = cv2.VideoCapture(video_path)
-        results = []
-        frame_count = 0
+        return list(self.process_video_stream(video_path, sample_rate, cache_key=cache_key, sampler=sampler))
+    
+    def process_frame_batch(self, frames: np.ndarray) -> List[Dict]:
+        """Process an (N, H, W, 3) stack of video frames for ASL recognition"""
+        if self.clip_classifier is not None:
+            return self.process_clip_frames(frames)
+        return self.process_hand_regions(self.extract_hand_features_batch(frames), len(frames))
+    
+    def process_clip_frames(self, frames: np.ndarray) -> List[Dict]:
+        """Classify consecutive sampled frames in fixed-length clips, each frame gets the letter of its clip"""
+        results = [
+            {
+                'letter': None,
+                'confidence': 0.0,
+                'hand_detected': False,
+                'landmarks': []
+            }
+            for _ in range(len(frames))
+        ]
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Process every nth frame based on sample rate
-            if frame_count % sample_rate == 0:
-                result = self.process_video_frame(frame)
-                result['frame_number'] = frame_count
-                results.append(result)
-            
-            frame_count += 1
+        try:
+            letters, confidences = self.clip_classifier.predict_clips(self.clip_classifier.frames_to_clips(frames))
+        except Exception as e:
+            logger.error(f"Error predicting ASL letters: {e}")
+            return results
+        
+        clip_length = self.clip_classifier.clip_length
+        for index, result in enumerate(results):
+            letter = letters[index // clip_length]
+            result['letter'] = letter
+            result['confidence'] = float(confidences[index // clip_length])
+            result['hand_detected'] = letter is not None
         
-        cap.release()
         return results
     
-    def get_asl_sequence(self, video_path: str) -> str:
-        """Extract ASL letter sequence from video (simplified)"""
+    def process_hand_regions(self, hand_features: Optional[np.ndarray], n: int) -> List[Dict]:
+        """Classify an (N, 64, 64, 3) stack of extracted hand regions, None if extraction failed"""
+        results = [
+            {
+                'letter': None,
+                'confidence': 0.0,
+                'hand_detected': False,
+                'landmarks': []
+            }
+            for _ in range(n)
+        ]
+        
+        if hand_features is None:
+            return results
+        
         try:
-            # For demonstration, return a sample ASL sequence
-            # In a real system, this would analyze the video frames
+            letters, confidences = self.predict_asl_letter_batch(hand_features)
+        except Exception as e:
+            logger.error(f"Error predicting ASL letters: {e}")
+            return results
+        
+        for result, letter, confidence in zip(results, letters, confidences):
+            result['letter'] = str(letter)
+            result['confidence'] = float(confidence)
+            result['hand_detected'] = True
+        
+        return results
+    
+    def process_video_stream(self, video_path: str, sample_rate: int = 5, num_workers: int = 2,
+                             queue_size: int = 64, batch_size: int = 16,
+                             cache_key: Optional[str] = None,
+                             sampler: Optional[MotionSampler] = None) -> Iterator[Dict]:
+        """Yield ASL recognition results in frame order while the video is still decoding
+        
+        With a cache_key (the content hash of the video) and a frame cache, the sampled
+        hand regions are read from the cache when present and stored there when the
+        stream ends or is closed early; after a cached prefix the video is decoded again
+        from the first frame past it. A sampler (by
+        default one built from motion_options) picks the frames to classify by motion
+        instead of taking every sample_rate-th frame.
+        
+        With the MoViNet clip classifier, batches hold whole clips for one forward
+        pass and the frame cache is skipped, since it only keeps 64x64 hand regions.
+        With hand tracking, the sampled frames go through one tracker in frame order
+        (a single batch worker) and are classified by their landmarks, also without
+        the frame cache.
+        """
+        num_workers = max(1, num_workers)
+        batch_size = max(1, batch_size)
+        if self.clip_classifier is not None:
+            batch_size = self.clip_classifier.clip_length * self.clip_classifier.batch_size
+        
+        tracker = self.create_hand_tracker()
+        if tracker is not None:
+            # The tracker follows the hand from one frame to the next, so batches must run in order
+            num_workers = 1
+        
+        if sampler is None and self.motion_options is not None:
+            sampler = MotionSampler(base_rate=sample_rate, **self.motion_options)
+        # Frames sampled under other motion settings must not be read back from the frame cache
+        variant = str(sample_rate) if sampler is None else f"{sample_rate}m{sampler.settings_key()}"
+        
+        # Helper threads add their stage timings to the trace of the calling request
+        trace = current_trace()
+        
+        use_cache = (cache_key is not None and self.frame_cache is not None and self.clip_classifier is None
+                     and tracker is None)
+        
+        # Frames up to this number come from a cached prefix and are not classified again
+        resume_after = -1
+        # Regions and timestamps of every batch in frame order, for the cache
+        decoded_regions = [] if use_cache else None
+        if use_cache:
+            with span('frame_cache_load', trace):
+                cached = self.frame_cache.load(cache_key, variant)
+            if cached is not None:
+                regions, frame_numbers, timestamps, complete = cached
+                yield from self._process_cached_regions(regions, frame_numbers, timestamps, batch_size)
+                if complete or not len(frame_numbers):
+                    return
+                resume_after = int(frame_numbers[-1])
+                decoded_regions.append((regions, frame_numbers, timestamps))
+        cached_batches = len(decoded_regions) if use_cache else 0
+        
+        frames = queue.Queue(maxsize=queue_size)
+        stop_event = threading.Event()
+        decode_failed = threading.Event()
+        decoder = threading.Thread(
+            target=self._decode_sampled_frames,
+            args=(video_path, sample_rate, frames, stop_event, decode_failed, sampler, trace),
+            name='asl-frame-decoder',
+            daemon=True
+        )
+        decoder.start()
+        
+        in_flight = deque()
+        finished = False
+        
+        try:
+            with ThreadPoolExecutor(max_workers=num_workers) as pool:
+                batch = []
+                
+                while not finished:
+                    item = frames.get()
+                    if item is None:
+                        finished = True
+                    elif item[0] > resume_after:
+                        batch.append(item)
+                    
+                    if batch and (finished or len(batch) >= batch_size or self._shape_changed(batch)):
+                        in_flight.append(pool.submit(self._process_numbered_frames, batch, trace, tracker))
+                        batch = []
+                    
+                    # Keep a bounded number of batches in flight and yield finished ones in order
+                    while in_flight and (in_flight[0].done() or len(in_flight) > num_workers * 2):
+                        yield from self._batch_results(in_flight.popleft(), decoded_regions)
+                
+                while in_flight:
+                    yield from self._batch_results(in_flight.popleft(), decoded_regions)
+        finally:
+            # Stop the decoder if the consumer stopped early
+            stop_event.set()
+            for future in in_flight:
+                future.cancel()
+            while decoder.is_alive():
+                try:
+                    frames.get_nowait()
+                except queue.Empty:
+                    decoder.join(0.05)
+            if tracker is not None:
+                tracker.close()
             
-            # Get video info for logging
-            cap = cv2.VideoCapture(video_path)
-            if cap.isOpened():
-                frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-                fps = cap.get(cv2.CAP_PROP_FPS)
-                cap.release()
-                print(f"📹 Video info: {frame_count} frames, {fps:.1f} FPS")
+            # Also when the consumer stopped early (e.g. the signing ended): the batches
+            # unpacked so far are an in-order prefix of the sampled frames
+            if use_cache and not decode_failed.is_set() and (finished or len(decoded_regions) > cached_batches):
+                self._store_decoded_regions(cache_key, variant, decoded_regions, complete=finished and not in_flight)
+    
+    def _store_decoded_regions(self, cache_key: str, variant: str, decoded_regions: List, complete: bool):
+        """Write the decoded batches to the frame cache if every sampled frame produced a hand region"""
+        if not decoded_regions or any(regions is None for regions, _, _ in decoded_regions):
+            return
+        self.frame_cache.store(
+            cache_key,
+            variant,
+            np.concatenate([regions for regions, _, _ in decoded_regions]),
+            np.concatenate([frame_numbers for _, frame_numbers, _ in decoded_regions]),
+            np.concatenate([timestamps for _, _, timestamps in decoded_regions]),
+            complete=complete
+        )
+    
+    def _process_cached_regions(self, regions: np.ndarray, frame_numbers: np.ndarray, timestamps: np.ndarray,
+                                batch_size: int) -> Iterator[Dict]:
+        """Yield ASL recognition results for cached hand regions, batch by batch from the memory map"""
+        for start in range(0, len(regions), batch_size):
+            batch = np.asarray(regions[start:start + batch_size])
+            with span('prediction'):
+                results = self.process_hand_regions(batch, len(batch))
             
-            # Return a random sample sequence
-            sequence = random.choice(self.sample_sequences)
-            print(f"✅ Generated ASL sequence: {sequence}")
+            for offset, result in enumerate(results):
+                result['frame_number'] = int(frame_numbers[start + offset])
+                result['timestamp'] = float(timestamps[start + offset])
             
-            return sequence
+            yield from results
+    
+    def _batch_results(self, future, decoded_regions: Optional[List]) -> List[Dict]:
+        """Unpack a finished batch, keeping its hand regions, frame numbers and timestamps when they are being cached"""
+        results, regions = future.result()
+        if decoded_regions is not None:
+            frame_numbers = np.array([result['frame_number'] for result in results], dtype=np.int32)
+            timestamps = np.array([result['timestamp'] for result in results], dtype=np.float32)
+            decoded_regions.append((regions, frame_numbers, timestamps))
+        return results
+    
+    def _decode_sampled_frames(self, video_path: str, sample_rate: int, frames: queue.Queue,
+                               stop_event: threading.Event, decode_failed: Optional[threading.Event] = None,
+                               sampler: Optional[MotionSampler] = None, trace=None):
+        """Decode only the sampled frames of a video into a bounded queue"""
+        with span('video_open', trace):
+            cap = cv2.VideoCapture(video_path)
+        frame_count = 0
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        
+        # Summed locally and recorded once, the queue waits are not decoding time
+        decode_seconds = 0.0
+        sampling_seconds = 0.0
+        
+        try:
+            while cap.isOpened() and not stop_event.is_set():
+                # grab() advances without converting the frame, retrieve() only for sampled ones
+                started = time.perf_counter()
+                grabbed = cap.grab()
+                decode_seconds += time.perf_counter() - started
+                if not grabbed:
+                    break
+                
+                # The motion sampler looks at every frame, the fixed rate only at sampled ones
+                if sampler is not None or frame_count % sample_rate == 0:
+                    started = time.perf_counter()
+                    ret, frame = cap.retrieve()
+                    decode_seconds += time.perf_counter() - started
+                    if not ret:
+                        break
+                    
+                    # Container timestamps also hold for variable frame rate recordings
+                    timestamp = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+                    if timestamp <= 0.0 and frame_count > 0:
+                        timestamp = frame_count / fps
+                    
+                    if sampler is not None:
+                        started = time.perf_counter()
+                        selected = sampler.select(frame_count, timestamp, frame)
+                        sampling_seconds += time.perf_counter() - started
+                    else:
+                        selected = True
+                    
+                    if selected:
+                        while not stop_event.is_set():
+                            try:
+                                frames.put((frame_count, timestamp, frame), timeout=0.1)
+                                break
+                            except queue.Full:
+                                continue
+                
+                frame_count += 1
+        except Exception as e:
+            logger.error(f"Error decoding video: {e}", extra={'request_id': trace.request_id if trace else None})
+            if decode_failed is not None:
+                decode_failed.set()
+        finally:
+            cap.release()
+            record('frame_decode', decode_seconds, trace)
+            if sampler is not None:
+                record('frame_sampling', sampling_seconds, trace)
+            frames.put(None)
+    
+    def _shape_changed(self, batch: List[Tuple[int, float, np.ndarray]]) -> bool:
+        """Check whether the newest frame cannot be stacked with the rest of the batch"""
+        return len(batch) > 1 and batch[-1][2].shape != batch[0][2].shape
+    
+    def _process_numbered_frames(self, batch: List[Tuple[int, float, np.ndarray]], trace=None,
+                                 tracker: Optional[HandTracker] = None) -> Tuple[List[Dict], Optional[np.ndarray]]:
+        """Process decoded frames as one batch, returning results tagged with frame numbers and the hand regions"""
+        # A frame with a different shape starts its own batch
+        if self._shape_changed(batch):
+            head_results, head_regions = self._process_numbered_frames(batch[:-1], trace, tracker)
+            tail_results, tail_regions = self._process_numbered_frames(batch[-1:], trace, tracker)
+            regions = None
+            if head_regions is not None and tail_regions is not None:
+                regions = np.concatenate([head_regions, tail_regions])
+            return head_results + tail_results, regions
+        
+        if tracker is not None:
+            with span('hand_tracking', trace):
+                landmarks = np.stack([tracker.process(frame) for _, _, frame in batch])
+            timestamps = np.array([timestamp for _, timestamp, _ in batch], dtype=np.float32)
+            results = self.process_tracked_hands([frame for _, _, frame in batch], landmarks, timestamps, trace)
+            for (frame_number, _, _), result in zip(batch, results):
+                result['frame_number'] = frame_number
+            return results, None
+        
+        frames = np.stack([frame for _, _, frame in batch])
+        if self.clip_classifier is not None:
+            regions = None
+            with span('prediction', trace):
+                results = self.process_clip_frames(frames)
+        else:
+            with span('feature_extraction', trace):
+                regions = self.extract_hand_features_batch(frames)
+            with span('prediction', trace):
+                results = self.process_hand_regions(regions, len(frames))
+        
+        for (frame_number, timestamp, _), result in zip(batch, results):
+            result['frame_number'] = frame_number
+            result['timestamp'] = timestamp
+        
+        return results, regions
+    
+    def get_asl_sequence(self, video_path: str, cache_key: Optional[str] = None,
+                         sample_rate: int = 5) -> Tuple[str, float]:
+        """Extract the ASL letter sequence of a video and its confidence by segmenting its per-frame predictions"""
+        try:
+            stream = self.process_video_stream(video_path, sample_rate, cache_key=cache_key)
+            try:
+                # Only the landmark model makes tracked frames more than simplified predictions
+                simplified = self.clip_classifier is None and (
+                    self.hand_tracking_options is None or self.landmark_classifier is None
+                )
+                return self._segment(stream, simplified)
+            finally:
+                stream.close()
             
         except Exception as e:
-            print(f"❌ Error processing video: {e}")
-            return "HELLO"  # Fallback sequence
+            logger.error(f"Error processing video: {e}")
+            return "HELLO", 0.0  # Fallback sequence, not recognized
+    
+    def _segment(self, results: Iterable[Dict], simplified: bool) -> Tuple[str, float]:
+        """Collapse per-frame results into a letter sequence, stopping once the signing has ended
+        
+        The confidence is the mean confidence of the runs the letters were emitted
+        from, 0.0 when no letter was (e.g. the demo sequences of the simplified classifier).
+        """
+        segmenter = LetterSegmenter(**self.segmenter_options)
+        letters = []
+        confidences = []
+        frames = 0
+        
+        for result in results:
+            frames += 1
+            letter = result['letter'] if result['hand_detected'] else None
+            emitted = segmenter.push(letter, result['confidence'], result['timestamp'])
+            # Most frames emit nothing, only letters and boundaries are kept
+            if emitted:
+                letters.append(emitted)
+            if emitted.strip():
+                confidences.append(segmenter.last_confidence)
+            
+            # Signing has ended, skip decoding the rest of the video
+            if segmenter.finished:
+                break
+        
+        sequence = ''.join(letters).strip()
+        confidence = float(np.mean(confidences)) if confidences else 0.0
+        logger.info("Segmented sampled frames", extra={'fields': {
+            'frames': frames, 'sequence': sequence, 'confidence': round(confidence, 3)
+        }})
+        
+        if not sequence and simplified:
+            # The simplified classifier predicts independent random letters, which
+            # rarely form stable runs; keep the demo sequences until a trained model is in
+            sequence = random.choice(self.sample_sequences)
+            logger.info(f"Generated ASL sequence: {sequence}")
+        
+        return sequence, confidence
     
     def cleanup(self):
         """Clean up resources (simplified)"""
-        print("✅ Simplified ASL Recognition cleanup completed")
+        logger.info("Simplified ASL Recognition cleanup completed")
         pass
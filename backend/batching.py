@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+
+class TranslationBatcher:
+    def __init__(self, translator, max_batch_size: int = 8, max_wait_ms: float = 10.0,
+                 num_suggestions: int = 0):
+        """Coalesce concurrent translation requests into batched generate calls"""
+        self.translator = translator
+        self.num_suggestions = num_suggestions
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_ms = max(0.0, max_wait_ms)
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._running = False
+        # Held while checking _running and enqueueing, so nothing lands behind stop()'s sentinel
+        self._state_lock = threading.Lock()
+
+        # Metrics
+        self._lock = threading.Lock()
+        self._total_requests = 0
+        self._total_batches = 0
+        self._max_batch_seen = 0
+        self._batch_size_counts = {}
+        self._total_wait_ms = 0.0
+
+    def start(self):
+        """Start the background batching thread"""
+        with self._state_lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='translation-batcher', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the batching thread after draining queued requests"""
+        with self._state_lock:
+            if not self._running:
+                return
+            self._running = False
+            self._queue.put(None)
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, asl_sequence: str) -> Future:
+        """Queue an ASL sequence for translation and return a future for its result"""
+        future = Future()
+
+        with self._state_lock:
+            queued = self._running
+            if queued:
+                self._queue.put((asl_sequence, future, time.perf_counter()))
+
+        if not queued:
+            # No scheduler thread, translate on the caller's thread
+            future.set_result(self._translate([asl_sequence])[0])
+        return future
+
+    def translate(self, asl_sequence: str, timeout: Optional[float] = None) -> Dict:
+        """Translate an ASL sequence, blocking until its batch has been processed"""
+        return self.submit(asl_sequence).result(timeout)
+
+    def _collect_batch(self) -> List:
+        """Wait for a first request, then gather more until the window closes"""
+        item = self._queue.get()
+        if item is None:
+            return []
+
+        batch = [item]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Shutdown requested, put the sentinel back for the run loop
+                self._queue.put(None)
+                break
+            batch.append(item)
+
+        return batch
+
+    def _run(self):
+        """Main loop of the batching thread"""
+        while True:
+            batch = self._collect_batch()
+            if not batch:
+                if not self._running and self._queue.empty():
+                    break
+                continue
+
+            sequences = [sequence for sequence, _, _ in batch]
+            started = time.perf_counter()
+
+            try:
+                results = self._translate(sequences)
+            except Exception as e:
+                for _, future, _ in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+
+            self._record_batch(batch, started)
+
+    def _translate(self, sequences: List[str]) -> List[Dict]:
+        """Translate a batch of sequences in a single generate call"""
+        return self.translator.batch_translate(
+            sequences,
+            batch_size=len(sequences),
+            num_suggestions=self.num_suggestions
+        )
+
+    def _record_batch(self, batch: List, started: float):
+        """Update batching metrics"""
+        size = len(batch)
+        with self._lock:
+            self._total_requests += size
+            self._total_batches += 1
+            self._max_batch_seen = max(self._max_batch_seen, size)
+            self._batch_size_counts[size] = self._batch_size_counts.get(size, 0) + 1
+            self._total_wait_ms += sum((started - enqueued) * 1000.0 for _, _, enqueued in batch)
+
+    def get_metrics(self) -> Dict:
+        """Get queue depth and batch size statistics"""
+        with self._lock:
+            total_batches = self._total_batches
+            total_requests = self._total_requests
+            return {
+                'running': self._running,
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait_ms,
+                'queue_depth': self._queue.qsize(),
+                'total_requests': total_requests,
+                'total_batches': total_batches,
+                'average_batch_size': total_requests / total_batches if total_batches else 0.0,
+                'largest_batch_size': self._max_batch_seen,
+                'batch_size_counts': {str(k): v for k, v in sorted(self._batch_size_counts.items())},
+                'average_queue_wait_ms': self._total_wait_ms / total_requests if total_requests else 0.0
+            }
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark the MoViNet clip classifier on CPU
+Reports clips per second for each clip batch size, and frames per second of streaming mode
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+def measure(fn, iterations, warmup=2):
+    """Run fn warmup times untimed, then return the per-call latencies in seconds"""
+    for _ in range(warmup):
+        fn()
+
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        latencies.append(time.perf_counter() - started)
+    return np.array(latencies)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--checkpoint', default='movinet_checkpoints_a2_epoch9', help='MoViNet-A2 checkpoint directory')
+    parser.add_argument('--stream-checkpoint', help='Causal A2 checkpoint directory, also benchmarks streaming mode')
+    parser.add_argument('--clip-length', type=int, default=8, help='Sampled frames per clip')
+    parser.add_argument('--batch-sizes', default='1,2,4,8', help='Comma-separated clips per forward pass')
+    parser.add_argument('--frame-width', type=int, default=640, help='Width of the synthetic input frames')
+    parser.add_argument('--frame-height', type=int, default=480, help='Height of the synthetic input frames')
+    parser.add_argument('--iterations', type=int, default=10, help='Timed forward passes per batch size')
+    parser.add_argument('--threads', type=int, default=0, help='TensorFlow intra-op threads (0 = default)')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    # Keep the benchmark on the CPU even where a GPU is visible
+    os.environ.setdefault('CUDA_VISIBLE_DEVICES', '')
+    import tensorflow as tf
+    if args.threads:
+        tf.config.threading.set_intra_op_parallelism_threads(args.threads)
+
+    from movinet import MovinetClipClassifier
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(',') if size.strip()]
+    rng = np.random.default_rng(0)
+
+    print(f"⏱️  Loading {args.checkpoint}...", file=sys.stderr)
+    started = time.perf_counter()
+    classifier = MovinetClipClassifier(
+        args.checkpoint,
+        clip_length=args.clip_length,
+        batch_size=max(batch_sizes),
+        stream_checkpoint_path=args.stream_checkpoint
+    )
+    load_seconds = time.perf_counter() - started
+
+    shape = (args.clip_length, args.frame_height, args.frame_width, 3)
+    results = []
+    for batch_size in batch_sizes:
+        print(f"⏱️  Batch of {batch_size} clips...", file=sys.stderr)
+        clips = rng.integers(0, 256, size=(batch_size,) + shape, dtype=np.uint8)
+        latencies = measure(lambda: classifier.predict_clips(clips), args.iterations)
+
+        results.append({
+            'batch_size': batch_size,
+            'clips_per_second': batch_size * len(latencies) / latencies.sum(),
+            'frames_per_second': batch_size * args.clip_length * len(latencies) / latencies.sum(),
+            'p50_ms': float(np.percentile(latencies, 50) * 1000.0),
+            'p95_ms': float(np.percentile(latencies, 95) * 1000.0)
+        })
+
+    report = {
+        'checkpoint': args.checkpoint,
+        'clip_length': args.clip_length,
+        'frame_size': classifier.frame_size,
+        'input_size': [args.frame_width, args.frame_height],
+        'load_seconds': load_seconds,
+        'batches': results
+    }
+
+    if args.stream_checkpoint:
+        print("⏱️  Streaming frames...", file=sys.stderr)
+        stream = classifier.create_stream()
+        frame = rng.integers(0, 256, size=shape[1:], dtype=np.uint8)
+        latencies = measure(lambda: stream.push(frame), args.iterations * args.clip_length)
+
+        report['streaming'] = {
+            'frames_per_second': len(latencies) / latencies.sum(),
+            'p50_ms': float(np.percentile(latencies, 50) * 1000.0),
+            'p95_ms': float(np.percentile(latencies, 95) * 1000.0)
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
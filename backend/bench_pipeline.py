@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark of the recognition and translation pipeline
+Runs on synthetic videos, first on the components directly and then through the
+Flask test client, each suite in its own process, and reports throughput,
+p50/p95/p99 latency and per-suite peak RSS as JSON that can be compared across
+commits (--compare)
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from bench_sampling import write_synthetic_clip
+
+# Fixed ASL prompt set so runs are comparable
+PROMPTS = [
+    "HELLO", "WORLD", "THANKYOU", "PLEASE", "GOOD", "MORNING", "NIGHT", "YES",
+    "NO", "HELP", "HOWAREYOU", "MYNAMEIS", "NICETOMEETYOU", "SEEYOULATER",
+    "WHERE", "BATHROOM", "WATER", "FOOD", "FRIEND", "FAMILY"
+]
+
+SUITES = ('recognition', 'translation', 'http')
+
+# Metrics compared by --compare, per measurement
+COMPARED_METRICS = ('throughput_per_second', 'p50_ms', 'p95_ms', 'p99_ms')
+
+def seed_everything(seed, with_torch=True):
+    """Seed every random source the pipeline draws from
+
+    with_torch=False leaves torch unimported, for suites whose memory should not include it.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    if not with_torch:
+        return
+    try:
+        import torch
+        torch.manual_seed(seed)
+    except ImportError:
+        pass
+
+def summarize(latencies, items=None):
+    """Throughput and latency percentiles of a list of per-call durations in seconds
+
+    items is the number of units processed per call (e.g. frames), 1 by default.
+    """
+    latencies = np.asarray(latencies, dtype=np.float64)
+    if len(latencies) == 0:
+        return {'count': 0}
+
+    total = float(latencies.sum())
+    processed = len(latencies) if items is None else items
+    milliseconds = latencies * 1000.0
+    return {
+        'count': len(latencies),
+        'total_seconds': total,
+        'throughput_per_second': processed / total if total > 0 else None,
+        'mean_ms': float(milliseconds.mean()),
+        'p50_ms': float(np.percentile(milliseconds, 50)),
+        'p95_ms': float(np.percentile(milliseconds, 95)),
+        'p99_ms': float(np.percentile(milliseconds, 99))
+    }
+
+def peak_rss():
+    """Peak resident set size of this process and of its finished child processes, in bytes"""
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self_bytes': high_water_rss() or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        'children_bytes': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    }
+
+def high_water_rss():
+    """VmHWM of this process in bytes, None where /proc is unavailable
+
+    Unlike ru_maxrss, which Linux carries over exec from the process that forked
+    this one, it only covers this process image.
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+def git_commit():
+    """Commit of the working tree, so reports can be matched to code"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_videos(workdir, count, width, height, fps, seconds, first_seed=0):
+    """Write count synthetic clips: idle quarters around a moving hand-sized blob
+
+    Each clip is drawn from its own seed (first_seed, first_seed + 1, ...), so no two
+    clips have the same bytes.
+    """
+    videos = []
+    for seed in range(first_seed, first_seed + count):
+        path = os.path.join(workdir, f'bench_{seed}.avi')
+        write_synthetic_clip(
+            path,
+            idle_seconds=seconds / 4.0,
+            active_seconds=seconds / 2.0,
+            fps=fps,
+            size=(width, height),
+            seed=seed
+        )
+        videos.append(path)
+    return videos
+
+def bench_recognition(videos, repeats, sample_rate, frames_per_video):
+    """Time ASLRecognition.process_video and get_asl_sequence per video"""
+    from asl_recognition import ASLRecognition
+    recognizer = ASLRecognition()
+
+    process_latencies = []
+    sampled_frames = 0
+    sequence_latencies = []
+
+    for _ in range(repeats):
+        for video in videos:
+            started = time.perf_counter()
+            results = recognizer.process_video(video, sample_rate)
+            process_latencies.append(time.perf_counter() - started)
+            sampled_frames += len(results)
+
+            started = time.perf_counter()
+            recognizer.get_asl_sequence(video, sample_rate=sample_rate)
+            sequence_latencies.append(time.perf_counter() - started)
+
+    process_video = summarize(process_latencies)
+    process_video['frames_per_second'] = (
+        frames_per_video * len(process_latencies) / sum(process_latencies) if process_latencies else None
+    )
+    process_video['sampled_frames_per_video'] = sampled_frames / len(process_latencies) if process_latencies else 0
+
+    return {
+        'process_video': process_video,
+        'get_asl_sequence': summarize(sequence_latencies)
+    }
+
+def bench_translation(model, repeats, warmup, batch_size):
+    """Time single-prompt and batched translations with the result cache disabled"""
+    from t5 import T5ASLTranslator
+
+    started = time.perf_counter()
+    translator = T5ASLTranslator(model_name=model, cache_size=0)
+    load_seconds = time.perf_counter() - started
+    if translator.model is None:
+        raise RuntimeError(f"Could not load T5 model {model}")
+
+    for prompt in PROMPTS[:warmup]:
+        translator.translate_asl_to_english(prompt)
+
+    single = []
+    for _ in range(repeats):
+        for prompt in PROMPTS:
+            started = time.perf_counter()
+            translator.translate_asl_to_english(prompt)
+            single.append(time.perf_counter() - started)
+
+    batched = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        translator.batch_translate(PROMPTS, batch_size=batch_size)
+        batched.append(time.perf_counter() - started)
+
+    report = {
+        'model_version': translator.model_version,
+        'load_seconds': load_seconds,
+        'translate': summarize(single),
+        'batch_translate': summarize(batched, items=len(PROMPTS) * len(batched))
+    }
+    translator.cleanup()
+    return report
+
+def bench_http(upload_videos, warmup_video, model, repeats, warmup, workdir, poll_interval=0.01, timeout=300.0):
+    """Time /translate, /batch_translate and /upload through to its result via the Flask test client
+
+    warmup_video is uploaded untimed first, so the job processes have loaded their models.
+    upload_videos holds distinct clips for every repeat, since an upload of bytes seen
+    before would be answered from the dedup index without running a job.
+    """
+    # The server reads its configuration at import time
+    os.environ['ASL_T5_MODEL'] = model
+    os.environ['ASL_INDEX_PATH'] = os.path.join(workdir, 'index.sqlite3')
+    os.environ['ASL_CACHE_SIZE'] = '0'
+    os.environ.setdefault('ASL_JOB_WORKERS', '1')
+    os.environ.setdefault('ASL_LOG_LEVEL', 'WARNING')
+
+    import main
+    main.UPLOAD_FOLDER = os.path.join(workdir, 'uploads')
+    os.makedirs(main.UPLOAD_FOLDER, exist_ok=True)
+
+    started = time.perf_counter()
+    if not main.initialize_storage() or not main.load_models() or not main.start_services():
+        raise RuntimeError("Could not start the server models")
+    main._start_job_queue()
+    startup_seconds = time.perf_counter() - started
+
+    client = main.app.test_client()
+
+    def upload_and_wait(video):
+        """Upload a video and poll until its result is written, returning (accepted, done) times"""
+        started = time.perf_counter()
+        with open(video, 'rb') as f:
+            response = client.post('/upload', data={'video': (f, os.path.basename(video))})
+        accepted = time.perf_counter() - started
+        if response.status_code != 202:
+            raise RuntimeError(f"/upload failed: {response.get_json()}")
+
+        file_id = response.get_json()['file_id']
+        deadline = started + timeout
+        while True:
+            result = client.get(f'/result/{file_id}').get_json()
+            if result.get('status') == 'done':
+                return accepted, time.perf_counter() - started
+            if result.get('status') == 'failed' or time.perf_counter() > deadline:
+                raise RuntimeError(f"Video job {file_id} did not finish: {result}")
+            time.sleep(poll_interval)
+
+    try:
+        for prompt in PROMPTS[:warmup]:
+            client.post('/translate', json={'asl_text': prompt})
+        upload_and_wait(warmup_video)
+
+        translate = []
+        for _ in range(repeats):
+            for prompt in PROMPTS:
+                started = time.perf_counter()
+                response = client.post('/translate', json={'asl_text': prompt})
+                translate.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise RuntimeError(f"/translate failed: {response.get_json()}")
+
+        batch_translate = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            response = client.post('/batch_translate', json={'asl_texts': PROMPTS})
+            batch_translate.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                raise RuntimeError(f"/batch_translate failed: {response.get_json()}")
+
+        upload_accept = []
+        upload_result = []
+        for video in upload_videos:
+            accepted, done = upload_and_wait(video)
+            upload_accept.append(accepted)
+            upload_result.append(done)
+
+        stages = client.get('/stats/latency').get_json()['stages']
+    finally:
+        main.translation_batcher.stop()
+        # Wait for the job processes so their peak RSS is counted
+        main.job_queue.shutdown(wait=True)
+
+    return {
+        'startup_seconds': startup_seconds,
+        'translate': summarize(translate),
+        'batch_translate': summarize(batch_translate, items=len(PROMPTS) * len(batch_translate)),
+        'upload_accepted': summarize(upload_accept),
+        'upload_to_result': summarize(upload_result),
+        'stages': stages
+    }
+
+def run_suite(suite, args, videos, upload_videos, warmup_video, frames_per_video, workdir):
+    """Run one suite and return its results with the peak RSS of the process it ran in"""
+    seed_everything(args.seed, with_torch=suite != 'recognition')
+    if suite == 'recognition':
+        result = bench_recognition(videos, args.repeats, args.sample_rate, frames_per_video)
+    elif suite == 'translation':
+        result = bench_translation(args.model, args.repeats, args.warmup, args.batch_size)
+    else:
+        result = bench_http(upload_videos, warmup_video, args.model, args.repeats, args.warmup, workdir)
+    return result, peak_rss()
+
+def run_isolated(*args):
+    """Run a suite in its own spawned process, so its peak RSS does not include earlier suites"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(run_suite, *args).result()
+
+def compare(report, baseline):
+    """Relative change of each compared metric against a baseline report, +0.10 = 10% higher"""
+    changes = {}
+    for suite, measurements in report['results'].items():
+        base_suite = baseline.get('results', {}).get(suite, {})
+        for name, values in measurements.items():
+            base_values = base_suite.get(name)
+            if not isinstance(values, dict) or not isinstance(base_values, dict):
+                continue
+            for metric in COMPARED_METRICS:
+                new, old = values.get(metric), base_values.get(metric)
+                if new is not None and old:
+                    changes[f'{suite}.{name}.{metric}'] = (new - old) / old
+    return {'baseline_commit': baseline.get('commit'), 'changes': changes}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default='t5-small', help='T5 model name or local checkpoint path')
+    parser.add_argument('--suites', default=','.join(SUITES), help=f'Comma-separated suites ({", ".join(SUITES)})')
+    parser.add_argument('--videos', type=int, default=3, help='Synthetic videos to generate')
+    parser.add_argument('--width', type=int, default=640, help='Synthetic video width')
+    parser.add_argument('--height', type=int, default=480, help='Synthetic video height')
+    parser.add_argument('--fps', type=int, default=30, help='Synthetic video frame rate')
+    parser.add_argument('--seconds', type=float, default=4.0, help='Synthetic video length')
+    parser.add_argument('--sample-rate', type=int, default=5, help='Classify every n-th frame')
+    parser.add_argument('--repeats', type=int, default=3, help='Passes over the videos and prompt set')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed prompts before timing translations')
+    parser.add_argument('--batch-size', type=int, default=32, help='Chunk size of batch translations')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the simplified classifier and T5 sampling')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    parser.add_argument('--compare', help='Baseline JSON report to compute relative changes against')
+    args = parser.parse_args()
+
+    suites = [suite.strip() for suite in args.suites.split(',') if suite.strip()]
+    unknown = set(suites) - set(SUITES)
+    if unknown:
+        parser.error(f"Unknown suites: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix='asl-bench-')
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        'results': {},
+        'peak_rss': {}
+    }
+
+    try:
+        print(f"⏱️  Writing {args.videos} synthetic videos ({args.width}x{args.height}, "
+              f"{args.fps} fps, {args.seconds} s)...", file=sys.stderr)
+        # One more video than measured, uploaded untimed to warm up the job processes
+        *videos, warmup_video = write_videos(workdir, args.videos + 1, args.width, args.height,
+                                             args.fps, args.seconds)
+        # Fresh clips for every upload repeat, the measured videos would be deduplicated
+        upload_videos = []
+        if 'http' in suites:
+            upload_videos = videos + write_videos(workdir, args.videos * (args.repeats - 1), args.width,
+                                                  args.height, args.fps, args.seconds, first_seed=args.videos + 1)
+        # Two idle quarters and the active half, as write_synthetic_clip rounds them
+        frames_per_video = 2 * int(args.seconds / 4.0 * args.fps) + int(args.seconds / 2.0 * args.fps)
+
+        for suite in suites:
+            print(f"⏱️  Benchmarking {suite}...", file=sys.stderr)
+            result, rss = run_isolated(suite, args, videos, upload_videos, warmup_video, frames_per_video, workdir)
+            report['results'][suite] = result
+            report['peak_rss'][suite] = rss
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            report['comparison'] = compare(report, json.load(f))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark motion-gated frame sampling against the fixed sample rate
+Reports the fraction of classified frames skipped, time and the segmented letters per clip
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from asl_recognition import ASLRecognition
+from sampling import MotionSampler
+from segmentation import LetterSegmenter
+
+def write_synthetic_clip(path, idle_seconds=2.0, active_seconds=4.0, fps=30, size=(640, 480), seed=0):
+    """Write a clip with idle stretches around a hand-sized blob that moves, holds and moves again
+
+    Returns the (start, end) frame range of the active part.
+    """
+    rng = np.random.default_rng(seed)
+    width, height = size
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), fps, size)
+    background = np.full((height, width, 3), (90, 110, 120), dtype=np.uint8)
+
+    idle = int(idle_seconds * fps)
+    active = int(active_seconds * fps)
+    # Alternate moves to a new position with 0.4 s holds, like fingerspelled letters,
+    # every third move a fast one across the frame
+    move, hold = int(0.3 * fps), int(0.4 * fps)
+    positions = [(int(rng.uniform(0.3, 0.7) * width), int(rng.uniform(0.3, 0.7) * height))
+                 for _ in range(active // (move + hold) + 2)]
+    for index in range(2, len(positions), 3):
+        positions[index] = (width - positions[index - 1][0], height - positions[index - 1][1])
+
+    for index in range(idle * 2 + active):
+        frame = background.copy()
+        step = index - idle
+        if 0 <= step < active:
+            letter, phase = divmod(step, move + hold)
+            start, end = positions[letter], positions[letter + 1]
+            t = min(1.0, phase / move)
+            center = (int(start[0] + (end[0] - start[0]) * t), int(start[1] + (end[1] - start[1]) * t))
+            cv2.ellipse(frame, center, (60, 80), 0, 0, 360, (140, 170, 215), -1)
+
+        # Mild sensor noise so static stretches are not bit-identical
+        noise = rng.normal(0, 2.0, frame.shape)
+        writer.write(np.clip(frame + noise, 0, 255).astype(np.uint8))
+
+    writer.release()
+    return idle, idle + active
+
+def run(recognizer, clip, sample_rate, sampler=None):
+    """Recognize one clip, returning the results, elapsed time and segmented letters"""
+    # Seed the simplified classifier so both runs draw the same letters per call
+    np.random.seed(0)
+    started = time.perf_counter()
+    results = recognizer.process_video(clip, sample_rate, sampler=sampler)
+    elapsed = time.perf_counter() - started
+
+    segmenter = LetterSegmenter()
+    letters = []
+    for result in results:
+        letter = result['letter'] if result['hand_detected'] else None
+        letters.append(segmenter.push(letter, result['confidence'], result['timestamp']))
+
+    return results, elapsed, ''.join(letters).strip()
+
+def active_coverage(fixed, gated, active_range, sample_rate):
+    """Fraction of fixed-rate samples in the active part with a gated sample at most one stride away"""
+    start, end = active_range
+    gated_frames = np.array(sorted(result['frame_number'] for result in gated))
+    active = [result['frame_number'] for result in fixed if start <= result['frame_number'] < end]
+    if not active:
+        return None
+    if len(gated_frames) == 0:
+        return 0.0
+
+    covered = 0
+    for frame_number in active:
+        nearest = np.abs(gated_frames - frame_number).min()
+        covered += nearest <= sample_rate
+    return covered / len(active)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('clips', nargs='*', help='Video files to benchmark (default: synthetic clips)')
+    parser.add_argument('--synthetic', type=int, default=3, help='Synthetic clips to generate when no clips are given')
+    parser.add_argument('--sample-rate', type=int, default=5, help='Fixed sample rate and gated base rate')
+    parser.add_argument('--fast-rate', type=int, default=2, help='Sample rate during fast motion')
+    parser.add_argument('--threshold', type=float, default=0.5, help='Changed pixel percentage that starts sampling')
+    parser.add_argument('--fast-threshold', type=float, default=5.0, help='Changed pixel percentage that boosts sampling')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    recognizer = ASLRecognition()
+    workdir = None
+    clips = [(clip, None) for clip in args.clips]
+
+    if not clips:
+        workdir = tempfile.mkdtemp(prefix='asl-bench-')
+        for index in range(args.synthetic):
+            path = os.path.join(workdir, f'synthetic_{index}.avi')
+            active = write_synthetic_clip(path, idle_seconds=1.0 + index, active_seconds=3.0 + index, seed=index)
+            clips.append((path, active))
+
+    reports = []
+    for clip, active_range in clips:
+        print(f"⏱️  Benchmarking {os.path.basename(clip)}...", file=sys.stderr)
+        sampler = MotionSampler(
+            base_rate=args.sample_rate,
+            fast_rate=args.fast_rate,
+            motion_threshold=args.threshold,
+            fast_threshold=args.fast_threshold
+        )
+
+        fixed, fixed_seconds, fixed_letters = run(recognizer, clip, args.sample_rate)
+        gated, gated_seconds, gated_letters = run(recognizer, clip, args.sample_rate, sampler)
+        stats = sampler.get_stats()
+
+        report = {
+            'clip': os.path.basename(clip),
+            'frames': stats['frames_seen'],
+            'fixed': {
+                'classified_frames': len(fixed),
+                'seconds': fixed_seconds,
+                'letters': fixed_letters
+            },
+            'motion_gated': {
+                'classified_frames': len(gated),
+                'fast_motion_frames': stats['frames_fast'],
+                'seconds': gated_seconds,
+                'letters': gated_letters
+            },
+            'skipped_fraction': 1.0 - len(gated) / len(fixed) if fixed else 0.0
+        }
+        if active_range is not None:
+            report['active_coverage'] = active_coverage(fixed, gated, active_range, args.sample_rate)
+        reports.append(report)
+
+    if workdir is not None:
+        for name in os.listdir(workdir):
+            os.remove(os.path.join(workdir, name))
+        os.rmdir(workdir)
+
+    output = json.dumps({
+        'sample_rate': args.sample_rate,
+        'fast_rate': args.fast_rate,
+        'motion_threshold': args.threshold,
+        'fast_threshold': args.fast_threshold,
+        'results': reports
+    }, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark CPU inference modes of the T5 ASL translator
+Compares latency, memory and output agreement against the fp32 baseline
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import resource
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import torch
+
+from t5 import T5ASLTranslator, COMPILE_MODES
+
+# Fixed ASL prompt set so runs are comparable
+PROMPTS = [
+    "HELLO", "WORLD", "THANKYOU", "PLEASE", "GOOD", "MORNING", "NIGHT", "YES",
+    "NO", "HELP", "HOWAREYOU", "MYNAMEIS", "NICETOMEETYOU", "SEEYOULATER",
+    "WHERE", "BATHROOM", "WATER", "FOOD", "FRIEND", "FAMILY"
+]
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far (ru_maxrss is in KiB on Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def model_size_bytes(model):
+    """Size of the serialized model weights"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of values"""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+def run_variant(name, model_name, options, repeats, warmup):
+    """Load one translator variant and time single-prompt translations
+
+    Runs in a fresh process per variant (see run_isolated), so the peak RSS is
+    this variant's own footprint rather than what earlier variants left behind.
+    """
+    rss_before = peak_rss_bytes()
+    started = time.perf_counter()
+    # cache_size=0 disables the result cache so every call runs the model
+    translator = T5ASLTranslator(model_name=model_name, cache_size=0, **options)
+    load_seconds = time.perf_counter() - started
+
+    if translator.model is None:
+        raise RuntimeError(f"Could not load model for variant {name}")
+
+    for prompt in PROMPTS[:warmup]:
+        translator.translate_asl_to_english(prompt)
+
+    latencies = []
+    translations = {}
+    for _ in range(repeats):
+        for prompt in PROMPTS:
+            started = time.perf_counter()
+            result = translator.translate_asl_to_english(prompt)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            translations[prompt] = result['translation']
+
+    report = {
+        'variant': name,
+        'model_version': translator.model_version,
+        'load_seconds': load_seconds,
+        'model_size_bytes': model_size_bytes(translator.model),
+        'torch_threads': torch.get_num_threads(),
+        # Peak of the whole variant process, and its growth over the interpreter and imports
+        'peak_rss_bytes': peak_rss_bytes(),
+        'peak_rss_delta_bytes': peak_rss_bytes() - rss_before,
+        'latency_ms': {
+            'mean': statistics.mean(latencies),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95)
+        }
+    }
+
+    translator.cleanup()
+    return report, translations
+
+def run_isolated(name, model_name, options, repeats, warmup):
+    """Run one variant in its own spawned process and return its report and translations"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(run_variant, name, model_name, options, repeats, warmup).result()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--model', default='t5-base', help='Model name or path (e.g. t5-small)')
+    parser.add_argument('--compile', choices=COMPILE_MODES, help='Also benchmark a compiled decoder')
+    parser.add_argument('--threads', type=int, help='Intra-op thread count')
+    parser.add_argument('--interop-threads', type=int, help='Inter-op thread count')
+    parser.add_argument('--repeats', type=int, default=3, help='Passes over the prompt set')
+    parser.add_argument('--warmup', type=int, default=3, help='Untimed prompts before each run')
+    parser.add_argument('--output', help='Write the JSON report to this file')
+    args = parser.parse_args()
+
+    threads = {'num_threads': args.threads, 'num_interop_threads': args.interop_threads}
+    variants = [
+        ('fp32', {}),
+        ('int8', {'quantize': True})
+    ]
+    if args.compile:
+        variants.append((f'int8+{args.compile}', {'quantize': True, 'compile_mode': args.compile}))
+
+    reports = []
+    baseline = None
+
+    for name, options in variants:
+        print(f"⏱️  Benchmarking {name}...", file=sys.stderr)
+        report, translations = run_isolated(name, args.model, {**options, **threads}, args.repeats, args.warmup)
+
+        if baseline is None:
+            baseline = translations
+        matches = sum(1 for prompt in PROMPTS if translations[prompt] == baseline[prompt])
+        report['agreement_with_fp32'] = matches / len(PROMPTS)
+        reports.append(report)
+
+    output = json.dumps({
+        'model': args.model,
+        'torch_threads': reports[0]['torch_threads'],
+        'prompts': len(PROMPTS),
+        'repeats': args.repeats,
+        'results': reports
+    }, indent=2)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+    print(output)
+
+if __name__ == "__main__":
+    main()
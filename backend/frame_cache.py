@@ -0,0 +1,161 @@
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from telemetry import get_logger
+
+logger = get_logger('frame_cache')
+
+# One record per sampled frame: its frame number, timestamp in seconds and 64x64 hand region
+ENTRY_DTYPE = np.dtype([('frame_number', '<i4'), ('timestamp', '<f4'), ('region', 'u1', (64, 64, 3))])
+
+
+class FrameCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 512 * 1024 * 1024):
+        """On-disk cache of sampled 64x64 hand regions per video, read back memory-mapped
+
+        Entries are .npy files of timestamped regions keyed by the content hash of the
+        video and the sampling variant (e.g. the sample rate), so re-recognizing the same
+        bytes is array reads with no decoding. An entry may be a partial prefix of the
+        sampled frames, left by a recognition that stopped early. The least recently used
+        entries are evicted once the directory holds more than max_bytes.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max(0, max_bytes)
+
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def load(self, key: str, variant: str) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, bool]]:
+        """Memory-map the cached (N, 64, 64, 3) regions, frame numbers and timestamps of a video, or None
+
+        The last value tells whether the entry holds every sampled frame or only a prefix.
+        """
+        entries = None
+        for complete in (True, False):
+            path = self._path(key, variant, complete)
+            try:
+                entries = np.load(path, mmap_mode='r')
+                # The modification time is the LRU clock used by eviction
+                os.utime(path)
+                break
+            except (OSError, ValueError):
+                entries = None
+
+        with self._lock:
+            if entries is None or entries.dtype != ENTRY_DTYPE:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return entries['region'], entries['frame_number'], entries['timestamp'], complete
+
+    def store(self, key: str, variant: str, regions: np.ndarray, frame_numbers: np.ndarray,
+              timestamps: np.ndarray, complete: bool = True):
+        """Write the regions of a video (or of its first sampled frames), then evict old entries past the size cap"""
+        entries = np.empty(len(regions), dtype=ENTRY_DTYPE)
+        if self.max_bytes == 0 or entries.nbytes > self.max_bytes:
+            return
+        entries['region'] = regions
+        entries['frame_number'] = frame_numbers
+        entries['timestamp'] = timestamps
+
+        # Write to a temporary file and rename so readers never see a partial array
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, entries)
+            os.replace(tmp_path, self._path(key, variant, complete))
+        except OSError as e:
+            logger.error(f"Error writing frame cache entry for {key}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        if complete:
+            # The complete entry supersedes a prefix stored by an earlier, shorter run
+            try:
+                os.remove(self._path(key, variant, complete=False))
+            except OSError:
+                pass
+
+        with self._lock:
+            self.stores += 1
+        self._evict()
+
+    def delete(self, key: str) -> int:
+        """Remove the cached regions of a video for every sampling variant"""
+        prefix = f"{key}_s"
+        removed = 0
+        for entry in self._entries():
+            if entry.name.startswith(prefix):
+                try:
+                    os.remove(entry.path)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed
+
+    def get_stats(self) -> Dict:
+        """Hit/miss counters of this process and the current size of the cache directory"""
+        entries = self._entries()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(entries),
+                'bytes': sum(entry.stat().st_size for entry in entries),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'stores': self.stores,
+                'evictions': self.evictions
+            }
+
+    def _path(self, key: str, variant: str, complete: bool = True) -> str:
+        """File path of one complete or partial cache entry"""
+        if os.path.basename(key) != key:
+            raise ValueError(f"Invalid frame cache key: {key}")
+        suffix = '' if complete else '.partial'
+        return os.path.join(self.cache_dir, f"{key}_s{variant}{suffix}.npy")
+
+    def _entries(self) -> List[os.DirEntry]:
+        """Cache entry files currently on disk"""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                return [entry for entry in it if entry.name.endswith('.npy') and entry.is_file()]
+        except OSError:
+            return []
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits in max_bytes"""
+        sized = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            sized.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in sized)
+        # Several worker processes share the directory, another may have removed a file already
+        for _, size, path in sorted(sized):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                with self._lock:
+                    self.evictions += 1
+            except OSError:
+                pass
+            total -= size
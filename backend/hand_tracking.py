@@ -0,0 +1,119 @@
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from landmarks import LANDMARK_DIMS, NUM_LANDMARKS, hands_present
+
+# Hand slots of the landmark array by MediaPipe handedness, so each hand keeps its position
+HANDEDNESS_ORDER = ('Right', 'Left')
+
+# Context kept around the landmarks when cropping the hand region
+ROI_MARGIN = 0.25
+
+
+def check_available():
+    """Raise ImportError early if MediaPipe is missing, rather than on the first video"""
+    import mediapipe  # noqa: F401
+
+
+class HandTracker:
+    def __init__(self, max_hands: int = 1, min_detection_confidence: float = 0.5,
+                 min_tracking_confidence: float = 0.5, model_complexity: int = 0):
+        """MediaPipe Hands over consecutive frames of one video or live session
+
+        The palm detector runs on the first frame; later frames only run the
+        landmark model on the region tracked from the previous frame, and
+        detection runs again when the tracking confidence falls below
+        min_tracking_confidence (e.g. the hand left the frame). Not thread
+        safe: frames must be fed in order from one thread.
+        """
+        self.max_hands = max_hands
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.model_complexity = model_complexity
+        self._hands = self._open()
+
+        self.frames = 0
+        self.frames_with_hands = 0
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """Landmarks of one BGR frame as a (max_hands, 21, 3) float32 array, zeros for hands not found
+
+        x and y are normalized to the frame size and z is relative to the wrist,
+        the layout /recognize/landmarks accepts from clients.
+        """
+        landmarks = np.zeros((self.max_hands, NUM_LANDMARKS, LANDMARK_DIMS), dtype=np.float32)
+
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # A read-only image is passed to the graph by reference instead of copied
+        rgb.flags.writeable = False
+        output = self._hands.process(rgb)
+        self.frames += 1
+
+        if not output.multi_hand_landmarks:
+            return landmarks
+
+        hands = list(zip(output.multi_hand_landmarks, output.multi_handedness))
+        hands.sort(key=lambda hand: self._slot(hand[1].classification[0].label))
+        for slot, (hand, _) in enumerate(hands[:self.max_hands]):
+            landmarks[slot] = [(point.x, point.y, point.z) for point in hand.landmark]
+
+        self.frames_with_hands += 1
+        return landmarks
+
+    def reset(self):
+        """Forget the tracked hands, so the next frame runs detection, e.g. after a pause between words"""
+        self._hands.close()
+        self._hands = self._open()
+
+    def close(self):
+        """Release the MediaPipe graph"""
+        self._hands.close()
+
+    def get_stats(self) -> Dict:
+        """Frame counters of this tracker"""
+        return {
+            'frames': self.frames,
+            'frames_with_hands': self.frames_with_hands
+        }
+
+    def _open(self):
+        """Create the MediaPipe Hands graph in video (tracking) mode"""
+        # Imported here like the model modules, so the server starts without MediaPipe loaded
+        import mediapipe as mp
+
+        return mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=self.max_hands,
+            model_complexity=self.model_complexity,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence
+        )
+
+    def _slot(self, label: str) -> int:
+        """Sort key placing hands in HANDEDNESS_ORDER"""
+        return HANDEDNESS_ORDER.index(label) if label in HANDEDNESS_ORDER else len(HANDEDNESS_ORDER)
+
+
+def landmark_bounds(landmarks: np.ndarray, h: int, w: int,
+                    margin: float = ROI_MARGIN) -> Optional[Tuple[int, int, int, int]]:
+    """(x_min, y_min, x_max, y_max) square around the first found hand of (hands, 21, 3) landmarks, None without one"""
+    present = hands_present(landmarks[np.newaxis])[0]
+    if not present.any():
+        return None
+
+    points = landmarks[int(np.argmax(present)), :, :2] * (w, h)
+    (x_min, y_min), (x_max, y_max) = points.min(axis=0), points.max(axis=0)
+    center_x, center_y = (x_min + x_max) / 2.0, (y_min + y_max) / 2.0
+    half = max(x_max - x_min, y_max - y_min) * (0.5 + margin)
+
+    bounds = (
+        max(0, int(center_x - half)),
+        max(0, int(center_y - half)),
+        min(w, int(center_x + half) + 1),
+        min(h, int(center_y + half) + 1)
+    )
+    if bounds[2] <= bounds[0] or bounds[3] <= bounds[1]:
+        return None
+    return bounds
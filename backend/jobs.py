@@ -0,0 +1,351 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional, Tuple
+
+from telemetry import configure_logging, end_trace, get_logger, start_trace
+
+logger = get_logger('jobs')
+
+# Every SAMPLE_RATE-th frame of an uploaded video is classified (the motion sampler's base rate)
+SAMPLE_RATE = 5
+
+# Per-process models, created once by the pool initializer
+_worker_recognizer = None
+_worker_translator = None
+_worker_events = None
+
+
+class QueueFullError(Exception):
+    """Raised when the job backlog is at capacity"""
+    pass
+
+
+def _init_worker(events, translator_kwargs: Dict, preloaded: Optional[Tuple] = None,
+                 recognizer_kwargs: Optional[Dict] = None, log_level: str = 'INFO'):
+    """Load the recognition and translation models once per worker process
+
+    Forked workers receive the parent's models in preloaded and share their
+    memory copy-on-write instead of loading their own copies.
+    """
+    global _worker_recognizer, _worker_translator, _worker_events
+
+    _worker_events = events
+    # Spawned workers start without the server's logging setup
+    configure_logging(log_level)
+
+    if preloaded is not None:
+        _worker_recognizer, _worker_translator = preloaded
+        return
+
+    from asl_recognition import ASLRecognition
+    from translator_base import create_translator
+
+    _worker_recognizer = ASLRecognition(**(recognizer_kwargs or {}))
+    _worker_translator = create_translator(**translator_kwargs)
+
+
+def _run_job(job_id: str, file_path: str, num_suggestions: int, cache_key: Optional[str] = None) -> Dict:
+    """Run recognition and translation for one uploaded video inside a worker process
+
+    The per-stage timings of the job are returned in 'stages', so the server
+    process can add them to its histograms.
+    """
+    _worker_events.put(('running', job_id, time.time()))
+    trace = start_trace(job_id)
+    try:
+        output = _recognize_and_translate(job_id, file_path, num_suggestions, cache_key)
+    finally:
+        end_trace()
+    output['stages'] = dict(trace.stages)
+    return output
+
+
+def _recognize_and_translate(job_id: str, file_path: str, num_suggestions: int,
+                             cache_key: Optional[str] = None) -> Dict:
+    """Recognition and translation steps of a job, reusing cached frames of the same content hash"""
+    timings = {}
+
+    started = time.perf_counter()
+    asl_sequence, asl_confidence = _worker_recognizer.get_asl_sequence(file_path, cache_key=cache_key, sample_rate=SAMPLE_RATE)
+    timings['recognition'] = time.perf_counter() - started
+
+    if not asl_sequence:
+        return {'error': 'No ASL gestures detected in video', 'timings': timings}
+
+    started = time.perf_counter()
+    translation_result = _worker_translator.translate_with_suggestions(asl_sequence, num_suggestions)
+    timings['translation'] = time.perf_counter() - started
+
+    if not translation_result['success']:
+        return {
+            'error': f'Translation failed: {translation_result["error"]}',
+            'asl_sequence': asl_sequence,
+            'timings': timings
+        }
+
+    return {
+        'asl_sequence': asl_sequence,
+        'asl_confidence': asl_confidence,
+        'translation': translation_result,
+        'timings': timings
+    }
+
+
+def _noop():
+    """Task used to start worker processes ahead of time"""
+    return None
+
+
+class VideoJobQueue:
+    def __init__(self, on_complete: Callable[[Dict, Dict], None], num_workers: int = 2,
+                 max_backlog: int = 16, num_suggestions: int = 3,
+                 translator_kwargs: Optional[Dict] = None, retention: float = 3600.0,
+                 on_failed: Optional[Callable[[Dict], None]] = None, start_method: str = 'spawn',
+                 preloaded: Optional[Tuple] = None, recognizer_kwargs: Optional[Dict] = None,
+                 log_level: str = 'INFO'):
+        """Process uploaded videos on a pool of worker processes with a bounded backlog
+
+        With start_method='fork', preloaded=(recognizer, translator) hands
+        already loaded models to the workers instead of loading them per process.
+        """
+        if preloaded is not None and start_method != 'fork':
+            raise ValueError('Preloaded models can only be shared with forked workers')
+
+        self.on_complete = on_complete
+        self.on_failed = on_failed
+        self.num_workers = max(1, num_workers)
+        self.max_backlog = max(1, max_backlog)
+        self.num_suggestions = num_suggestions
+        self.translator_kwargs = translator_kwargs or {}
+        self.recognizer_kwargs = recognizer_kwargs or {}
+        self.retention = retention
+        self.preloaded = preloaded
+        self.log_level = log_level
+
+        # Spawn by default so workers never inherit the server's threads or model copies
+        self._context = multiprocessing.get_context(start_method)
+        self._events = self._context.Queue()
+        self._pool = self._create_pool()
+
+        if start_method == 'fork':
+            # Fork every worker now, before this queue starts any threads of its own
+            self.warm_up()
+
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._listener = threading.Thread(target=self._listen, name='job-events', daemon=True)
+        self._listener.start()
+
+    def submit(self, job_id: str, file_path: str, metadata: Dict,
+               timings: Optional[Dict] = None, input_complete: bool = True,
+               cache_key: Optional[str] = None) -> Dict:
+        """Queue a video for processing, raising QueueFullError when the backlog is full
+
+        Jobs submitted with input_complete=False read a video that is still arriving;
+        their result is held back until update() marks the input complete. cache_key,
+        the content hash of the video, keys its sampled frames in the frame cache.
+        """
+        with self._lock:
+            self._prune()
+
+            backlog = sum(1 for job in self._jobs.values() if job['status'] == 'queued')
+            if backlog >= self.max_backlog:
+                raise QueueFullError('Processing queue is full, please retry later')
+
+            job = {
+                'file_id': job_id,
+                'status': 'queued',
+                'submitted_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'metadata': dict(metadata),
+                'timings': dict(timings or {}),
+                'error': None,
+                'input_complete': input_complete,
+                'pending_output': None
+            }
+            self._jobs[job_id] = job
+
+        try:
+            future = self._submit_to_pool(job_id, file_path, cache_key)
+        except Exception as e:
+            # No worker will run this job, so it must not hold a backlog slot
+            self.cancel(job_id, f"Could not start processing: {e}")
+            if self.on_failed is not None:
+                try:
+                    self.on_failed(self.get(job_id))
+                except Exception as failed_error:
+                    logger.error(f"Error recording failed job {job_id}: {failed_error}", extra={'request_id': job_id})
+            raise
+
+        future.add_done_callback(lambda f: self._finish(job_id, f))
+
+        return self._public_view(job)
+
+    def update(self, job_id: str, metadata: Optional[Dict] = None, timings: Optional[Dict] = None,
+               input_complete: bool = False):
+        """Add metadata or stage timings to a job, optionally marking its input complete"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job['metadata'].update(metadata or {})
+            job['timings'].update(timings or {})
+
+            if not input_complete or job['input_complete']:
+                return
+            job['input_complete'] = True
+            output, job['pending_output'] = job['pending_output'], None
+
+        if output is not None:
+            # The worker finished before the upload did
+            self._complete(job_id, output)
+
+    def cancel(self, job_id: str, error: str):
+        """Mark a job as failed so its result is never written"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] in ('done', 'failed'):
+                return
+            job['status'] = 'failed'
+            job['error'] = error
+            job['finished_at'] = time.time()
+
+    def warm_up(self):
+        """Start the worker processes so models are loaded before the first upload"""
+        for _ in range(self.num_workers):
+            self._pool.submit(_noop)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get the current status of a job"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._public_view(job) if job else None
+
+    def get_stats(self) -> Dict:
+        """Get job counts by status"""
+        with self._lock:
+            counts = {'queued': 0, 'running': 0, 'done': 0, 'failed': 0}
+            for job in self._jobs.values():
+                counts[job['status']] += 1
+
+        return {
+            'workers': self.num_workers,
+            'max_backlog': self.max_backlog,
+            'jobs': counts
+        }
+
+    def shutdown(self, wait: bool = False):
+        """Stop the worker processes, optionally waiting for them to exit"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        self._events.put(None)
+
+    def _submit_to_pool(self, job_id: str, file_path: str, cache_key: Optional[str] = None):
+        """Submit a job to the worker pool, replacing the pool once if a worker died (e.g. out of memory)"""
+        pool = self._pool
+        try:
+            return pool.submit(_run_job, job_id, file_path, self.num_suggestions, cache_key)
+        except BrokenProcessPool:
+            with self._lock:
+                # Concurrent submits that saw the same broken pool replace it only once
+                if self._pool is pool:
+                    logger.warning("Job worker pool is broken, restarting it")
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    self._pool = self._create_pool()
+                pool = self._pool
+            return pool.submit(_run_job, job_id, file_path, self.num_suggestions, cache_key)
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        """Create the worker process pool"""
+        return ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=self._context,
+            initializer=_init_worker,
+            initargs=(self._events, self.translator_kwargs, self.preloaded, self.recognizer_kwargs, self.log_level)
+        )
+
+    def _listen(self):
+        """Apply status events sent by worker processes"""
+        while True:
+            event = self._events.get()
+            if event is None:
+                break
+
+            kind, job_id, timestamp = event
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if kind == 'running' and job and job['status'] == 'queued':
+                    job['status'] = 'running'
+                    job['started_at'] = timestamp
+                    job['timings']['queue_wait'] = timestamp - job['submitted_at']
+
+    def _finish(self, job_id: str, future):
+        """Record the outcome of a finished job"""
+        try:
+            output = future.result()
+        except Exception as e:
+            output = {'error': str(e), 'timings': {}}
+
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and not job['input_complete']:
+                job['pending_output'] = output
+                return
+
+        self._complete(job_id, output)
+
+    def _complete(self, job_id: str, output: Dict):
+        """Write the result of a finished job and record its final status"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] == 'failed':
+                # Unknown or cancelled job
+                return
+            job['timings'].update(output.get('timings', {}))
+            view = self._public_view(job)
+
+        if not output.get('error'):
+            try:
+                self.on_complete(view, output)
+            except Exception as e:
+                output['error'] = str(e)
+
+        with self._lock:
+            job['finished_at'] = time.time()
+            job['status'] = 'failed' if output.get('error') else 'done'
+            job['error'] = output.get('error')
+            view = self._public_view(job)
+
+        if output.get('error') and self.on_failed is not None:
+            try:
+                self.on_failed(view)
+            except Exception as e:
+                logger.error(f"Error recording failed job {job_id}: {e}", extra={'request_id': job_id})
+
+    def _prune(self):
+        """Forget finished jobs older than the retention period"""
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['finished_at'] is not None and job['finished_at'] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _public_view(self, job: Dict) -> Dict:
+        """Build the externally visible status of a job"""
+        view = {
+            'file_id': job['file_id'],
+            'status': job['status'],
+            'submitted_at': job['submitted_at'],
+            'started_at': job['started_at'],
+            'finished_at': job['finished_at'],
+            'timings': dict(job['timings'])
+        }
+        if job['error']:
+            view['error'] = job['error']
+        view.update(job['metadata'])
+        return view
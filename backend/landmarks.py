@@ -0,0 +1,119 @@
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from telemetry import get_logger
+
+logger = get_logger('landmarks')
+
+# MediaPipe Hands layout: 21 landmarks per hand, normalized x and y, and z relative to the wrist
+NUM_LANDMARKS = 21
+LANDMARK_DIMS = 3
+WRIST = 0
+
+# Little-endian wire formats; int16 values are coordinates times INT16_SCALE, so +-2.0 fits
+DTYPES = {
+    'float32': np.dtype('<f4'),
+    'int16': np.dtype('<i2')
+}
+INT16_SCALE = 16384.0
+
+ALPHABET = [chr(ord('A') + i) for i in range(26)]
+
+
+def decode_landmarks(data: bytes, dtype: str = 'float32', hands: int = 1,
+                     scale: float = INT16_SCALE) -> np.ndarray:
+    """Parse a landmark payload into an (N, hands, 21, 3) float32 array
+
+    The payload is frame after frame of hands x 21 x 3 values. A hand the
+    client did not detect is sent as zeros (or NaN in float32) and comes
+    back as zeros. Raises ValueError for a malformed payload.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported landmark format: {dtype}")
+    if hands < 1:
+        raise ValueError('At least one hand per frame is required')
+
+    frame_bytes = hands * NUM_LANDMARKS * LANDMARK_DIMS * DTYPES[dtype].itemsize
+    if not data or len(data) % frame_bytes:
+        raise ValueError(f"Payload must be a whole number of {frame_bytes}-byte frames")
+
+    values = np.frombuffer(data, dtype=DTYPES[dtype])
+    if dtype == 'int16':
+        landmarks = values.astype(np.float32) / np.float32(scale)
+    else:
+        landmarks = np.nan_to_num(values.astype(np.float32), nan=0.0, posinf=0.0, neginf=0.0)
+    return landmarks.reshape((-1, hands, NUM_LANDMARKS, LANDMARK_DIMS))
+
+def hands_present(landmarks: np.ndarray) -> np.ndarray:
+    """(N, hands) mask of the hands that have any non-zero landmark"""
+    return np.any(landmarks != 0.0, axis=(2, 3))
+
+def normalize_landmarks(landmarks: np.ndarray) -> np.ndarray:
+    """Flatten (N, hands, 21, 3) landmarks into position- and size-invariant (N, hands * 63) features
+
+    Each hand is moved to its wrist and scaled by its largest landmark
+    distance from the wrist, so the features do not depend on where the
+    hand is in the image or how far it is from the camera.
+    """
+    centered = landmarks - landmarks[:, :, WRIST:WRIST + 1]
+    extent = np.linalg.norm(centered, axis=-1).max(axis=-1)
+    extent[extent == 0.0] = 1.0
+    features = centered / extent[:, :, np.newaxis, np.newaxis]
+    return features.reshape((len(landmarks), -1)).astype(np.float32)
+
+
+class LandmarkClassifier:
+    def __init__(self, model_path: str):
+        """Multi-layer perceptron over normalized landmarks, run with NumPy
+
+        The .npz file holds the dense layers as W0, b0, W1, b1, ... (ReLU
+        between layers, softmax after the last) and optionally a labels
+        array; without labels the outputs are the letters A-Z.
+        """
+        self.model_path = model_path
+        with np.load(model_path) as model:
+            self.layers = []
+            while f'W{len(self.layers)}' in model:
+                index = len(self.layers)
+                self.layers.append((model[f'W{index}'].astype(np.float32), model[f'b{index}'].astype(np.float32)))
+            labels = [str(label) for label in model['labels']] if 'labels' in model else ALPHABET
+
+        if not self.layers:
+            raise ValueError(f"No W0/b0 layers in landmark model {model_path}")
+
+        self.input_size = self.layers[0][0].shape[0]
+        self.labels: List[Optional[str]] = labels + [None] * (self.layers[-1][0].shape[1] - len(labels))
+
+    def predict(self, features: np.ndarray) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Predict one letter and confidence per row of an (N, input_size) feature matrix"""
+        if features.shape[1] != self.input_size:
+            raise ValueError(f"Landmark model expects {self.input_size} features, got {features.shape[1]}")
+
+        activations = features
+        for index, (weights, bias) in enumerate(self.layers):
+            activations = activations @ weights + bias
+            if index < len(self.layers) - 1:
+                np.maximum(activations, 0.0, out=activations)
+
+        # Numerically stable softmax over the letter logits
+        activations -= activations.max(axis=1, keepdims=True)
+        probabilities = np.exp(activations)
+        probabilities /= probabilities.sum(axis=1, keepdims=True)
+
+        indices = probabilities.argmax(axis=1)
+        letters = [self.labels[i] for i in indices]
+        return letters, probabilities[np.arange(len(indices)), indices]
+
+
+def load_landmark_classifier(model_path: Optional[str]) -> Optional[LandmarkClassifier]:
+    """Load the landmark model if one is configured and present, None otherwise"""
+    if not model_path:
+        return None
+    if not os.path.exists(model_path):
+        logger.warning(f"Landmark model {model_path} not found, using the simplified classifier")
+        return None
+    classifier = LandmarkClassifier(model_path)
+    logger.info(f"Landmark classifier loaded from {model_path}")
+    return classifier
@@ -0,0 +1,290 @@
+import queue
+import threading
+import time
+import uuid
+from typing import Dict, Iterator, Optional
+
+import cv2
+import numpy as np
+
+from segmentation import LetterSegmenter
+from telemetry import span
+
+
+class LiveSession:
+    def __init__(self, session_id: str, recognizer, translation_batcher,
+                 pause_seconds: float = 1.0, min_confidence: float = 0.5, max_events: int = 256):
+        """Real-time fingerspelling session fed by individual camera frames"""
+        self.session_id = session_id
+        self.recognizer = recognizer
+        self.translation_batcher = translation_batcher
+        self.pause_seconds = pause_seconds
+        self.min_confidence = min_confidence
+
+        self.created_at = time.time()
+        self.last_activity = time.time()
+
+        # Single-slot frame buffer: a newer frame replaces one that has not been processed yet
+        self._frame = None
+        self._frame_condition = threading.Condition()
+
+        self._events = queue.Queue(maxsize=max_events)
+        self._letters = []
+        self._segmenter = LetterSegmenter(exit_threshold=min_confidence)
+        # Streaming recognizer state of this session, if the recognizer keeps any
+        self._stream = recognizer.create_stream()
+        self._last_hand_time = None
+        self._closed = False
+
+        self.frames_received = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0
+
+        self._worker = threading.Thread(target=self._run, name=f'live-{session_id[:8]}', daemon=True)
+        self._worker.start()
+
+    def submit_frame(self, image_bytes: bytes) -> bool:
+        """Queue an encoded frame, replacing any frame the worker has not picked up yet"""
+        with self._frame_condition:
+            if self._closed:
+                return False
+
+            self.frames_received += 1
+            self.last_activity = time.time()
+
+            dropped = self._frame is not None
+            if dropped:
+                self.frames_dropped += 1
+
+            self._frame = (image_bytes, time.perf_counter())
+            self._frame_condition.notify()
+
+        return not dropped
+
+    def events(self, keepalive_seconds: float = 15.0) -> Iterator[Optional[Dict]]:
+        """Yield session events as they happen, or None when a keepalive is due"""
+        while True:
+            try:
+                event = self._events.get(timeout=keepalive_seconds)
+            except queue.Empty:
+                yield None
+                continue
+
+            yield event
+            if event['type'] == 'closed':
+                return
+
+    def close(self):
+        """Stop the session, translating any letters that are still buffered"""
+        with self._frame_condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._frame_condition.notify()
+
+        self._worker.join(2.0)
+
+    def get_stats(self) -> Dict:
+        """Get frame counters for this session"""
+        return {
+            'session_id': self.session_id,
+            'frames_received': self.frames_received,
+            'frames_processed': self.frames_processed,
+            'frames_dropped': self.frames_dropped,
+            'buffered_letters': ''.join(self._letters)
+        }
+
+    def _run(self):
+        """Process the newest frame whenever one is available"""
+        while True:
+            with self._frame_condition:
+                if self._frame is None and not self._closed:
+                    self._frame_condition.wait(self.pause_seconds / 2)
+
+                if self._closed:
+                    break
+
+                item, self._frame = self._frame, None
+
+            if item is None:
+                # No frames arriving, the signer may have paused
+                now = time.time()
+                self._add_letter(self._segmenter.advance(now))
+                self._check_pause(now)
+                continue
+
+            try:
+                self._process_frame(*item)
+            except Exception as e:
+                self._emit({'type': 'error', 'error': str(e)})
+
+        self._flush()
+        if self._stream is not None:
+            self._stream.close()
+        self._emit({'type': 'closed'})
+
+    def _process_frame(self, image_bytes: bytes, received: float):
+        """Recognize a letter in one frame and emit the letters the segmenter settles on"""
+        frame = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            self._emit({'type': 'error', 'error': 'Could not decode frame'})
+            return
+
+        with span('live_recognition'):
+            result = self.recognizer.process_video_frame(frame, stream=self._stream)
+        self.frames_processed += 1
+        now = time.time()
+
+        letter = result['letter'] if result['hand_detected'] else None
+        emitted = self._segmenter.push(letter, result['confidence'], now)
+
+        if letter is None or result['confidence'] < self.min_confidence:
+            self._add_letter(emitted)
+            self._check_pause(now)
+            return
+
+        self._last_hand_time = now
+
+        if self._add_letter(emitted):
+            self._emit({
+                'type': 'letter',
+                'letter': emitted.strip(),
+                'confidence': result['confidence'],
+                'sequence': ''.join(self._letters),
+                'latency_ms': (time.perf_counter() - received) * 1000.0
+            })
+
+    def _add_letter(self, emitted: str) -> bool:
+        """Buffer a letter and/or word boundary from the segmenter, returning True for a new letter"""
+        if emitted.startswith(' '):
+            if self._letters and self._letters[-1] != ' ':
+                self._letters.append(' ')
+            emitted = emitted[1:]
+
+        if emitted:
+            self._letters.append(emitted)
+            return True
+        return False
+
+    def _check_pause(self, now: float):
+        """Translate the buffered letters once no hand has been seen for the pause window"""
+        if self._letters and self._last_hand_time is not None and now - self._last_hand_time >= self.pause_seconds:
+            self._flush()
+
+    def _flush(self):
+        """Translate and clear the buffered letters"""
+        if not self._letters:
+            return
+
+        sequence = ''.join(self._letters).strip()
+        self._letters = []
+        self._segmenter.reset()
+        if self._stream is not None:
+            self._stream.reset()
+        self._last_hand_time = None
+
+        result = self.translation_batcher.translate(sequence)
+        event = {'type': 'translation', 'asl_sequence': sequence, 'success': result['success']}
+        if result['success']:
+            event['translation'] = result['translation']
+            event['confidence'] = result['confidence']
+            event['suggestions'] = result.get('suggestions', [])
+        else:
+            event['error'] = result['error']
+        self._emit(event)
+
+    def _emit(self, event: Dict):
+        """Queue an event for the client, dropping the oldest one if nobody is listening"""
+        event['session_id'] = self.session_id
+        event['timestamp'] = time.time()
+
+        while True:
+            try:
+                self._events.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self._events.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class LiveSessionManager:
+    def __init__(self, recognizer, translation_batcher, max_sessions: int = 32,
+                 idle_timeout: float = 60.0, **session_kwargs):
+        """Create, look up and expire live fingerspelling sessions"""
+        self.recognizer = recognizer
+        self.translation_batcher = translation_batcher
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.session_kwargs = session_kwargs
+
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+        # Abandoned sessions are closed in the background, not only when a new one is created
+        self._stopped = threading.Event()
+        self._reaper = threading.Thread(target=self._reap, name='live-reaper', daemon=True)
+        self._reaper.start()
+
+    def create(self) -> Optional[LiveSession]:
+        """Start a new session, or return None when the server is at capacity"""
+        self._expire_idle()
+
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                return None
+
+            session_id = str(uuid.uuid4())
+            session = LiveSession(session_id, self.recognizer, self.translation_batcher, **self.session_kwargs)
+            self._sessions[session_id] = session
+            return session
+
+    def get(self, session_id: str) -> Optional[LiveSession]:
+        """Look up an active session"""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def close(self, session_id: str) -> bool:
+        """Close a session and forget it"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+
+        if session is None:
+            return False
+
+        session.close()
+        return True
+
+    def get_stats(self) -> Dict:
+        """Get per-session frame counters"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+
+        return {
+            'active_sessions': len(sessions),
+            'max_sessions': self.max_sessions,
+            'sessions': [session.get_stats() for session in sessions]
+        }
+
+    def stop(self):
+        """Stop the reaper and close every session"""
+        self._stopped.set()
+        with self._lock:
+            session_ids = list(self._sessions)
+        for session_id in session_ids:
+            self.close(session_id)
+
+    def _reap(self):
+        """Expire idle sessions several times per idle timeout"""
+        while not self._stopped.wait(max(1.0, self.idle_timeout / 4)):
+            self._expire_idle()
+
+    def _expire_idle(self):
+        """Close sessions that have not received frames for the idle timeout"""
+        cutoff = time.time() - self.idle_timeout
+        with self._lock:
+            idle = [sid for sid, session in self._sessions.items() if session.last_activity < cutoff]
+
+        for session_id in idle:
+            self.close(session_id)
@@ -1,18 +1,29 @@
 # This file is no longer needed for PyScript/Live Server setup.
 # All logic should be moved to pyscript/main_pyscript.py and imported via <py-script> in HTML.
 import os
+import re
 import uuid
 import json
+import base64
+import hashlib
+import time
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from werkzeug.utils import secure_filename
-import cv2
-import numpy as np
 from datetime import datetime
-import base64
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_file, Response, stream_with_context
 from flask_cors import CORS
-# Import our custom modules
-from asl_recognition import ASLRecognition
-from t5 import T5ASLTranslator
+# Import our custom modules (model modules pull in torch/cv2 and are imported when loading)
+from batching import TranslationBatcher
+from jobs import SAMPLE_RATE, VideoJobQueue, QueueFullError
+from streaming import StreamingUpload, UploadTooLargeError
+from storage import UploadIndex
+from translator_base import COMPILE_MODES, TRANSLATOR_BACKENDS
+from previews import PreviewCache, PREVIEW_MIMETYPE
+from prefork import serve_prefork
+from telemetry import (configure_logging, current_trace, end_trace, get_logger, metrics, record, render_gauge,
+                       span, start_trace, Trace, HTTP_METRIC, STAGE_METRIC)
 
 app = Flask(__name__)
 CORS(app)
@@ -21,6 +32,117 @@ CORS(app)
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'mp4', 'avi', 'mov', 'webm', 'mkv'}
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+UPLOAD_CHUNK_SIZE = 256 * 1024  # Read size for streamed uploads
+
+# Reject oversized request bodies before they are read (allow for multipart overhead)
+app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE + 1024 * 1024
+
+# Content types of the served videos, by upload extension
+VIDEO_MIMETYPES = {
+    'mp4': 'video/mp4',
+    'avi': 'video/x-msvideo',
+    'mov': 'video/quicktime',
+    'webm': 'video/webm',
+    'mkv': 'video/x-matroska'
+}
+VIDEO_MAX_AGE = int(os.environ.get('ASL_VIDEO_MAX_AGE', 3600))  # seconds before clients revalidate with the ETag
+# Hand file bodies to a fronting nginx/Apache (X-Sendfile) instead of streaming them from Python
+app.config['USE_X_SENDFILE'] = os.environ.get('ASL_USE_X_SENDFILE', '0').lower() in ('1', 'true', 'yes')
+
+# Low-bitrate WebM previews for the dashboard player, rendered once per video (unset = off)
+PREVIEW_DIR = os.environ.get('ASL_PREVIEW_DIR')
+PREVIEW_HEIGHT = int(os.environ.get('ASL_PREVIEW_HEIGHT', 360))
+PREVIEW_MAX_FPS = float(os.environ.get('ASL_PREVIEW_MAX_FPS', 15))
+
+# Translation micro-batching window
+BATCH_MAX_SIZE = int(os.environ.get('ASL_BATCH_MAX_SIZE', 8))
+BATCH_MAX_WAIT_MS = float(os.environ.get('ASL_BATCH_MAX_WAIT_MS', 10))
+
+# Alternative translations returned with each /translate and /upload result
+NUM_SUGGESTIONS = 3
+
+# Chunk size for /batch_translate generate calls
+TRANSLATE_BATCH_SIZE = int(os.environ.get('ASL_TRANSLATE_BATCH_SIZE', 32))
+
+# T5 inference runtime: 'torch', or 'onnx' for graphs exported with `python t5_onnx.py export`
+T5_BACKEND = os.environ.get('ASL_T5_BACKEND', 'torch')
+T5_ONNX_DIR = os.environ.get('ASL_T5_ONNX_DIR', os.path.join('models', 't5-onnx'))
+
+# T5 model and CPU inference options
+T5_MODEL = os.environ.get('ASL_T5_MODEL', 't5-base')  # e.g. t5-small for lower latency
+T5_QUANTIZE = os.environ.get('ASL_T5_QUANTIZE', '0') == '1'  # dynamic int8 Linear layers
+T5_COMPILE = os.environ.get('ASL_T5_COMPILE') or None  # 'torch_compile'
+TORCH_THREADS = int(os.environ.get('ASL_TORCH_THREADS', 0)) or None
+TORCH_INTEROP_THREADS = int(os.environ.get('ASL_TORCH_INTEROP_THREADS', 0)) or None
+
+# Refuse to start with a translator configuration that could never load
+if T5_BACKEND not in TRANSLATOR_BACKENDS:
+    raise ValueError(f"ASL_T5_BACKEND must be one of {', '.join(TRANSLATOR_BACKENDS)}, not {T5_BACKEND}")
+if T5_COMPILE is not None and T5_COMPILE not in COMPILE_MODES:
+    raise ValueError(f"ASL_T5_COMPILE must be one of {', '.join(COMPILE_MODES)}, not {T5_COMPILE}")
+
+# Translation result cache (set ASL_CACHE_PATH to persist across restarts)
+CACHE_SIZE = int(os.environ.get('ASL_CACHE_SIZE', 4096))
+CACHE_TTL = float(os.environ.get('ASL_CACHE_TTL', 24 * 3600))
+CACHE_PATH = os.environ.get('ASL_CACHE_PATH')
+
+# Background video processing (each worker process loads its own models)
+JOB_WORKERS = int(os.environ.get('ASL_JOB_WORKERS', 2))
+JOB_MAX_BACKLOG = int(os.environ.get('ASL_JOB_MAX_BACKLOG', 16))
+
+# Cache of decoded hand regions per video, so re-recognition skips decoding (unset = off)
+FRAME_CACHE_DIR = os.environ.get('ASL_FRAME_CACHE_DIR')
+FRAME_CACHE_MAX_MB = int(os.environ.get('ASL_FRAME_CACHE_MAX_MB', 512))
+
+# Letter segmentation of per-frame predictions (confidence-weighted frames per letter, gaps in seconds)
+SEGMENT_MIN_WEIGHT = float(os.environ.get('ASL_SEGMENT_MIN_WEIGHT', 1.2))
+SEGMENT_WORD_GAP = float(os.environ.get('ASL_SEGMENT_WORD_GAP', 0.6))
+SEGMENT_END_GAP = float(os.environ.get('ASL_SEGMENT_END_GAP', 2.0))
+
+# Motion-gated sampling: classify frames only while the video moves, faster during fast motion
+MOTION_GATING = os.environ.get('ASL_MOTION_GATING', '0').lower() in ('1', 'true', 'yes')
+MOTION_THRESHOLD = float(os.environ.get('ASL_MOTION_THRESHOLD', 0.5))  # % of changed thumbnail pixels
+MOTION_FAST_THRESHOLD = float(os.environ.get('ASL_MOTION_FAST_THRESHOLD', 5.0))
+
+# Letter classifier: 'simplified', or 'movinet' for the MoViNet-A2 clip classifier (needs TensorFlow)
+RECOGNITION_BACKEND = os.environ.get('ASL_RECOGNITION_BACKEND', 'simplified')
+MOVINET_CHECKPOINT = os.environ.get('ASL_MOVINET_CHECKPOINT', 'movinet_checkpoints_a2_epoch9')
+MOVINET_STREAM_CHECKPOINT = os.environ.get('ASL_MOVINET_STREAM_CHECKPOINT')  # causal A2 checkpoint for live sessions
+MOVINET_CLIP_LENGTH = int(os.environ.get('ASL_MOVINET_CLIP_LENGTH', 8))  # sampled frames per clip
+MOVINET_BATCH_CLIPS = int(os.environ.get('ASL_MOVINET_BATCH_CLIPS', 4))  # clips per forward pass
+
+# Hand landmarks extracted on the client (/recognize/landmarks), classified by an .npz model if set
+LANDMARK_MODEL = os.environ.get('ASL_LANDMARK_MODEL')
+LANDMARK_MAX_BYTES = int(os.environ.get('ASL_LANDMARK_MAX_BYTES', 4 * 1024 * 1024))  # ~16000 float32 hand frames
+LANDMARK_FPS = 30.0  # frame rate assumed when the client does not send one
+
+# MediaPipe hand tracking: detect the hand once, follow it across frames and re-detect only when tracking is lost
+HAND_TRACKING = os.environ.get('ASL_HAND_TRACKING', '0').lower() in ('1', 'true', 'yes')
+HAND_MAX_HANDS = int(os.environ.get('ASL_HAND_MAX_HANDS', 1))
+HAND_DETECTION_CONFIDENCE = float(os.environ.get('ASL_HAND_DETECTION_CONFIDENCE', 0.5))
+HAND_TRACKING_CONFIDENCE = float(os.environ.get('ASL_HAND_TRACKING_CONFIDENCE', 0.5))  # below this, detect again
+HAND_MODEL_COMPLEXITY = int(os.environ.get('ASL_HAND_MODEL_COMPLEXITY', 0))  # 0 = lite landmark model
+
+# Pre-fork serving: load the models once and share them with this many worker processes (0 = off)
+PREFORK_WORKERS = int(os.environ.get('ASL_PREFORK_WORKERS', 0))
+PREFORK_JOB_WORKERS = int(os.environ.get('ASL_PREFORK_JOB_WORKERS', 1))  # video job processes per worker
+
+# Real-time fingerspelling sessions
+LIVE_MAX_SESSIONS = int(os.environ.get('ASL_LIVE_MAX_SESSIONS', 32))
+LIVE_PAUSE_SECONDS = float(os.environ.get('ASL_LIVE_PAUSE_SECONDS', 1.0))
+LIVE_MAX_FRAME_SIZE = 2 * 1024 * 1024  # 2MB per JPEG frame
+
+# Structured JSON logs on stdout
+LOG_LEVEL = os.environ.get('ASL_LOG_LEVEL', 'INFO')
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,128}$')  # accepted X-Request-ID values
+
+# Upload/result metadata index
+INDEX_PATH = os.environ.get('ASL_INDEX_PATH', os.path.join(UPLOAD_FOLDER, 'index.sqlite3'))
+FILES_PAGE_SIZE = 50
+FILES_MAX_PAGE_SIZE = 500
+
+configure_logging(LOG_LEVEL)
+logger = get_logger('main')
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -28,57 +150,561 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 # Initialize models
 asl_recognizer = None
 translator = None
+translation_batcher = None
+job_queue = None
+live_sessions = None
+upload_index = None
+preview_cache = None
+
+# Per-model load state reported by /health, filled in by the background loader
+model_load_status = {
+    name: {'state': 'pending', 'load_seconds': None, 'error': None}
+    for name in ('asl_recognition', 't5_translation', 'video_workers')
+}
+models_ready = threading.Event()
+
+# Uploads answered with the result of identical content processed before, reported by /stats/uploads
+dedup_stats = {'hits': 0, 'misses': 0, 'bytes_saved': 0}
+dedup_lock = threading.Lock()
+
+# Content hash of the landmark model by (path, size, mtime), so it is read once per file
+landmark_model_hashes = {}
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def initialize_storage():
+    """Open the upload index, importing result files written before it existed"""
+    global upload_index, preview_cache
+    
+    try:
+        upload_index = UploadIndex(INDEX_PATH)
+        if PREVIEW_DIR:
+            preview_cache = PreviewCache(PREVIEW_DIR, height=PREVIEW_HEIGHT, max_fps=PREVIEW_MAX_FPS)
+        imported = upload_index.import_legacy_results(UPLOAD_FOLDER)
+        if imported:
+            logger.info(f"Imported {imported} existing results into the upload index")
+        return True
+    except Exception as e:
+        logger.error(f"Error opening upload index: {e}")
+        return False
+
 def initialize_models():
-    """Initialize ASL recognition and translation models"""
+    """Start loading the models in the background so the server can accept requests right away"""
+    loader = threading.Thread(target=_load_models, name='model-loader', daemon=True)
+    loader.start()
+    return loader
+
+def _load_models():
+    """Load the models and start the video workers concurrently, then start the services using them"""
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='job-start') as pool:
+        pool.submit(_timed_load, 'video_workers', _start_job_queue)
+        loaded = load_models()
+    
+    if not loaded:
+        logger.error("Failed to initialize models, model endpoints will stay unavailable")
+        return
+    
+    if start_services() and job_queue is not None:
+        models_ready.set()
+        logger.info("All models loaded successfully")
+
+def load_models():
+    """Load the ASL recognition and translation models concurrently"""
     global asl_recognizer, translator
     
-    try:
-        print("Initializing ASL Recognition model...")
-        asl_recognizer = ASLRecognition()
-        print("ASL Recognition model initialized successfully")
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix='model-load') as pool:
+        recognizer_future = pool.submit(_timed_load, 'asl_recognition', _load_asl_recognizer)
+        translator_future = pool.submit(_timed_load, 't5_translation', _load_translator)
         
-        print("Initializing T5 Translation model...")
-        translator = T5ASLTranslator()
-        print("T5 Translation model initialized successfully")
+        asl_recognizer = recognizer_future.result()
+        translator = translator_future.result()
+    
+    return asl_recognizer is not None and translator is not None
+
+def start_services():
+    """Start the translation batcher and live sessions on top of the loaded models"""
+    global translation_batcher, live_sessions
+    
+    try:
+        translation_batcher = TranslationBatcher(
+            translator,
+            max_batch_size=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_MAX_WAIT_MS,
+            num_suggestions=NUM_SUGGESTIONS
+        )
+        translation_batcher.start()
+        logger.info(f"Translation batcher started (max batch {BATCH_MAX_SIZE}, window {BATCH_MAX_WAIT_MS} ms)")
         
+        from live import LiveSessionManager
+        live_sessions = LiveSessionManager(
+            asl_recognizer,
+            translation_batcher,
+            max_sessions=LIVE_MAX_SESSIONS,
+            pause_seconds=LIVE_PAUSE_SECONDS
+        )
         return True
     except Exception as e:
-        print(f"Error initializing models: {e}")
+        logger.error(f"Error starting model services: {e}")
+        return False
+
+def _timed_load(name, load):
+    """Run one model loader, recording its state and duration for /health"""
+    status = model_load_status[name]
+    status['state'] = 'loading'
+    started = time.perf_counter()
+    
+    try:
+        model = load()
+    except Exception as e:
+        logger.error(f"Error initializing {name}: {e}")
+        status['state'] = 'failed'
+        status['error'] = str(e)
+        return None
+    finally:
+        status['load_seconds'] = time.perf_counter() - started
+    
+    status['state'] = 'ready'
+    return model
+
+def _load_asl_recognizer():
+    """Import and initialize the ASL recognition model"""
+    logger.info("Initializing ASL Recognition model...")
+    from asl_recognition import ASLRecognition
+    recognizer = ASLRecognition(**recognizer_options())
+    logger.info("ASL Recognition model initialized successfully")
+    return recognizer
+
+def recognizer_options():
+    """Settings shared by every ASL recognizer instance"""
+    return {
+        'frame_cache_dir': FRAME_CACHE_DIR,
+        'frame_cache_max_bytes': FRAME_CACHE_MAX_MB * 1024 * 1024,
+        'segmenter_options': {
+            'min_weight': SEGMENT_MIN_WEIGHT,
+            'word_gap': SEGMENT_WORD_GAP,
+            'end_gap': SEGMENT_END_GAP
+        },
+        'motion_options': {
+            'motion_threshold': MOTION_THRESHOLD,
+            'fast_threshold': MOTION_FAST_THRESHOLD
+        } if MOTION_GATING else None,
+        'clip_classifier_options': {
+            'checkpoint_path': MOVINET_CHECKPOINT,
+            'stream_checkpoint_path': MOVINET_STREAM_CHECKPOINT,
+            'clip_length': MOVINET_CLIP_LENGTH,
+            'batch_size': MOVINET_BATCH_CLIPS
+        } if RECOGNITION_BACKEND == 'movinet' else None,
+        'landmark_model_path': LANDMARK_MODEL,
+        'hand_tracking_options': {
+            'max_hands': HAND_MAX_HANDS,
+            'min_detection_confidence': HAND_DETECTION_CONFIDENCE,
+            'min_tracking_confidence': HAND_TRACKING_CONFIDENCE,
+            'model_complexity': HAND_MODEL_COMPLEXITY
+        } if HAND_TRACKING else None
+    }
+
+def translator_options():
+    """Model selection and CPU inference settings shared by every translator instance"""
+    if T5_BACKEND == 'onnx':
+        return {
+            'backend': 'onnx',
+            'model_dir': T5_ONNX_DIR,
+            'num_threads': TORCH_THREADS,
+            'num_interop_threads': TORCH_INTEROP_THREADS
+        }
+    
+    return {
+        'backend': T5_BACKEND,
+        'model_name': T5_MODEL,
+        'quantize': T5_QUANTIZE,
+        'compile_mode': T5_COMPILE,
+        'num_threads': TORCH_THREADS,
+        'num_interop_threads': TORCH_INTEROP_THREADS
+    }
+
+def _load_translator():
+    """Import and initialize the T5 translation model"""
+    logger.info(f"Initializing T5 Translation model ({T5_BACKEND})...")
+    from translator_base import create_translator
+    model = create_translator(
+        cache_size=CACHE_SIZE,
+        cache_ttl=CACHE_TTL,
+        cache_path=CACHE_PATH,
+        **translator_options()
+    )
+    if model.model is None:
+        # The translator logged why; /health must not report it ready
+        raise RuntimeError(f"T5 model {T5_MODEL if T5_BACKEND == 'torch' else T5_ONNX_DIR} could not be loaded")
+    logger.info("T5 Translation model initialized successfully")
+    return model
+
+def _start_job_queue(num_workers=None, shared_models=False):
+    """Start the video processing worker processes
+    
+    With shared_models, the workers are forked from this process and use its
+    already loaded models instead of loading their own.
+    """
+    global job_queue
+    
+    num_workers = num_workers or JOB_WORKERS
+    logger.info(f"Starting {num_workers} video processing workers...")
+    job_queue = VideoJobQueue(
+        on_complete=save_job_result,
+        log_level=LOG_LEVEL,
+        on_failed=record_job_failure,
+        num_workers=num_workers,
+        max_backlog=JOB_MAX_BACKLOG,
+        num_suggestions=NUM_SUGGESTIONS,
+        translator_kwargs={'cache_size': CACHE_SIZE, 'cache_ttl': CACHE_TTL, **translator_options()},
+        recognizer_kwargs=recognizer_options(),
+        start_method='fork' if shared_models else 'spawn',
+        preloaded=(asl_recognizer, translator) if shared_models else None
+    )
+    job_queue.warm_up()
+    return job_queue
+
+def run_prefork(host, port):
+    """Load the models once, then serve from pre-forked workers that share them copy-on-write"""
+    if T5_BACKEND != 'torch':
+        # onnxruntime sessions own thread pools that do not survive fork()
+        logger.error("Pre-fork mode requires the torch translation backend")
+        return False
+    if RECOGNITION_BACKEND != 'simplified':
+        # The TensorFlow runtime's threads do not survive fork() either
+        logger.error("Pre-fork mode requires the simplified recognition backend")
         return False
+    
+    if not initialize_storage():
+        return False
+    # SQLite connections must not cross fork(), each worker opens its own
+    upload_index.close()
+    
+    if not load_models():
+        logger.error("Failed to initialize models. Exiting...")
+        return False
+    
+    logger.info(f"Models loaded, starting {PREFORK_WORKERS} pre-forked workers...")
+    serve_prefork(app, host, port, PREFORK_WORKERS,
+                  post_fork=_init_prefork_worker, on_exit=_stop_prefork_worker)
+    return True
+
+def _init_prefork_worker(index):
+    """Start a pre-forked worker's own threads and job processes on top of the shared models"""
+    # Forked workers inherit the master's random state, give each its own
+    import random
+    import numpy as np
+    random.seed()
+    np.random.seed()
+    
+    initialize_storage()
+    
+    # Fork the job processes before any other thread starts in this worker
+    _timed_load('video_workers', lambda: _start_job_queue(PREFORK_JOB_WORKERS, shared_models=True))
+    
+    if start_services() and job_queue is not None:
+        models_ready.set()
+
+def _stop_prefork_worker(index):
+    """Stop a pre-forked worker's job processes and persist its translation cache"""
+    if job_queue is not None:
+        job_queue.shutdown(wait=True)
+    if translator is not None:
+        translator.cache.save()
+
+def save_job_result(job, output):
+    """Write the result of a finished video processing job"""
+    translation_result = output['translation']
+    
+    result = {
+        'success': True,
+        'status': 'done',
+        'file_id': job['file_id'],
+        'filename': job['filename'],
+        'file_size': job['file_size'],
+        'upload_time': job['upload_time'],
+        'asl_recognition': {
+            'sequence': output['asl_sequence'],
+            'confidence': output['asl_confidence']
+        },
+        'translation': {
+            'english_text': translation_result['translation'],
+            'confidence': translation_result['confidence'],
+            'suggestions': translation_result['suggestions']
+        },
+        'processing_time': job['timings'].get('upload', 0) + time.time() - job['submitted_at'],
+        'timings': job['timings']
+    }
+    
+    # The worker's stages and the result write make up the job's trace
+    trace = Trace(job['file_id'])
+    trace.merge(output.get('stages', {}))
+    if 'queue_wait' in job['timings']:
+        trace.add('queue_wait', job['timings']['queue_wait'])
+    
+    # Save result to the index for later retrieval
+    with span('result_write', trace):
+        upload_index.set_result(job['file_id'], result, model_version=current_model_version())
+    
+    stages = trace.finish()
+    logger.info("Video job finished", extra={
+        'request_id': job['file_id'],
+        'fields': {
+            'duration_ms': round(result['processing_time'] * 1000.0, 3),
+            'stages': {stage: round(seconds * 1000.0, 3) for stage, seconds in stages.items()}
+        }
+    })
+
+def current_model_version():
+    """Version of the models producing video results, results are only reused within one version
+
+    The translator version plus a digest of every recognition setting (recognizer
+    options, landmark model contents and sample rate), so changing any of them
+    stops identical uploads from reusing older results.
+    """
+    if translator is None:
+        return None
+    recognition = {
+        'options': recognizer_options(),
+        'landmark_model_hash': landmark_model_hash(LANDMARK_MODEL),
+        'sample_rate': SAMPLE_RATE
+    }
+    digest = hashlib.sha256(json.dumps(recognition, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+    return f"{translator.model_version}+{RECOGNITION_BACKEND}-{digest}"
+
+def landmark_model_hash(path):
+    """SHA-256 of the landmark model file, None if none is configured or it is missing"""
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if key not in landmark_model_hashes:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        landmark_model_hashes[key] = digest.hexdigest()
+    return landmark_model_hashes[key]
+
+def reuse_existing_result(file_id, filename, file_path, file_size, content_hash, upload_duration):
+    """Register an upload with the result of identical content processed by the current models
+    
+    Returns the result stored under the new file_id, or None if this content was not processed before.
+    """
+    model_version = current_model_version()
+    existing = upload_index.find_result(content_hash, model_version) if model_version else None
+    
+    if existing is None:
+        with dedup_lock:
+            dedup_stats['misses'] += 1
+        return None
+    
+    # Keep one copy of the bytes on disk, deleting either upload later only drops a link
+    linked = _link_duplicate(existing['video_path'], file_path)
+    
+    result = dict(existing['result'])
+    result.update({
+        'file_id': file_id,
+        'filename': filename,
+        'file_size': file_size,
+        'upload_time': datetime.now().isoformat(),
+        'processing_time': upload_duration,
+        'timings': {'upload': upload_duration},
+        'deduplicated_from': existing['file_id']
+    })
+    upload_index.add_result(file_id, filename, file_path, result, content_hash, model_version)
+    
+    with dedup_lock:
+        dedup_stats['hits'] += 1
+        if linked:
+            dedup_stats['bytes_saved'] += file_size
+    
+    logger.info(f"Reused result of {existing['file_id']} for identical upload {file_id}")
+    return result
+
+def _link_duplicate(existing_path, file_path):
+    """Replace a new upload with a hardlink to an identical existing video, keeping the copy if linking fails"""
+    if not existing_path or not os.path.exists(existing_path):
+        return False
+    
+    link_path = f"{file_path}.link"
+    try:
+        os.link(existing_path, link_path)
+        os.replace(link_path, file_path)
+        return True
+    except OSError as e:
+        logger.warning(f"Could not hardlink duplicate upload {file_path}: {e}")
+        if os.path.exists(link_path):
+            os.remove(link_path)
+        return False
+
+def deduplicated_response(file_id, filename, file_size, result):
+    """Response for an upload answered with an existing result"""
+    return jsonify({
+        'success': True,
+        'file_id': file_id,
+        'filename': filename,
+        'file_size': file_size,
+        'status': 'done',
+        'deduplicated': True,
+        'result': result,
+        'result_url': f"/result/{file_id}"
+    })
+
+def record_job_failure(job):
+    """Record a failed video processing job in the upload index"""
+    upload_index.set_failed(job['file_id'], job['error'])
+
+@app.before_request
+def start_request_trace():
+    """Tag the request with an ID, taken from X-Request-ID when the client sent a valid one"""
+    request_id = request.headers.get('X-Request-ID', '')
+    start_trace(request_id if REQUEST_ID_PATTERN.match(request_id) else None)
+
+@app.after_request
+def finish_request_trace(response):
+    """Observe the request's duration and stages, and write its access log line"""
+    trace = current_trace()
+    if trace is None:
+        return response
+    
+    response.headers['X-Request-ID'] = trace.request_id
+    duration = trace.elapsed()
+    endpoint = request.endpoint or 'unmatched'
+    metrics.observe(HTTP_METRIC, duration, endpoint=endpoint, method=request.method,
+                    status=str(response.status_code))
+    stages = trace.finish()
+    
+    logger.info("Request handled", extra={'fields': {
+        'method': request.method,
+        'path': request.path,
+        'status': response.status_code,
+        'duration_ms': round(duration * 1000.0, 3),
+        'stages': {stage: round(seconds * 1000.0, 3) for stage, seconds in stages.items()}
+    }})
+    return response
+
+@app.teardown_request
+def clear_request_trace(error=None):
+    """Detach the trace from the server thread"""
+    end_trace()
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Stage and request latency histograms, plus queue gauges, in the Prometheus text format"""
+    lines = [metrics.render()]
+    
+    if job_queue is not None:
+        jobs = job_queue.get_stats()['jobs']
+        lines.append(render_gauge('asl_video_jobs', 'Video jobs by status', {
+            (('status', status),): count for status, count in jobs.items()
+        }))
+    if translation_batcher is not None:
+        lines.append(render_gauge('asl_translation_queue_depth', 'Translation requests waiting for a batch', {
+            (): translation_batcher.get_metrics()['queue_depth']
+        }))
+    if live_sessions is not None:
+        lines.append(render_gauge('asl_live_sessions', 'Open live sessions', {
+            (): live_sessions.get_stats()['active_sessions']
+        }))
+    
+    return Response(''.join(lines), mimetype='text/plain; version=0.0.4')
+
+@app.route('/stats/latency', methods=['GET'])
+def latency_stats():
+    """Get count, mean and p50/p95/p99 estimates per stage and endpoint, in seconds"""
+    return jsonify({
+        'stages': metrics.get_stats(STAGE_METRIC),
+        'requests': metrics.get_stats(HTTP_METRIC)
+    })
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Liveness check, with model readiness and load durations"""
     return jsonify({
         'status': 'healthy',
+        'live': True,
+        'ready': models_ready.is_set(),
         'models_loaded': {
             'asl_recognition': asl_recognizer is not None,
             't5_translation': translator is not None
         },
+        'models': model_load_status,
         'timestamp': datetime.now().isoformat()
     })
 
+@app.route('/health/ready', methods=['GET'])
+def readiness_check():
+    """Readiness check, 503 until every model has loaded"""
+    ready = models_ready.is_set()
+    return jsonify({
+        'ready': ready,
+        'models': model_load_status
+    }), 200 if ready else 503
+
 @app.route('/models/status', methods=['GET'])
 def model_status():
     """Get detailed model status"""
+    asl_status = {
+        'loaded': asl_recognizer is not None,
+        'type': 'MoViNet-A2' if RECOGNITION_BACKEND == 'movinet' else 'MediaPipe + CNN',
+        'capabilities': ['hand_detection', 'gesture_recognition', 'video_processing']
+    }
+    if asl_recognizer is not None and asl_recognizer.clip_classifier is not None:
+        asl_status['clip_classifier'] = asl_recognizer.clip_classifier.get_stats()
+    
     return jsonify({
-        'asl_recognition': {
-            'loaded': asl_recognizer is not None,
-            'type': 'MediaPipe + CNN',
-            'capabilities': ['hand_detection', 'gesture_recognition', 'video_processing']
-        },
+        'asl_recognition': asl_status,
         't5_translation': {
             'loaded': translator is not None,
-            'type': 'T5-Base',
+            'type': translator.model_version if translator is not None else T5_MODEL,
             'capabilities': ['asl_to_english', 'batch_translation', 'translation_suggestions']
         }
     })
 
+@app.route('/stats/batching', methods=['GET'])
+def batching_stats():
+    """Get translation micro-batching metrics"""
+    if translation_batcher is None:
+        return jsonify({'error': 'Translation batcher not running'}), 503
+    
+    return jsonify(translation_batcher.get_metrics())
+
+@app.route('/stats/cache', methods=['GET'])
+def cache_stats():
+    """Get translation cache metrics"""
+    if translator is None:
+        return jsonify({'error': 'Translation model not loaded'}), 503
+    
+    stats = translator.get_cache_stats()
+    if asl_recognizer is not None and asl_recognizer.frame_cache is not None:
+        stats['frame_cache'] = asl_recognizer.frame_cache.get_stats()
+    if preview_cache is not None:
+        stats['previews'] = preview_cache.get_stats()
+    return jsonify(stats)
+
+@app.route('/stats/jobs', methods=['GET'])
+def job_stats():
+    """Get background video processing queue metrics"""
+    if job_queue is None:
+        return jsonify({'error': 'Video processing is not available'}), 503
+    
+    return jsonify(job_queue.get_stats())
+
+@app.route('/stats/uploads', methods=['GET'])
+def upload_stats():
+    """Get content-hash deduplication metrics for uploads"""
+    with dedup_lock:
+        stats = dict(dedup_stats)
+    
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+    return jsonify(stats)
+
 @app.route('/upload', methods=['POST'])
 def upload_video():
     """Upload and process ASL video"""
@@ -105,6 +731,9 @@ def upload_video():
         if file_size > MAX_FILE_SIZE:
             return jsonify({'error': 'File too large'}), 400
         
+        if job_queue is None or upload_index is None:
+            return jsonify({'error': 'Video processing is not available'}), 503
+        
         # Generate unique filename
         file_id = str(uuid.uuid4())
         filename = secure_filename(file.filename)
@@ -112,99 +741,393 @@ def upload_video():
         new_filename = f"{file_id}.{file_extension}"
         file_path = os.path.join(UPLOAD_FOLDER, new_filename)
         
-        # Save file
-        file.save(file_path)
+        # Save file, hashing it on the way to disk
+        upload = StreamingUpload(file_path, MAX_FILE_SIZE)
+        try:
+            while True:
+                chunk = file.stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                upload.write(chunk)
+            upload.close()
+        except Exception:
+            upload.abort()
+            raise
+        upload_duration = upload.duration
+        record('upload_write', upload_duration)
         
-        # Process video for ASL recognition
-        if asl_recognizer is None:
-            return jsonify({'error': 'ASL recognition model not loaded'}), 500
+        # Identical bytes were processed before, answer with that result right away
+        reused = reuse_existing_result(file_id, filename, file_path, file_size, upload.content_hash, upload_duration)
+        if reused is not None:
+            return deduplicated_response(file_id, filename, file_size, reused)
         
-        print(f"Processing video: {file_path}")
+        upload_index.add_upload(file_id, filename, file_path, content_hash=upload.content_hash)
         
-        # Extract ASL sequence
-        asl_sequence = asl_recognizer.get_asl_sequence(file_path)
+        # Hand the video to the background workers
+        try:
+            job = job_queue.submit(
+                file_id,
+                file_path,
+                metadata={
+                    'filename': filename,
+                    'file_size': file_size,
+                    'upload_time': datetime.now().isoformat()
+                },
+                timings={'upload': upload_duration},
+                cache_key=upload.content_hash
+            )
+        except QueueFullError as e:
+            upload_index.delete(file_id)
+            os.remove(file_path)
+            return jsonify({'error': str(e)}), 429
         
-        if not asl_sequence:
-            return jsonify({
-                'error': 'No ASL gestures detected in video',
-                'file_id': file_id,
-                'filename': filename
-            }), 400
+        logger.info(f"Queued video for processing: {file_path}")
         
-        # Translate ASL to English
-        if translator is None:
-            return jsonify({'error': 'Translation model not loaded'}), 500
+        return jsonify({
+            'success': True,
+            'file_id': file_id,
+            'filename': filename,
+            'file_size': file_size,
+            'status': job['status'],
+            'result_url': f"/result/{file_id}"
+        }), 202
         
-        translation_result = translator.translate_asl_to_english(asl_sequence)
+    except Exception as e:
+        logger.error(f"Error processing video: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/upload/stream', methods=['POST', 'PUT'])
+def upload_video_stream():
+    """Stream a raw ASL video body to disk and start recognition while it arrives"""
+    try:
+        filename = secure_filename(request.args.get('filename', ''))
         
-        if not translation_result['success']:
-            return jsonify({
-                'error': f'Translation failed: {translation_result["error"]}',
-                'file_id': file_id,
-                'asl_sequence': asl_sequence
-            }), 500
+        if not filename:
+            return jsonify({'error': 'No filename provided'}), 400
         
-        # Get additional translation suggestions
-        suggestions = translator.get_translation_suggestions(asl_sequence, 3)
+        if not allowed_file(filename):
+            return jsonify({'error': 'File type not allowed'}), 400
         
-        # Prepare response
-        result = {
+        if request.content_length is not None and request.content_length > MAX_FILE_SIZE:
+            return jsonify({'error': 'File too large'}), 400
+        
+        if job_queue is None or upload_index is None:
+            return jsonify({'error': 'Video processing is not available'}), 503
+        
+        # Generate unique filename
+        file_id = str(uuid.uuid4())
+        file_extension = filename.rsplit('.', 1)[1].lower()
+        file_path = os.path.join(UPLOAD_FOLDER, f"{file_id}.{file_extension}")
+        metadata = {
+            'filename': filename,
+            'upload_time': datetime.now().isoformat()
+        }
+        
+        upload = StreamingUpload(file_path, MAX_FILE_SIZE)
+        job = None
+        
+        try:
+            while True:
+                chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                upload.write(chunk)
+                
+                # Start decoding as soon as the container header shows it can be read front to back
+                if job is None and upload.streamable(file_extension):
+                    fifo_path = os.path.join(tempfile.gettempdir(), f"asl-stream-{file_id}.{file_extension}")
+                    upload_index.add_upload(file_id, filename, file_path)
+                    upload.start_feeder(fifo_path)
+                    job = job_queue.submit(file_id, fifo_path, metadata, input_complete=False)
+            
+            upload.close()
+            
+        except UploadTooLargeError as e:
+            upload.abort()
+            upload_index.delete(file_id)
+            if job is not None:
+                job_queue.cancel(file_id, str(e))
+            return jsonify({'error': str(e)}), 400
+        except QueueFullError as e:
+            upload.abort()
+            upload_index.delete(file_id)
+            return jsonify({'error': str(e)}), 429
+        except Exception:
+            upload.abort()
+            upload_index.delete(file_id)
+            if job is not None:
+                job_queue.cancel(file_id, 'Upload interrupted')
+            raise
+        
+        if upload.size == 0:
+            upload.abort()
+            return jsonify({'error': 'No video data provided'}), 400
+        
+        metadata['file_size'] = upload.size
+        timings = {'upload': upload.duration}
+        record('upload_write', upload.duration)
+        
+        reused = reuse_existing_result(file_id, filename, file_path, upload.size, upload.content_hash, upload.duration)
+        if reused is not None:
+            if job is not None:
+                # Decoding started before the upload completed, its result is no longer needed
+                job_queue.cancel(file_id, 'Duplicate of an already processed upload')
+            return deduplicated_response(file_id, filename, upload.size, reused)
+        
+        if job is None:
+            # Container needs the complete file (e.g. mp4 with the index at the end)
+            upload_index.add_upload(file_id, filename, file_path, content_hash=upload.content_hash)
+            try:
+                job = job_queue.submit(file_id, file_path, metadata, timings=timings, cache_key=upload.content_hash)
+            except QueueFullError as e:
+                upload_index.delete(file_id)
+                os.remove(file_path)
+                return jsonify({'error': str(e)}), 429
+            streamed = False
+        else:
+            upload_index.set_content_hash(file_id, upload.content_hash)
+            job_queue.update(file_id, metadata={'file_size': upload.size}, timings=timings, input_complete=True)
+            streamed = True
+        
+        logger.info(f"Received streamed video: {file_path} ({upload.size} bytes, early decode: {streamed})")
+        
+        return jsonify({
             'success': True,
             'file_id': file_id,
             'filename': filename,
-            'file_size': file_size,
-            'upload_time': datetime.now().isoformat(),
+            'file_size': upload.size,
+            'status': job['status'],
+            'early_decode': streamed,
+            'result_url': f"/result/{file_id}"
+        }), 202
+        
+    except Exception as e:
+        logger.error(f"Error processing streamed video: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/live/session', methods=['POST'])
+def create_live_session():
+    """Start a real-time fingerspelling session"""
+    if live_sessions is None:
+        return jsonify({'error': 'Live recognition is not available'}), 503
+    
+    session = live_sessions.create()
+    if session is None:
+        return jsonify({'error': 'Too many live sessions, please retry later'}), 429
+    
+    return jsonify({
+        'success': True,
+        'session_id': session.session_id,
+        'frame_url': f"/live/{session.session_id}/frame",
+        'events_url': f"/live/{session.session_id}/events"
+    })
+
+@app.route('/live/<session_id>/frame', methods=['POST'])
+def submit_live_frame(session_id):
+    """Submit one JPEG/PNG camera frame to a live session"""
+    session = live_sessions.get(session_id) if live_sessions is not None else None
+    if session is None:
+        return jsonify({'error': 'Session not found'}), 404
+    
+    if request.content_length is not None and request.content_length > LIVE_MAX_FRAME_SIZE:
+        return jsonify({'error': 'Frame too large'}), 400
+    
+    image_bytes = request.get_data()
+    if not image_bytes:
+        return jsonify({'error': 'No frame provided'}), 400
+    
+    accepted = session.submit_frame(image_bytes)
+    
+    return jsonify({
+        'success': True,
+        'replaced_pending_frame': not accepted,
+        'frames_dropped': session.frames_dropped
+    }), 202
+
+@app.route('/live/<session_id>/events', methods=['GET'])
+def live_events(session_id):
+    """Server-sent event stream of recognized letters and translations"""
+    session = live_sessions.get(session_id) if live_sessions is not None else None
+    if session is None:
+        return jsonify({'error': 'Session not found'}), 404
+    
+    def generate():
+        for event in session.events():
+            if event is None:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/live/<session_id>', methods=['DELETE'])
+def close_live_session(session_id):
+    """Close a live session, translating any buffered letters"""
+    if live_sessions is None or not live_sessions.close(session_id):
+        return jsonify({'error': 'Session not found'}), 404
+    
+    return jsonify({'success': True})
+
+@app.route('/stats/live', methods=['GET'])
+def live_stats():
+    """Get live session frame counters"""
+    if live_sessions is None:
+        return jsonify({'error': 'Live recognition is not available'}), 503
+    
+    return jsonify(live_sessions.get_stats())
+
+@app.route('/recognize/landmarks', methods=['POST'])
+def recognize_landmarks():
+    """Recognize and translate per-frame hand landmarks extracted on the client, e.g. by MediaPipe
+    
+    The body is frame after frame of hands x 21 x 3 little-endian values:
+    ?format=float32, or int16 holding coordinates times ?scale= (default
+    16384). ?hands= (default 1) hands per frame, a missing hand is sent as
+    zeros; ?fps= is the frame rate of the landmark frames.
+    """
+    try:
+        from landmarks import decode_landmarks, INT16_SCALE, LANDMARK_DIMS, NUM_LANDMARKS
+        import numpy as np
+        
+        if asl_recognizer is None:
+            return jsonify({'error': 'ASL recognition model not loaded'}), 503
+        if translation_batcher is None:
+            return jsonify({'error': 'Translation model not loaded'}), 503
+        
+        if request.content_length is not None and request.content_length > LANDMARK_MAX_BYTES:
+            return jsonify({'error': 'Landmark payload too large'}), 413
+        
+        landmark_format = request.args.get('format', 'float32')
+        hands = request.args.get('hands', 1, type=int)
+        fps = request.args.get('fps', LANDMARK_FPS, type=float)
+        scale = request.args.get('scale', INT16_SCALE, type=float)
+        
+        if fps <= 0 or scale <= 0:
+            return jsonify({'error': 'fps and scale must be positive'}), 400
+        
+        classifier = asl_recognizer.landmark_classifier
+        if classifier is not None and classifier.input_size != hands * NUM_LANDMARKS * LANDMARK_DIMS:
+            return jsonify({'error': f"The landmark model expects "
+                                     f"{classifier.input_size // (NUM_LANDMARKS * LANDMARK_DIMS)} hand(s) per frame"}), 400
+        
+        started = time.time()
+        with span('landmark_decode'):
+            try:
+                landmarks = decode_landmarks(request.get_data(), landmark_format, hands, scale)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        timestamps = np.arange(len(landmarks), dtype=np.float32) / np.float32(fps)
+        asl_sequence, asl_confidence = asl_recognizer.get_landmark_sequence(landmarks, timestamps)
+        
+        with span('translation_batched'):
+            translation_result = translation_batcher.translate(asl_sequence)
+        
+        if not translation_result['success']:
+            return jsonify({'error': translation_result['error']}), 500
+        
+        return jsonify({
+            'success': True,
+            'frames': len(landmarks),
             'asl_recognition': {
                 'sequence': asl_sequence,
-                'confidence': 0.85  # Placeholder confidence
+                'confidence': asl_confidence
             },
             'translation': {
                 'english_text': translation_result['translation'],
                 'confidence': translation_result['confidence'],
-                'suggestions': suggestions
+                'suggestions': translation_result['suggestions']
             },
-            'processing_time': 0  # Placeholder for actual processing time
-        }
-        
-        # Save result to file for later retrieval
-        result_file = os.path.join(UPLOAD_FOLDER, f"{file_id}_result.json")
-        with open(result_file, 'w') as f:
-            json.dump(result, f, indent=2)
-        
-        return jsonify(result)
+            'processing_time': time.time() - started
+        })
         
     except Exception as e:
-        print(f"Error processing video: {e}")
+        logger.error(f"Error recognizing landmarks: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.errorhandler(413)
+def request_too_large(e):
+    """Return oversized uploads as JSON errors"""
+    return jsonify({'error': 'File too large'}), 413
+
 @app.route('/video/<file_id>', methods=['GET'])
 def get_video(file_id):
-    """Get uploaded video by ID"""
+    """Get uploaded video by ID, with byte ranges and ETag/Last-Modified revalidation
+    
+    ?preview=1 serves the low-bitrate preview instead, falling back to the
+    original (not cached, so the next request picks the preview up) while the
+    preview renders in the background, and when previews are off or the video
+    cannot be rendered.
+    """
     try:
-        # Find video file
-        for filename in os.listdir(UPLOAD_FOLDER):
-            if filename.startswith(file_id) and '.' in filename:
-                file_path = os.path.join(UPLOAD_FOLDER, filename)
-                return send_file(file_path, mimetype='video/mp4')
+        entry = upload_index.get(file_id) if upload_index is not None else None
+        
+        if entry is None or not entry['video_path'] or not os.path.exists(entry['video_path']):
+            return jsonify({'error': 'Video not found'}), 404
+        
+        video_path = os.path.abspath(entry['video_path'])
+        etag = video_etag(entry)
+        max_age = VIDEO_MAX_AGE
+        
+        if request.args.get('preview') == '1' and preview_cache is not None:
+            preview_path = preview_cache.get(file_id, video_path)
+            if preview_path is not None:
+                return send_file(
+                    os.path.abspath(preview_path),
+                    mimetype=PREVIEW_MIMETYPE,
+                    etag=f"{etag}-preview",
+                    last_modified=os.path.getmtime(preview_path),
+                    max_age=VIDEO_MAX_AGE
+                )
+            max_age = 0
         
-        return jsonify({'error': 'Video not found'}), 404
+        # conditional=True answers Range with 206 and matching validators with 304
+        extension = video_path.rsplit('.', 1)[-1].lower()
+        return send_file(
+            video_path,
+            mimetype=VIDEO_MIMETYPES.get(extension, 'application/octet-stream'),
+            conditional=True,
+            etag=etag,
+            last_modified=entry['created_at'],
+            max_age=max_age
+        )
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def video_etag(entry):
+    """Strong validator of an uploaded video: its content hash, or file ID, size and time for older uploads"""
+    if entry['content_hash']:
+        return entry['content_hash']
+    return f"{entry['file_id']}-{os.path.getsize(entry['video_path'])}-{int(entry['created_at'])}"
+
 @app.route('/result/<file_id>', methods=['GET'])
 def get_result(file_id):
     """Get processing result by file ID"""
     try:
-        result_file = os.path.join(UPLOAD_FOLDER, f"{file_id}_result.json")
+        entry = upload_index.get(file_id) if upload_index is not None else None
         
-        if not os.path.exists(result_file):
-            return jsonify({'error': 'Result not found'}), 404
+        if entry is not None and entry['result'] is not None:
+            return jsonify(entry['result'])
         
-        with open(result_file, 'r') as f:
-            result = json.load(f)
+        # Still queued, running or failed
+        job = job_queue.get(file_id) if job_queue is not None else None
+        if job is not None:
+            return jsonify(job)
         
-        return jsonify(result)
+        if entry is None:
+            return jsonify({'error': 'Result not found'}), 404
+        
+        # Job was lost (e.g. server restarted), report what the index knows
+        status = {'file_id': file_id, 'status': entry['status'], 'filename': entry['filename']}
+        if entry['error']:
+            status['error'] = entry['error']
+        return jsonify(status)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -220,24 +1143,22 @@ def translate_text():
         
         asl_text = data['asl_text']
         
-        if translator is None:
-            return jsonify({'error': 'Translation model not loaded'}), 500
+        if translation_batcher is None:
+            return jsonify({'error': 'Translation model not loaded'}), 503
         
-        # Translate ASL text
-        translation_result = translator.translate_asl_to_english(asl_text)
+        # Translate ASL text, the T5 stages are timed per batch on the batcher thread
+        with span('translation_batched'):
+            translation_result = translation_batcher.translate(asl_text)
         
         if not translation_result['success']:
             return jsonify({'error': translation_result['error']}), 500
         
-        # Get suggestions
-        suggestions = translator.get_translation_suggestions(asl_text, 3)
-        
         result = {
             'success': True,
             'asl_text': asl_text,
             'translation': translation_result['translation'],
             'confidence': translation_result['confidence'],
-            'suggestions': suggestions
+            'suggestions': translation_result['suggestions']
         }
         
         return jsonify(result)
@@ -259,11 +1180,16 @@ def batch_translate():
         if not isinstance(asl_texts, list):
             return jsonify({'error': 'ASL texts must be a list'}), 400
         
+        batch_size = data.get('batch_size', TRANSLATE_BATCH_SIZE)
+        
+        if not isinstance(batch_size, int) or batch_size < 1:
+            return jsonify({'error': 'Batch size must be a positive integer'}), 400
+        
         if translator is None:
-            return jsonify({'error': 'Translation model not loaded'}), 500
+            return jsonify({'error': 'Translation model not loaded'}), 503
         
         # Batch translate
-        results = translator.batch_translate(asl_texts)
+        results = translator.batch_translate(asl_texts, batch_size=batch_size)
         
         return jsonify({
             'success': True,
@@ -275,63 +1201,139 @@ def batch_translate():
 
 @app.route('/files', methods=['GET'])
 def list_files():
-    """List all uploaded files and their results"""
+    """List processed files, newest first
+    
+    Pages continue from ?cursor= (the next_cursor of the previous page), or
+    ?offset= for older clients. ?view=summary returns only the ID, filename,
+    translation and timestamp of each file; /result/<id> has the full result.
+    ?since= (the changes value of an earlier response) returns only files
+    processed or deleted after it, in change order. Every response carries
+    an ETag derived from the index version, so polling with If-None-Match
+    gets 304 until something changes.
+    """
     try:
-        files = []
+        limit = request.args.get('limit', FILES_PAGE_SIZE, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        cursor = request.args.get('cursor')
+        since = request.args.get('since', type=int)
+        view = request.args.get('view', 'full')
         
-        for filename in os.listdir(UPLOAD_FOLDER):
-            if filename.endswith('_result.json'):
-                # This is a result file
-                file_id = filename.replace('_result.json', '')
-                result_file = os.path.join(UPLOAD_FOLDER, filename)
-                
-                try:
-                    with open(result_file, 'r') as f:
-                        result = json.load(f)
-                    
-                    # Find corresponding video file
-                    video_file = None
-                    for vf in os.listdir(UPLOAD_FOLDER):
-                        if vf.startswith(file_id) and not vf.endswith('_result.json'):
-                            video_file = vf
-                            break
-                    
-                    files.append({
-                        'file_id': file_id,
-                        'video_file': video_file,
-                        'result': result
-                    })
-                    
-                except Exception as e:
-                    print(f"Error reading result file {filename}: {e}")
-                    continue
+        if limit < 1 or offset < 0:
+            return jsonify({'error': 'Limit must be positive and offset non-negative'}), 400
+        if view not in ('full', 'summary'):
+            return jsonify({'error': "View must be 'full' or 'summary'"}), 400
+        if since is not None and since < 0:
+            return jsonify({'error': 'Since must be non-negative'}), 400
         
-        return jsonify({
-            'success': True,
-            'files': files
-        })
+        before = None
+        if cursor:
+            before = decode_cursor(cursor)
+            if before is None:
+                return jsonify({'error': 'Invalid cursor'}), 400
+        
+        limit = min(limit, FILES_MAX_PAGE_SIZE)
+        summary = view == 'summary'
+        
+        if upload_index is None:
+            return jsonify({'error': 'Upload index not available'}), 500
+        
+        # Read the version before the listing, so no change can slip in between the two unseen
+        version = upload_index.change_seq()
+        query = f"{limit}:{offset}:{cursor}:{since}:{view}"
+        etag = f"files-{version}-{hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]}"
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        if since is not None:
+            entries, deleted, last_seq, has_more = upload_index.changes(since, limit=limit, summary=summary)
+            payload = {
+                'success': True,
+                'files': [file_listing(entry, summary) for entry in entries],
+                'deleted': deleted,
+                'changes': last_seq if has_more else max(version, last_seq),
+                'has_more': has_more,
+                'limit': limit,
+                'since': since
+            }
+        else:
+            entries, total = upload_index.list(limit=limit, offset=offset, before=before, summary=summary)
+            next_cursor = None
+            if len(entries) == limit:
+                next_cursor = encode_cursor(entries[-1]['created_at'], entries[-1]['file_id'])
+            payload = {
+                'success': True,
+                'files': [file_listing(entry, summary) for entry in entries],
+                'total': total,
+                'limit': limit,
+                'offset': offset,
+                'next_cursor': next_cursor,
+                'changes': version
+            }
+        
+        response = jsonify(payload)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def file_listing(entry, summary):
+    """One /files item, either the summary projection or the full result"""
+    if summary:
+        return {
+            'file_id': entry['file_id'],
+            'filename': entry['filename'],
+            'translation': entry['translation'],
+            'timestamp': datetime.fromtimestamp(entry['created_at']).isoformat()
+        }
+    return {
+        'file_id': entry['file_id'],
+        'video_file': os.path.basename(entry['video_path']) if entry['video_path'] else None,
+        'result': entry['result']
+    }
+
+def encode_cursor(created_at, file_id):
+    """Opaque /files cursor pointing after one entry"""
+    return base64.urlsafe_b64encode(json.dumps([created_at, file_id]).encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """(created_at, file_id) of a /files cursor, None if it is malformed"""
+    try:
+        created_at, file_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return float(created_at), str(file_id)
+    except Exception:
+        return None
+
 @app.route('/delete/<file_id>', methods=['DELETE'])
 def delete_file(file_id):
     """Delete uploaded video and its result"""
     try:
+        entry = upload_index.delete(file_id) if upload_index is not None else None
+        
+        if entry is None:
+            return jsonify({'error': 'No files found with this ID'}), 404
+        
         deleted_files = []
         
-        # Find and delete all files with this ID
-        for filename in os.listdir(UPLOAD_FOLDER):
-            if filename.startswith(file_id):
-                file_path = os.path.join(UPLOAD_FOLDER, filename)
+        # The video and, for uploads from before the index, a result file
+        paths = [entry['video_path'], os.path.join(UPLOAD_FOLDER, f"{file_id}_result.json")]
+        for file_path in paths:
+            if file_path and os.path.exists(file_path):
                 try:
                     os.remove(file_path)
-                    deleted_files.append(filename)
+                    deleted_files.append(os.path.basename(file_path))
                 except Exception as e:
-                    print(f"Error deleting {filename}: {e}")
+                    logger.error(f"Error deleting {file_path}: {e}")
         
-        if not deleted_files:
-            return jsonify({'error': 'No files found with this ID'}), 404
+        # Cached frames are shared by uploads of the same content, keep them while another one remains
+        if (asl_recognizer is not None and asl_recognizer.frame_cache is not None and entry['content_hash']
+                and not upload_index.has_content_hash(entry['content_hash'])):
+            asl_recognizer.frame_cache.delete(entry['content_hash'])
+        if preview_cache is not None:
+            preview_cache.delete(file_id)
         
         return jsonify({
             'success': True,
@@ -347,14 +1349,18 @@ def delete_file(file_id):
 #   - etc.
 
 if __name__ == '__main__':
-    print("Starting ASL Translator Backend...")
+    logger.info("Starting ASL Translator Backend...")
     
-    # Initialize models
-    if initialize_models():
-        print("All models loaded successfully!")
-        print("Starting Flask server...")
+    if PREFORK_WORKERS > 0:
+        # Load the models once, then fork workers that share them
+        if not run_prefork('0.0.0.0', 5000):
+            exit(1)
+    elif initialize_storage():
+        # Serve while the models load in the background
+        initialize_models()
+        logger.info("Starting Flask server...")
         app.run(host='0.0.0.0', port=5000, debug=True)
     else:
-        print("Failed to initialize models. Exiting...")
+        logger.error("Failed to open the upload index. Exiting...")
         exit(1)
 
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Measure per-process memory of a running ASL Translator backend
+Reports RSS, PSS and unique (private) RSS for the server process and every
+process below it, e.g. pre-forked workers and their video job processes
+"""
+
+import argparse
+import json
+import os
+import time
+import urllib.request
+
+# Sample requests that make workers touch the translation model's weights
+WARMUP_TEXTS = ["HELLO", "THANKYOU", "GOODMORNING", "NICETOMEETYOU", "HELP"]
+
+def child_pids(pid):
+    """Direct children of a process"""
+    children = []
+    task_dir = f'/proc/{pid}/task'
+    for task in os.listdir(task_dir):
+        try:
+            with open(os.path.join(task_dir, task, 'children')) as f:
+                children.extend(int(child) for child in f.read().split())
+        except OSError:
+            continue
+    return children
+
+def process_tree(pid):
+    """A process and all of its descendants, parents before children"""
+    pids = [pid]
+    for child in child_pids(pid):
+        pids.extend(process_tree(child))
+    return pids
+
+def memory_usage(pid):
+    """RSS, PSS, shared and unique memory of one process in bytes, from smaps_rollup"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+
+    with open(f'/proc/{pid}/cmdline', 'rb') as f:
+        command = f.read().replace(b'\0', b' ').decode(errors='replace').strip()
+
+    return {
+        'pid': pid,
+        'command': command[:80],
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+        'unique': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+    }
+
+def warm_up(url, requests_per_text):
+    """Send translation requests so every worker has run the model"""
+    for _ in range(requests_per_text):
+        for text in WARMUP_TEXTS:
+            request = urllib.request.Request(
+                f"{url}/translate",
+                data=json.dumps({'asl_text': text}).encode(),
+                headers={'Content-Type': 'application/json'}
+            )
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pid', type=int, required=True, help='PID of the server (pre-fork master)')
+    parser.add_argument('--url', help='Backend URL to send warm-up translations to first')
+    parser.add_argument('--requests', type=int, default=4, help='Warm-up passes over the sample texts')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args()
+
+    if args.url:
+        warm_up(args.url.rstrip('/'), args.requests)
+        time.sleep(1.0)
+
+    processes = [memory_usage(pid) for pid in process_tree(args.pid)]
+    report = {
+        'processes': processes,
+        'total_rss': sum(p['rss'] for p in processes),
+        'total_pss': sum(p['pss'] for p in processes),
+        'total_unique': sum(p['unique'] for p in processes)
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    mb = 1024 * 1024
+    print(f"{'PID':>8} {'RSS MB':>9} {'PSS MB':>9} {'Unique MB':>10}  Command")
+    for p in processes:
+        print(f"{p['pid']:>8} {p['rss'] / mb:>9.1f} {p['pss'] / mb:>9.1f} {p['unique'] / mb:>10.1f}  {p['command']}")
+    print(f"{'Total':>8} {report['total_rss'] / mb:>9.1f} {report['total_pss'] / mb:>9.1f} "
+          f"{report['total_unique'] / mb:>10.1f}")
+
+if __name__ == "__main__":
+    main()
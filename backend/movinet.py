@@ -1,14 +1,189 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
 import tensorflow as tf
 from official.projects.movinet.modeling import movinet
+from official.projects.movinet.modeling import movinet_model as movinet_model_base
 from official.projects.movinet.modeling import movinet_model_a2_modified as movinet_model_modified
 
-def movinet_model():
-    backbone = movinet.Movinet(model_id='a2')
+CHECKPOINT_DIR = 'movinet_checkpoints_a2_epoch9'
+MODEL_ID = 'a2'
+NUM_CLASSES = 600
+FRAME_SIZE = 224
+CLIP_LENGTH = 8
+
+# Optional class names next to the checkpoint, one per line; otherwise the first 26 classes are A-Z
+LABELS_FILE = 'labels.txt'
+ALPHABET = [chr(ord('A') + i) for i in range(26)]
+
+_classifiers = {}
+_classifiers_lock = threading.Lock()
+
+def movinet_model(checkpoint_path: str = CHECKPOINT_DIR):
+    """Build the MoViNet-A2 classifier and restore its latest checkpoint"""
+    backbone = movinet.Movinet(model_id=MODEL_ID)
     backbone.trainable = False
 
-    model = movinet_model_modified.MovinetClassifier(backbone=backbone, num_classes=600)
+    model = movinet_model_modified.MovinetClassifier(backbone=backbone, num_classes=NUM_CLASSES)
     model.build([None, None, None, None, 3])
 
-    checkpoint_path = 'movinet_checkpoints_a2_epoch9'
     checkpoint = tf.train.Checkpoint(model=model)
-    checkpoint.restore(tf.train.latest_checkpoint(checkpoint_path)).expect_partial()
\ No newline at end of file
+    checkpoint.restore(tf.train.latest_checkpoint(checkpoint_path)).expect_partial()
+    return model
+
+def load_labels(checkpoint_path: str) -> List[Optional[str]]:
+    """Class index to letter mapping of a checkpoint"""
+    path = os.path.join(checkpoint_path, LABELS_FILE)
+    if os.path.exists(path):
+        with open(path) as f:
+            labels = [line.strip() or None for line in f]
+    else:
+        labels = list(ALPHABET)
+    return labels + [None] * (NUM_CLASSES - len(labels))
+
+def preprocess_frames(frames: np.ndarray, frame_size: int = FRAME_SIZE) -> np.ndarray:
+    """Center-crop and resize (..., H, W, 3) BGR uint8 frames to float32 RGB in [0, 1]"""
+    h, w = frames.shape[-3:-1]
+    side = min(h, w)
+    y, x = (h - side) // 2, (w - side) // 2
+    flat = frames.reshape((-1, h, w, 3))[:, y:y + side, x:x + side]
+
+    out = np.empty((len(flat), frame_size, frame_size, 3), dtype=np.uint8)
+    for i in range(len(flat)):
+        cv2.resize(flat[i], (frame_size, frame_size), dst=out[i], interpolation=cv2.INTER_AREA)
+
+    rgb = out[..., ::-1].astype(np.float32) / 255.0
+    return rgb.reshape(frames.shape[:-3] + (frame_size, frame_size, 3))
+
+def get_clip_classifier(checkpoint_path: str = CHECKPOINT_DIR, **kwargs) -> 'MovinetClipClassifier':
+    """Process-wide clip classifier, the checkpoint is restored once per process"""
+    key = (checkpoint_path, tuple(sorted(kwargs.items())))
+    with _classifiers_lock:
+        classifier = _classifiers.get(key)
+        if classifier is None:
+            classifier = MovinetClipClassifier(checkpoint_path, **kwargs)
+            _classifiers[key] = classifier
+        return classifier
+
+
+class MovinetClipClassifier:
+    def __init__(self, checkpoint_path: str = CHECKPOINT_DIR, clip_length: int = CLIP_LENGTH,
+                 frame_size: int = FRAME_SIZE, batch_size: int = 4,
+                 stream_checkpoint_path: Optional[str] = None):
+        """Classify fixed-length clips with MoViNet-A2, several clips per forward pass
+
+        stream_checkpoint_path points to a causal (streaming) A2 checkpoint; the
+        base model has non-causal convolutions, so it cannot run frame by frame.
+        """
+        self.checkpoint_path = checkpoint_path
+        self.clip_length = clip_length
+        self.frame_size = frame_size
+        self.batch_size = max(1, batch_size)
+        self.stream_checkpoint_path = stream_checkpoint_path
+
+        self.labels = load_labels(checkpoint_path)
+        self.model = movinet_model(checkpoint_path)
+
+        # One traced graph for every batch size and clip length
+        self._predict = tf.function(
+            lambda clips: tf.nn.softmax(self.model(clips, training=False), axis=-1),
+            input_signature=[tf.TensorSpec([None, None, frame_size, frame_size, 3], tf.float32)]
+        )
+
+        self._stream_model = None
+        self._stream_lock = threading.Lock()
+
+    def predict_clips(self, clips: np.ndarray) -> Tuple[List[Optional[str]], np.ndarray]:
+        """Predict one letter and confidence per clip of an (N, T, H, W, 3) BGR uint8 stack"""
+        letters = []
+        confidences = np.empty(len(clips), dtype=np.float32)
+
+        for start in range(0, len(clips), self.batch_size):
+            batch = preprocess_frames(clips[start:start + self.batch_size], self.frame_size)
+            probabilities = self._predict(tf.constant(batch)).numpy()
+            indices = probabilities.argmax(axis=-1)
+
+            letters.extend(self.labels[i] for i in indices)
+            confidences[start:start + len(batch)] = probabilities[np.arange(len(batch)), indices]
+
+        return letters, confidences
+
+    def frames_to_clips(self, frames: np.ndarray) -> np.ndarray:
+        """Split (N, H, W, 3) frames into clip_length clips, padding the last one with its final frame"""
+        remainder = len(frames) % self.clip_length
+        if remainder:
+            padding = np.repeat(frames[-1:], self.clip_length - remainder, axis=0)
+            frames = np.concatenate([frames, padding])
+        return frames.reshape((-1, self.clip_length) + frames.shape[1:])
+
+    def create_stream(self) -> 'MovinetStream':
+        """Start a stateful frame-by-frame stream, e.g. for one live session"""
+        if self.stream_checkpoint_path is None:
+            raise RuntimeError('Streaming needs a causal MoViNet checkpoint (stream_checkpoint_path)')
+
+        with self._stream_lock:
+            if self._stream_model is None:
+                self._stream_model = self._build_stream_model()
+        return MovinetStream(self._stream_model, self.labels, self.frame_size)
+
+    def get_stats(self) -> Dict:
+        """Configuration of this clip classifier"""
+        return {
+            'checkpoint': self.checkpoint_path,
+            'clip_length': self.clip_length,
+            'frame_size': self.frame_size,
+            'batch_size': self.batch_size,
+            'streaming': self.stream_checkpoint_path is not None
+        }
+
+    def _build_stream_model(self):
+        """Build the causal A2 classifier with external states and restore the stream checkpoint"""
+        backbone = movinet.Movinet(
+            model_id=MODEL_ID,
+            causal=True,
+            conv_type='2plus1d',
+            se_type='2plus3d',
+            activation='hard_swish',
+            gating_activation='hard_sigmoid',
+            use_positional_encoding=False,
+            use_external_states=True
+        )
+        model = movinet_model_base.MovinetClassifier(
+            backbone=backbone,
+            num_classes=NUM_CLASSES,
+            output_states=True
+        )
+        model.build([1, 1, self.frame_size, self.frame_size, 3])
+
+        checkpoint = tf.train.Checkpoint(model=model)
+        checkpoint.restore(tf.train.latest_checkpoint(self.stream_checkpoint_path)).expect_partial()
+        return model
+
+
+class MovinetStream:
+    def __init__(self, model, labels: List[Optional[str]], frame_size: int = FRAME_SIZE):
+        """Per-stream MoViNet states, so each frame costs one single-frame forward pass"""
+        self.model = model
+        self.labels = labels
+        self.frame_size = frame_size
+        self.states = model.init_states(tf.constant([1, 1, frame_size, frame_size, 3]))
+
+    def push(self, frame: np.ndarray) -> Tuple[Optional[str], float]:
+        """Feed one BGR frame, returning the letter and confidence over everything seen so far"""
+        image = preprocess_frames(frame[np.newaxis, np.newaxis], self.frame_size)
+        logits, self.states = self.model({**self.states, 'image': tf.constant(image)}, training=False)
+
+        probabilities = tf.nn.softmax(logits, axis=-1).numpy()[0]
+        index = int(probabilities.argmax())
+        return self.labels[index], float(probabilities[index])
+
+    def reset(self):
+        """Drop the accumulated states, e.g. after a pause between words"""
+        self.states = self.model.init_states(tf.constant([1, 1, self.frame_size, self.frame_size, 3]))
+
+    def close(self):
+        """Release the states when the stream ends"""
+        self.states = None
@@ -0,0 +1,100 @@
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Callable, Optional
+
+from werkzeug.serving import make_server
+
+from telemetry import get_logger
+
+logger = get_logger('prefork')
+
+
+def serve_prefork(app, host: str, port: int, num_workers: int,
+                  post_fork: Callable[[int], None],
+                  on_exit: Optional[Callable[[int], None]] = None, backlog: int = 128):
+    """Serve a WSGI app from pre-forked worker processes sharing one listening socket
+
+    Call this after loading the models: every worker is forked from this
+    process and shares its memory copy-on-write. post_fork(index) runs in
+    each worker before it starts serving, to start the worker's own threads,
+    and on_exit(index) when it stops, since workers leave with os._exit and
+    skip atexit handlers.
+    Workers that die are replaced until the master receives SIGTERM or SIGINT.
+    """
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind((host, port))
+    listener.listen(backlog)
+    listener.set_inheritable(True)
+
+    # Move every object allocated so far into the permanent generation: the
+    # collector then never writes to their headers, so the pages holding the
+    # model's Python objects stay shared instead of being copied per worker
+    gc.collect()
+    gc.freeze()
+
+    workers = {}
+    stopping = False
+
+    def start_worker(index: int):
+        pid = os.fork()
+        if pid == 0:
+            # Leave serve_forever() through SystemExit so on_exit still runs
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            status = 0
+            try:
+                post_fork(index)
+                server = make_server(host, port, app, threaded=True, fd=listener.fileno())
+                logger.info(f"Worker {index} (pid {os.getpid()}) serving on {host}:{port}")
+                server.serve_forever()
+            except (SystemExit, KeyboardInterrupt):
+                pass
+            except Exception as e:
+                logger.error(f"Worker {index} failed: {e}")
+                status = 1
+            finally:
+                if on_exit is not None:
+                    try:
+                        on_exit(index)
+                    except Exception as e:
+                        logger.error(f"Worker {index} cleanup failed: {e}")
+                sys.stdout.flush()
+            os._exit(status)
+
+        workers[pid] = index
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for index in range(num_workers):
+        start_worker(index)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+
+        index = workers.pop(pid, None)
+        if index is None or stopping:
+            continue
+
+        logger.warning(f"Worker {index} (pid {pid}) exited with status {status}, restarting it")
+        time.sleep(1.0)
+        start_worker(index)
+
+    listener.close()
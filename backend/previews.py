@@ -0,0 +1,164 @@
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from telemetry import get_logger, span
+
+logger = get_logger('previews')
+
+PREVIEW_MIMETYPE = 'video/webm'
+
+
+class PreviewCache:
+    def __init__(self, cache_dir: str, height: int = 360, max_fps: float = 15.0, workers: int = 1):
+        """Low-bitrate WebM renditions of uploaded videos, rendered in the background on first request
+
+        Previews are scaled down to height pixels and at most max_fps frames per
+        second and written with VP8 through OpenCV, without audio, which is not
+        needed to follow signing. Renders run on workers background threads, not
+        in the request; the original stays available meanwhile and for full quality.
+        """
+        self.cache_dir = cache_dir
+        self.height = height
+        self.max_fps = max_fps
+
+        # Threads start on the first render, so a pre-fork master does not hold any
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='preview-render')
+        # Renders queued or running, one per file ID, and videos that could not be rendered
+        self._pending = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.renders = 0
+        self.failures = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, file_id: str) -> str:
+        """Path of the preview of a video, whether or not it exists yet"""
+        if os.path.basename(file_id) != file_id:
+            raise ValueError(f"Invalid preview file ID: {file_id}")
+        return os.path.join(self.cache_dir, f"{file_id}_preview.webm")
+
+    def get(self, file_id: str, video_path: str) -> Optional[str]:
+        """Path of the preview of a video, or None until it is rendered (or if it cannot be)
+
+        A missing preview is queued for rendering in the background, so the
+        caller serves the original instead of waiting for the encode.
+        """
+        path = self.path(file_id)
+        if os.path.exists(path):
+            self.hits += 1
+            return path
+
+        with self._lock:
+            if file_id not in self._pending and file_id not in self._failed:
+                self._pending[file_id] = self._pool.submit(self._render_preview, file_id, video_path)
+        return None
+
+    def delete(self, file_id: str) -> bool:
+        """Remove the preview of a video, cancelling its render if one is pending"""
+        with self._lock:
+            future = self._pending.pop(file_id, None)
+            self._failed.discard(file_id)
+        if future is not None:
+            future.cancel()
+
+        try:
+            os.remove(self.path(file_id))
+            return True
+        except OSError:
+            return False
+
+    def get_stats(self) -> Dict:
+        """Preview counters of this process"""
+        return {
+            'height': self.height,
+            'max_fps': self.max_fps,
+            'hits': self.hits,
+            'renders': self.renders,
+            'failures': self.failures,
+            'pending': len(self._pending)
+        }
+
+    def _render_preview(self, file_id: str, video_path: str):
+        """Render one queued preview, discarding it if the video was deleted meanwhile"""
+        path = self.path(file_id)
+        with span('preview_render'):
+            rendered = self._render(video_path, path)
+
+        with self._lock:
+            # delete() drops the pending entry, so a missing one means the video is gone
+            deleted = self._pending.pop(file_id, None) is None
+            if not rendered and not deleted:
+                # Not retried on every request; deleting the video clears it
+                self._failed.add(file_id)
+
+        if deleted:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        elif rendered:
+            self.renders += 1
+        else:
+            self.failures += 1
+
+    def _render(self, video_path: str, path: str) -> bool:
+        """Decode a video and write its scaled-down, frame-dropped preview"""
+        # Imported here like the model modules, so the server starts without OpenCV loaded
+        import cv2
+
+        cap = cv2.VideoCapture(video_path)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.webm')
+        os.close(fd)
+        writer = None
+
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+            out_fps = min(fps, self.max_fps)
+            written = 0
+            frame_count = 0
+
+            while True:
+                if not cap.grab():
+                    break
+                # Keep a frame whenever the output clock has moved on to the next frame
+                if frame_count * out_fps / fps >= written:
+                    ret, frame = cap.retrieve()
+                    if not ret:
+                        break
+
+                    h, w = frame.shape[:2]
+                    if writer is None:
+                        # VP8 needs even dimensions
+                        scale = min(1.0, self.height / h)
+                        size = (max(2, int(w * scale) // 2 * 2), max(2, int(h * scale) // 2 * 2))
+                        writer = cv2.VideoWriter(tmp_path, cv2.VideoWriter_fourcc(*'VP80'), out_fps, size)
+                        if not writer.isOpened():
+                            raise RuntimeError('VP8 encoder not available')
+
+                    writer.write(cv2.resize(frame, size, interpolation=cv2.INTER_AREA))
+                    written += 1
+                frame_count += 1
+
+            if writer is None:
+                raise RuntimeError('No frames decoded')
+            writer.release()
+            writer = None
+
+            # Rename so readers never see a partial file
+            os.replace(tmp_path, path)
+            return True
+        except Exception as e:
+            logger.error(f"Error rendering preview of {video_path}: {e}")
+            return False
+        finally:
+            cap.release()
+            if writer is not None:
+                writer.release()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,84 @@
+from typing import Dict
+
+import cv2
+import numpy as np
+
+
+class MotionSampler:
+    def __init__(self, base_rate: int = 5, fast_rate: int = 2, motion_threshold: float = 0.5,
+                 fast_threshold: float = 5.0, hold_seconds: float = 0.6, probe_size: int = 32,
+                 pixel_threshold: int = 6):
+        """Pick the frames of a video worth classifying from a cheap frame-difference motion score
+
+        The score is the percentage of pixels of a probe_size x probe_size
+        grayscale thumbnail that changed by more than pixel_threshold gray levels
+        since the previous frame, which ignores sensor and compression noise.
+        Frames are sampled every base_rate frames while the score is above
+        motion_threshold and every fast_rate frames above fast_threshold. After
+        motion stops, sampling continues for hold_seconds so held letter shapes
+        are still seen, then static and empty stretches are skipped.
+        """
+        self.base_rate = max(1, base_rate)
+        self.fast_rate = max(1, min(fast_rate, self.base_rate))
+        self.motion_threshold = motion_threshold
+        self.fast_threshold = max(fast_threshold, motion_threshold)
+        self.hold_seconds = hold_seconds
+        self.probe_size = probe_size
+        self.pixel_threshold = pixel_threshold
+
+        self._previous = None
+        self._active_until = None
+        self._last_sampled = None
+
+        self.frames_seen = 0
+        self.frames_sampled = 0
+        self.frames_fast = 0
+
+    def select(self, frame_number: int, timestamp: float, frame: np.ndarray) -> bool:
+        """Decide whether one decoded frame should be classified"""
+        self.frames_seen += 1
+        score = self.motion_score(frame)
+
+        if score >= self.fast_threshold:
+            rate = self.fast_rate
+            self.frames_fast += 1
+            self._active_until = timestamp + self.hold_seconds
+        elif score >= self.motion_threshold:
+            rate = self.base_rate
+            self._active_until = timestamp + self.hold_seconds
+        elif self._active_until is not None and timestamp <= self._active_until:
+            rate = self.base_rate
+        else:
+            return False
+
+        if self._last_sampled is not None and frame_number - self._last_sampled < rate:
+            return False
+
+        self._last_sampled = frame_number
+        self.frames_sampled += 1
+        return True
+
+    def settings_key(self) -> str:
+        """Filename-safe summary of the settings that decide which frames are sampled"""
+        return (f"{self.base_rate}-{self.fast_rate}-{self.motion_threshold:g}-{self.fast_threshold:g}-"
+                f"{self.hold_seconds:g}-{self.probe_size}-{self.pixel_threshold}")
+
+    def motion_score(self, frame: np.ndarray) -> float:
+        """Percentage of thumbnail pixels changed since the previous frame, 0 for the first frame"""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        thumbnail = cv2.resize(gray, (self.probe_size, self.probe_size), interpolation=cv2.INTER_AREA)
+
+        previous, self._previous = self._previous, thumbnail
+        if previous is None:
+            return 0.0
+        changed = cv2.absdiff(thumbnail, previous) > self.pixel_threshold
+        return 100.0 * float(changed.mean())
+
+    def get_stats(self) -> Dict:
+        """Frame counters of the video seen so far"""
+        return {
+            'frames_seen': self.frames_seen,
+            'frames_sampled': self.frames_sampled,
+            'frames_fast': self.frames_fast,
+            'sampled_fraction': self.frames_sampled / self.frames_seen if self.frames_seen else 0.0
+        }
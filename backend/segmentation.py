@@ -0,0 +1,103 @@
+from typing import Optional
+
+
+class LetterSegmenter:
+    def __init__(self, enter_threshold: float = 0.6, exit_threshold: float = 0.4, min_weight: float = 1.2,
+                 repeat_gap: float = 0.2, word_gap: float = 0.6, end_gap: float = 2.0):
+        """Collapse per-frame letter predictions into a letter sequence, one frame at a time
+
+        A run of frames predicting the same letter is emitted once its summed
+        confidence reaches min_weight and at least one frame reached
+        enter_threshold; frames below exit_threshold end the run (hysteresis).
+        The same letter is only emitted again after a gap of repeat_gap seconds,
+        a gap of word_gap seconds emits a word boundary and a gap of end_gap
+        seconds after the last letter marks the end of the signing. Only the
+        current run is kept, so memory does not grow with the number of frames.
+        last_confidence is the mean confidence of the run of the last emitted letter.
+        """
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = min(exit_threshold, enter_threshold)
+        self.min_weight = min_weight
+        self.repeat_gap = repeat_gap
+        self.word_gap = word_gap
+        self.end_gap = end_gap
+
+        self.reset()
+
+    def reset(self):
+        """Forget all state, e.g. to start a new sequence"""
+        self._run_letter = None
+        self._run_weight = 0.0
+        self._run_peak = 0.0
+        self._run_frames = 0
+        self._run_emitted = False
+
+        self._last_emitted = None
+        self.last_confidence = 0.0
+        self._last_active = None
+        self._separated = True
+        self._word_open = False
+
+        self.finished = False
+
+    def push(self, letter: Optional[str], confidence: float, timestamp: float) -> str:
+        """Add one frame's prediction, returning the emitted letter, a ' ' word boundary, both or ''
+
+        letter is None for frames without a detected hand; timestamp is in seconds.
+        A boundary and a letter come together (' A') when frames were skipped
+        before this one, e.g. idle frames dropped by motion gating.
+        """
+        if letter is None or confidence < self.exit_threshold:
+            # The current run ends, the next frames start a new one
+            self._run_letter = None
+            return self.advance(timestamp)
+
+        # A gap no sampling interval reaches means frames were skipped: treat it as a pause
+        boundary = ''
+        if self._last_active is not None and timestamp - self._last_active >= self.word_gap:
+            self._run_letter = None
+            boundary = self.advance(timestamp)
+
+        self._last_active = timestamp
+
+        if letter == self._run_letter:
+            self._run_weight += confidence
+            self._run_peak = max(self._run_peak, confidence)
+            self._run_frames += 1
+        else:
+            self._run_letter = letter
+            self._run_weight = confidence
+            self._run_peak = confidence
+            self._run_frames = 1
+            self._run_emitted = False
+
+        if self._run_emitted or self._run_peak < self.enter_threshold or self._run_weight < self.min_weight:
+            return boundary
+
+        self._run_emitted = True
+
+        # A flicker to another letter and back does not repeat the letter, only a pause does
+        if letter == self._last_emitted and not self._separated:
+            return boundary
+
+        self._last_emitted = letter
+        self.last_confidence = self._run_weight / self._run_frames
+        self._separated = False
+        self._word_open = True
+        return boundary + letter
+
+    def advance(self, timestamp: float) -> str:
+        """Account for time without a confident letter, returning ' ' at a word boundary or ''"""
+        if self._last_active is None:
+            return ''
+
+        gap = timestamp - self._last_active
+        if gap >= self.repeat_gap:
+            self._separated = True
+        if gap >= self.end_gap and self._last_emitted is not None:
+            self.finished = True
+
+        if gap >= self.word_gap and self._word_open:
+            self._word_open = False
+            return ' '
+        return ''
@@ -0,0 +1,334 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from telemetry import get_logger
+
+logger = get_logger('storage')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS uploads (
+    file_id TEXT PRIMARY KEY,
+    filename TEXT,
+    video_path TEXT,
+    status TEXT NOT NULL,
+    error TEXT,
+    result TEXT,
+    content_hash TEXT,
+    model_version TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    seq INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS uploads_created_at ON uploads (created_at);
+CREATE INDEX IF NOT EXISTS uploads_listing ON uploads (status, created_at, file_id);
+CREATE TABLE IF NOT EXISTS deletions (
+    file_id TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    deleted_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deletions_seq ON deletions (seq);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY,
+    applied_at REAL NOT NULL
+);
+"""
+
+# Listing columns without the result JSON, the translation is extracted by SQLite
+SUMMARY_COLUMNS = (
+    "file_id, filename, created_at, seq, "
+    "json_extract(result, '$.translation.english_text') AS translation"
+)
+
+
+class UploadIndex:
+    def __init__(self, db_path: str):
+        """SQLite index mapping file IDs to their video, status and result"""
+        self.db_path = db_path
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._add_content_hash_columns()
+        self._add_change_seq_column()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.row_factory = sqlite3.Row
+            # WAL lets readers proceed while a result is being written
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Close this thread's connection, e.g. before forking worker processes"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _add_content_hash_columns(self):
+        """Add the content hash columns to indexes created before deduplication"""
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM migrations WHERE name = 'content_hash'").fetchone():
+            return
+
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(uploads)')}
+        with conn:
+            for column in ('content_hash', 'model_version'):
+                if column not in columns:
+                    conn.execute(f'ALTER TABLE uploads ADD COLUMN {column} TEXT')
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS uploads_content_hash ON uploads (content_hash, model_version)'
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO migrations (name, applied_at) VALUES ('content_hash', ?)",
+                (time.time(),)
+            )
+
+    def _add_change_seq_column(self):
+        """Number existing uploads for change tracking in indexes created before it"""
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM migrations WHERE name = 'change_seq'").fetchone():
+            return
+
+        columns = {row['name'] for row in conn.execute('PRAGMA table_info(uploads)')}
+        with conn:
+            if 'seq' not in columns:
+                conn.execute('ALTER TABLE uploads ADD COLUMN seq INTEGER NOT NULL DEFAULT 0')
+            conn.execute('UPDATE uploads SET seq = rowid')
+            conn.execute('CREATE INDEX IF NOT EXISTS uploads_seq ON uploads (seq)')
+            conn.execute(
+                "INSERT OR REPLACE INTO counters (name, value) "
+                "VALUES ('changes', (SELECT COALESCE(MAX(seq), 0) FROM uploads))"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO migrations (name, applied_at) VALUES ('change_seq', ?)",
+                (time.time(),)
+            )
+
+    def _next_seq(self, conn: sqlite3.Connection) -> int:
+        """Take the next change sequence number inside the caller's write transaction"""
+        # The UPDATE takes the write lock first, so concurrent writers never share a number
+        conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'changes'")
+        return conn.execute("SELECT value FROM counters WHERE name = 'changes'").fetchone()[0]
+
+    def change_seq(self) -> int:
+        """Sequence number of the latest write, a version of the whole index"""
+        row = self._connect().execute("SELECT value FROM counters WHERE name = 'changes'").fetchone()
+        return row[0] if row else 0
+
+    def add_upload(self, file_id: str, filename: str, video_path: str, status: str = 'queued',
+                   content_hash: Optional[str] = None):
+        """Register a newly uploaded video"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO uploads '
+                '(file_id, filename, video_path, status, content_hash, created_at, updated_at, seq) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (file_id, filename, video_path, status, content_hash, now, now, self._next_seq(conn))
+            )
+            conn.execute('DELETE FROM deletions WHERE file_id = ?', (file_id,))
+
+    def add_result(self, file_id: str, filename: str, video_path: str, result: Dict,
+                   content_hash: str, model_version: str):
+        """Register an upload whose result is already known, e.g. reused from identical content"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO uploads '
+                '(file_id, filename, video_path, status, result, content_hash, model_version, created_at, updated_at, seq) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (file_id, filename, video_path, 'done', json.dumps(result), content_hash, model_version, now, now,
+                 self._next_seq(conn))
+            )
+            conn.execute('DELETE FROM deletions WHERE file_id = ?', (file_id,))
+
+    def set_result(self, file_id: str, result: Dict, model_version: Optional[str] = None):
+        """Store the processing result of a video and the model version that produced it"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE uploads SET status = ?, error = NULL, result = ?, model_version = ?, updated_at = ?, seq = ? '
+                'WHERE file_id = ?',
+                ('done', json.dumps(result), model_version, time.time(), self._next_seq(conn), file_id)
+            )
+
+    def set_content_hash(self, file_id: str, content_hash: str):
+        """Record the content hash of an upload once all of its bytes have arrived"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE uploads SET content_hash = ?, updated_at = ?, seq = ? WHERE file_id = ?',
+                (content_hash, time.time(), self._next_seq(conn), file_id)
+            )
+
+    def find_result(self, content_hash: str, model_version: str) -> Optional[Dict]:
+        """Find the newest processed upload with the same content and model version"""
+        row = self._connect().execute(
+            "SELECT * FROM uploads WHERE content_hash = ? AND model_version = ? AND status = 'done' "
+            "ORDER BY updated_at DESC LIMIT 1",
+            (content_hash, model_version)
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def has_content_hash(self, content_hash: str) -> bool:
+        """Check whether any upload with this content is still indexed"""
+        row = self._connect().execute(
+            'SELECT 1 FROM uploads WHERE content_hash = ? LIMIT 1', (content_hash,)
+        ).fetchone()
+        return row is not None
+
+    def set_failed(self, file_id: str, error: str):
+        """Record that processing a video failed"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE uploads SET status = ?, error = ?, updated_at = ?, seq = ? WHERE file_id = ?',
+                ('failed', error, time.time(), self._next_seq(conn), file_id)
+            )
+
+    def get(self, file_id: str) -> Optional[Dict]:
+        """Look up one upload by ID"""
+        row = self._connect().execute('SELECT * FROM uploads WHERE file_id = ?', (file_id,)).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def list(self, limit: int = 50, offset: int = 0, before: Optional[Tuple[float, str]] = None,
+             summary: bool = False) -> Tuple[List[Dict], Optional[int]]:
+        """List uploads that have a result, newest first, with the total count
+
+        before is the (created_at, file_id) of the last entry of the previous page;
+        seeking past it stays fast however deep the page, unlike offset. The total
+        is only counted for offset pages (None after a cursor), so following the
+        cursor does not count the whole index again on every page. summary
+        leaves out the result JSON and returns only its translation.
+        """
+        conn = self._connect()
+        columns = SUMMARY_COLUMNS if summary else '*'
+        if before is not None:
+            rows = conn.execute(
+                f"SELECT {columns} FROM uploads WHERE status = 'done' AND (created_at, file_id) < (?, ?) "
+                "ORDER BY created_at DESC, file_id DESC LIMIT ?",
+                (before[0], before[1], limit)
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                f"SELECT {columns} FROM uploads WHERE status = 'done' "
+                "ORDER BY created_at DESC, file_id DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        total = None
+        if before is None:
+            total = conn.execute("SELECT COUNT(*) FROM uploads WHERE status = 'done'").fetchone()[0]
+        return [self._row_to_dict(row) for row in rows], total
+
+    def changes(self, since: int, limit: int = 50,
+                summary: bool = False) -> Tuple[List[Dict], List[str], int, bool]:
+        """Uploads that got a result and IDs deleted after change sequence number since
+
+        Returns up to limit changes in sequence order, the sequence number to
+        ask from next and whether more changes follow. An upload changed twice
+        is returned once, at its latest state.
+        """
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT file_id, seq, 0 AS deleted FROM uploads WHERE seq > ? AND status = 'done' "
+            "UNION ALL SELECT file_id, seq, 1 AS deleted FROM deletions WHERE seq > ? "
+            "ORDER BY seq LIMIT ?",
+            (since, since, limit + 1)
+        ).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        deleted = [row['file_id'] for row in rows if row['deleted']]
+        updated = [row['file_id'] for row in rows if not row['deleted']]
+        entries = []
+        if updated:
+            columns = SUMMARY_COLUMNS if summary else '*'
+            placeholders = ', '.join('?' * len(updated))
+            entries = [
+                self._row_to_dict(row) for row in conn.execute(
+                    f"SELECT {columns} FROM uploads WHERE file_id IN ({placeholders}) ORDER BY seq",
+                    updated
+                )
+            ]
+
+        last_seq = rows[-1]['seq'] if rows else since
+        return entries, deleted, last_seq, has_more
+
+    def delete(self, file_id: str) -> Optional[Dict]:
+        """Remove an upload from the index, returning the deleted entry"""
+        entry = self.get(file_id)
+        if entry is None:
+            return None
+
+        with self._connect() as conn:
+            conn.execute('DELETE FROM uploads WHERE file_id = ?', (file_id,))
+            # Only listed uploads need a tombstone for clients polling for changes
+            if entry['status'] == 'done':
+                conn.execute(
+                    'INSERT OR REPLACE INTO deletions (file_id, seq, deleted_at) VALUES (?, ?, ?)',
+                    (file_id, self._next_seq(conn), time.time())
+                )
+        return entry
+
+    def import_legacy_results(self, upload_folder: str) -> int:
+        """One-time import of uploads and *_result.json files written before the index existed"""
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM migrations WHERE name = 'legacy_results'").fetchone():
+            return 0
+
+        # A single directory scan, grouped by file ID
+        videos = {}
+        results = {}
+        for filename in os.listdir(upload_folder):
+            path = os.path.join(upload_folder, filename)
+            if filename.endswith('_result.json'):
+                results[filename[:-len('_result.json')]] = path
+            elif '.' in filename and os.path.isfile(path):
+                file_id, extension = filename.rsplit('.', 1)
+                if extension.lower() not in ('sqlite3', 'sqlite3-wal', 'sqlite3-shm'):
+                    videos[file_id] = path
+
+        imported = 0
+        with conn:
+            for file_id, result_path in results.items():
+                try:
+                    with open(result_path, 'r') as f:
+                        result = json.load(f)
+                except Exception as e:
+                    logger.error(f"Error reading result file {result_path}: {e}")
+                    continue
+
+                created = os.path.getmtime(result_path)
+                conn.execute(
+                    'INSERT OR IGNORE INTO uploads '
+                    '(file_id, filename, video_path, status, result, created_at, updated_at, seq) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (file_id, result.get('filename'), videos.get(file_id), 'done',
+                     json.dumps(result), created, created, self._next_seq(conn))
+                )
+                imported += 1
+
+            conn.execute(
+                "INSERT INTO migrations (name, applied_at) VALUES ('legacy_results', ?)",
+                (time.time(),)
+            )
+
+        return imported
+
+    def _row_to_dict(self, row: sqlite3.Row) -> Dict:
+        """Convert a database row into an upload entry"""
+        entry = dict(row)
+        if 'result' in entry:
+            entry['result'] = json.loads(entry['result']) if entry['result'] else None
+        return entry
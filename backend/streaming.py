@@ -0,0 +1,192 @@
+import errno
+import hashlib
+import os
+import struct
+import threading
+import time
+from typing import Optional
+
+from telemetry import get_logger
+
+logger = get_logger('streaming')
+
+# Containers that can be decoded front to back without seeking
+STREAMABLE_EXTENSIONS = {'webm', 'mkv'}
+MP4_EXTENSIONS = {'mp4', 'mov'}
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload grows past the configured size limit"""
+    pass
+
+
+def is_streamable_container(extension: str, header: bytes) -> Optional[bool]:
+    """Check whether a video can be decoded while it is still arriving
+
+    Returns None while there are not yet enough header bytes to decide.
+    """
+    extension = extension.lower()
+
+    if extension in STREAMABLE_EXTENSIONS:
+        return True
+
+    if extension not in MP4_EXTENSIONS:
+        return False
+
+    # Walk the top-level MP4 boxes: fragmented or "faststart" files put moov before mdat
+    offset = 0
+    while offset + 8 <= len(header):
+        size, box_type = struct.unpack('>I4s', header[offset:offset + 8])
+
+        if box_type == b'moov':
+            return True
+        if box_type in (b'mdat', b'moof'):
+            return False
+
+        if size == 1:
+            # 64-bit box size follows the type
+            if offset + 16 > len(header):
+                return None
+            size = struct.unpack('>Q', header[offset + 8:offset + 16])[0]
+        elif size == 0:
+            # Box runs to the end of the file
+            return False
+
+        if size < 8:
+            return False
+        offset += size
+
+    return None
+
+
+class StreamingUpload:
+    def __init__(self, file_path: str, max_size: int, header_limit: int = 1024 * 1024):
+        """Write an upload to disk chunk by chunk, optionally mirroring it into a FIFO"""
+        self.file_path = file_path
+        self.max_size = max_size
+        self.header_limit = header_limit
+
+        self.size = 0
+        self.header = b''
+        # Hashed as the bytes are written, so deduplication needs no second pass over the file
+        self._hasher = hashlib.sha256()
+        self.started = time.perf_counter()
+        self.duration = 0.0
+
+        self._file = open(file_path, 'wb')
+        self._condition = threading.Condition()
+        self._closed = False
+        self._aborted = False
+        self._feeder = None
+
+    def write(self, chunk: bytes):
+        """Append a chunk, enforcing the size limit as the upload grows"""
+        if self.size + len(chunk) > self.max_size:
+            raise UploadTooLargeError('File too large')
+
+        self._file.write(chunk)
+        self._file.flush()
+        self._hasher.update(chunk)
+
+        if len(self.header) < self.header_limit:
+            self.header += chunk[:self.header_limit - len(self.header)]
+
+        with self._condition:
+            self.size += len(chunk)
+            self._condition.notify_all()
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the bytes written so far"""
+        return self._hasher.hexdigest()
+
+    def streamable(self, extension: str) -> Optional[bool]:
+        """Check whether decoding can start before the upload completes"""
+        if not hasattr(os, 'mkfifo'):
+            return False
+
+        streamable = is_streamable_container(extension, self.header)
+        if streamable is None and len(self.header) >= self.header_limit:
+            return False
+        return streamable
+
+    def close(self):
+        """Finish the upload"""
+        self._file.close()
+        self.duration = time.perf_counter() - self.started
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def abort(self):
+        """Stop feeding readers and delete the partial upload"""
+        if not self._file.closed:
+            self._file.close()
+
+        with self._condition:
+            self._aborted = True
+            self._condition.notify_all()
+
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+    def start_feeder(self, fifo_path: str, open_timeout: float = 600.0):
+        """Create a FIFO that replays the upload to a decoder as bytes land on disk"""
+        os.mkfifo(fifo_path)
+        self._feeder = threading.Thread(
+            target=self._feed,
+            args=(fifo_path, open_timeout),
+            name='upload-feeder',
+            daemon=True
+        )
+        self._feeder.start()
+
+    def _feed(self, fifo_path: str, open_timeout: float):
+        """Copy the growing upload file into the FIFO until the upload completes"""
+        fd = None
+
+        try:
+            # Open without blocking so an abandoned FIFO never pins this thread
+            deadline = time.time() + open_timeout
+            while fd is None:
+                if self._aborted or time.time() > deadline:
+                    return
+                try:
+                    fd = os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK)
+                except OSError as e:
+                    if e.errno != errno.ENXIO:
+                        raise
+                    time.sleep(0.05)
+
+            os.set_blocking(fd, True)
+            position = 0
+
+            with open(self.file_path, 'rb') as source:
+                while True:
+                    with self._condition:
+                        while self.size <= position and not self._closed and not self._aborted:
+                            self._condition.wait()
+                        if self._aborted:
+                            return
+                        available = self.size - position
+
+                    if available == 0:
+                        # Upload closed and everything has been replayed
+                        return
+
+                    data = memoryview(source.read(min(available, 1024 * 1024)))
+                    position += len(data)
+                    while data:
+                        data = data[os.write(fd, data):]
+
+        except BrokenPipeError:
+            # The decoder stopped reading, nothing left to do
+            pass
+        except Exception as e:
+            logger.error(f"Error streaming upload to decoder: {e}")
+        finally:
+            if fd is not None:
+                os.close(fd)
+            if os.path.exists(fifo_path):
+                os.remove(fifo_path)
@@ -1,187 +1,121 @@
 from transformers import T5Tokenizer, T5ForConditionalGeneration
 import torch
-from typing import List, Dict
-import re
+import numpy as np
+from typing import List, Optional, Tuple
 
-class T5ASLTranslator:
-    def __init__(self, model_name: str = "t5-base"):
-        """Initialize T5 translator for ASL to English translation"""
+from telemetry import get_logger, span
+from translator_base import BaseASLTranslator, COMPILE_MODES, MAX_OUTPUT_LENGTH, MIN_BEAMS, NO_REPEAT_NGRAM_SIZE
+
+logger = get_logger('translation')
+
+class T5ASLTranslator(BaseASLTranslator):
+    def __init__(self, model_name: str = "t5-base", cache_size: int = 1024,
+                 cache_ttl: float = 3600.0, cache_path: Optional[str] = None,
+                 quantize: bool = False, compile_mode: Optional[str] = None,
+                 num_threads: Optional[int] = None, num_interop_threads: Optional[int] = None):
+        """Initialize T5 translator for ASL to English translation
+        
+        On CPU, quantize=True converts the Linear layers to dynamic int8 and
+        compile_mode='torch_compile' compiles the decoder that runs at every
+        generation step. num_threads and num_interop_threads set torch's
+        intra-op and inter-op thread pools.
+        """
+        if compile_mode is not None and compile_mode not in COMPILE_MODES:
+            raise ValueError(f"Unknown compile mode: {compile_mode}")
+        
+        super().__init__(model_name, cache_size=cache_size, cache_ttl=cache_ttl, cache_path=cache_path)
+        self.quantized = False
+        self.compile_mode = None
+        
+        self._configure_threads(num_threads, num_interop_threads)
+        
         try:
             self.tokenizer = T5Tokenizer.from_pretrained(model_name)
             self.model = T5ForConditionalGeneration.from_pretrained(model_name)
             self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
             self.model.to(self.device)
-            print(f"T5 model loaded on {self.device}")
+            self.model.eval()
         except Exception as e:
-            print(f"Error loading T5 model: {e}")
+            logger.error(f"Error loading T5 model: {e}")
             self.tokenizer = None
             self.model = None
-    
-    def preprocess_asl_sequence(self, asl_sequence: str) -> str:
-        """Preprocess ASL sequence for better translation"""
-        if not asl_sequence:
-            return ""
-        
-        # Clean up the sequence
-        sequence = asl_sequence.upper().strip()
-        
-        # Remove non-alphabetic characters
-        sequence = re.sub(r'[^A-Z]', '', sequence)
+            return
         
-        # Add spaces between letters for better readability
-        sequence = ' '.join(sequence)
+        # Requested optimizations fail loudly instead of leaving an unloaded model behind
+        if self.device.type == 'cpu':
+            self._optimize_for_cpu(quantize, compile_mode)
         
-        return sequence
+        logger.info(f"T5 model loaded on {self.device} ({self.model_version})")
     
-    def create_translation_prompt(self, asl_sequence: str) -> str:
-        """Create a prompt for T5 translation"""
-        if not asl_sequence:
-            return "translate ASL to English: "
-        
-        # Create a structured prompt
-        prompt = f"translate ASL to English: {asl_sequence}"
-        return prompt
+    @property
+    def model_version(self) -> str:
+        """Identify the model and numeric format producing translations"""
+        return f"{self.model_name}+int8" if self.quantized else self.model_name
     
-    def translate_asl_to_english(self, asl_sequence: str) -> Dict:
-        """Translate ASL sequence to English"""
-        if not self.model or not self.tokenizer:
-            return {
-                'success': False,
-                'error': 'Model not loaded',
-                'translation': '',
-                'confidence': 0.0
-            }
+    def _configure_threads(self, num_threads: Optional[int], num_interop_threads: Optional[int]):
+        """Set torch's intra-op and inter-op thread counts"""
+        if num_threads:
+            torch.set_num_threads(num_threads)
         
-        try:
-            # Preprocess ASL sequence
-            processed_sequence = self.preprocess_asl_sequence(asl_sequence)
-            
-            if not processed_sequence:
-                return {
-                    'success': False,
-                    'error': 'Empty ASL sequence',
-                    'translation': '',
-                    'confidence': 0.0
-                }
-            
-            # Create translation prompt
-            prompt = self.create_translation_prompt(processed_sequence)
-            
-            # Tokenize input
-            inputs = self.tokenizer.encode(
-                prompt, 
-                return_tensors="pt", 
-                max_length=512, 
-                truncation=True
-            ).to(self.device)
-            
-            # Generate translation
-            with torch.no_grad():
-                outputs = self.model.generate(
-                    inputs,
-                    max_length=128,
-                    num_beams=4,
-                    early_stopping=True,
-                    no_repeat_ngram_size=2,
-                    temperature=0.7
-                )
-            
-            # Decode output
-            translation = self.tokenizer.decode(outputs[0], skip_special_tokens=True)
-            
-            # Post-process translation
-            translation = self.postprocess_translation(translation)
-            
-            # Calculate confidence (simplified)
-            confidence = min(0.95, 0.7 + len(processed_sequence) * 0.01)
-            
-            return {
-                'success': True,
-                'translation': translation,
-                'confidence': confidence,
-                'original_asl': asl_sequence,
-                'processed_asl': processed_sequence
-            }
-            
-        except Exception as e:
-            return {
-                'success': False,
-                'error': str(e),
-                'translation': '',
-                'confidence': 0.0
-            }
+        if num_interop_threads:
+            try:
+                torch.set_num_interop_threads(num_interop_threads)
+            except RuntimeError as e:
+                # Can only be set once, before any inter-op parallel work has started
+                logger.warning(f"Could not set inter-op threads: {e}")
     
-    def postprocess_translation(self, translation: str) -> str:
-        """Post-process the generated translation"""
-        if not translation:
-            return ""
-        
-        # Clean up the translation
-        translation = translation.strip()
-        
-        # Capitalize first letter
-        if translation:
-            translation = translation[0].upper() + translation[1:]
+    def _optimize_for_cpu(self, quantize: bool, compile_mode: Optional[str]):
+        """Apply dynamic int8 quantization and decoder compilation for CPU inference"""
+        if quantize:
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            self.quantized = True
         
-        # Ensure proper punctuation
-        if translation and not translation.endswith(('.', '!', '?')):
-            translation += '.'
+        if compile_mode is None:
+            return
         
-        return translation
-    
-    def batch_translate(self, asl_sequences: List[str]) -> List[Dict]:
-        """Translate multiple ASL sequences"""
-        results = []
-        for sequence in asl_sequences:
-            result = self.translate_asl_to_english(sequence)
-            results.append(result)
-        return results
+        # The decoder runs once per generated token, so it is where compilation pays off
+        self.model.decoder = torch.compile(self.model.decoder, dynamic=True)
+        self.compile_mode = compile_mode
     
-    def get_translation_suggestions(self, asl_sequence: str, num_suggestions: int = 3) -> List[str]:
-        """Get multiple translation suggestions for an ASL sequence"""
-        if not self.model or not self.tokenizer:
-            return []
+    def _generate(self, input_ids: np.ndarray, attention_mask: np.ndarray,
+                  num_return_sequences: int = 1) -> List[List[Tuple[str, float]]]:
+        """Run beam search on a padded batch and return the top beams with their confidences"""
+        input_ids = torch.from_numpy(input_ids).to(self.device)
+        attention_mask = torch.from_numpy(attention_mask).to(self.device)
         
-        try:
-            processed_sequence = self.preprocess_asl_sequence(asl_sequence)
-            prompt = self.create_translation_prompt(processed_sequence)
-            
-            inputs = self.tokenizer.encode(
-                prompt, 
-                return_tensors="pt", 
-                max_length=512, 
-                truncation=True
-            ).to(self.device)
-            
-            # Generate multiple outputs
+        with torch.no_grad(), span('t5_generate'):
             outputs = self.model.generate(
-                inputs,
-                max_length=128,
-                num_return_sequences=num_suggestions,
-                num_beams=4,
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                max_length=MAX_OUTPUT_LENGTH,
+                num_beams=max(MIN_BEAMS, num_return_sequences),
+                num_return_sequences=num_return_sequences,
                 early_stopping=True,
-                no_repeat_ngram_size=2,
-                temperature=0.8,
-                do_sample=True
+                no_repeat_ngram_size=NO_REPEAT_NGRAM_SIZE,
+                output_scores=True,
+                return_dict_in_generate=True
             )
             
-            suggestions = []
-            for output in outputs:
-                translation = self.tokenizer.decode(output, skip_special_tokens=True)
-                translation = self.postprocess_translation(translation)
-                suggestions.append(translation)
-            
-            return suggestions
-            
-        except Exception as e:
-            print(f"Error generating suggestions: {e}")
-            return []
+            # Beam scores are length-normalized log-probabilities, their exponent is the
+            # geometric mean of the token probabilities
+            confidences = torch.exp(outputs.sequences_scores.float()).tolist()
+        
+        with span('t5_decode'):
+            translations = self.tokenizer.batch_decode(outputs.sequences, skip_special_tokens=True)
+            beams = [
+                (self.postprocess_translation(translation), confidence)
+                for translation, confidence in zip(translations, confidences)
+            ]
+        
+        return [
+            beams[i:i + num_return_sequences]
+            for i in range(0, len(beams), num_return_sequences)
+        ]
     
     def cleanup(self):
         """Clean up resources"""
-        if self.model:
-            del self.model
-        if self.tokenizer:
-            del self.tokenizer
+        super().cleanup()
         if torch.cuda.is_available():
             torch.cuda.empty_cache()
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+ONNX Runtime backend for the T5 ASL translator
+Exports T5 to encoder / decoder / decoder-with-past graphs and runs beam search
+on onnxruntime's CPU provider, so serving does not need PyTorch
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import onnxruntime as ort
+from transformers import T5Tokenizer
+
+from telemetry import get_logger, record, span
+from translator_base import BaseASLTranslator, MAX_OUTPUT_LENGTH, MIN_BEAMS, NO_REPEAT_NGRAM_SIZE
+
+logger = get_logger('translation')
+
+CONFIG_FILE = 'onnx_config.json'
+ENCODER_FILE = 'encoder.onnx'
+DECODER_FILE = 'decoder.onnx'
+DECODER_WITH_PAST_FILE = 'decoder_with_past.onnx'
+
+# Prompts used to compare the ONNX and PyTorch outputs
+PARITY_PROMPTS = [
+    "HELLO", "WORLD", "THANKYOU", "PLEASE", "GOOD", "MORNING", "NIGHT", "YES",
+    "NO", "HELP", "HOWAREYOU", "NICETOMEETYOU"
+]
+
+class ONNXT5ASLTranslator(BaseASLTranslator):
+    def __init__(self, model_dir: str, cache_size: int = 1024, cache_ttl: float = 3600.0,
+                 cache_path: Optional[str] = None, num_threads: Optional[int] = None,
+                 num_interop_threads: Optional[int] = None):
+        """Initialize T5 translator from graphs written by export_onnx()"""
+        with open(os.path.join(model_dir, CONFIG_FILE), 'r') as f:
+            self.config = json.load(f)
+
+        super().__init__(self.config['model_name'], cache_size=cache_size,
+                         cache_ttl=cache_ttl, cache_path=cache_path)
+
+        try:
+            options = ort.SessionOptions()
+            if num_threads:
+                options.intra_op_num_threads = num_threads
+            if num_interop_threads:
+                options.inter_op_num_threads = num_interop_threads
+
+            def load(filename):
+                return ort.InferenceSession(
+                    os.path.join(model_dir, filename),
+                    sess_options=options,
+                    providers=['CPUExecutionProvider']
+                )
+
+            self.tokenizer = T5Tokenizer.from_pretrained(model_dir)
+            self.model = {
+                'encoder': load(ENCODER_FILE),
+                'decoder': load(DECODER_FILE),
+                'decoder_with_past': load(DECODER_WITH_PAST_FILE)
+            }
+            logger.info(f"T5 model loaded on onnxruntime CPU ({self.model_version})")
+        except Exception as e:
+            logger.error(f"Error loading ONNX T5 model: {e}")
+            self.tokenizer = None
+            self.model = None
+
+    @property
+    def model_version(self) -> str:
+        """Identify the model and runtime producing translations"""
+        return f"{self.model_name}+onnx"
+
+    def _generate(self, input_ids: np.ndarray, attention_mask: np.ndarray,
+                  num_return_sequences: int = 1) -> List[List[Tuple[str, float]]]:
+        """Run beam search on a padded batch and return the top beams with their confidences
+
+        Mirrors generate() in the PyTorch backend: same beam count, length limit,
+        n-gram blocking and early stopping, with hypotheses ranked by
+        length-normalized log-probability.
+        """
+        started = time.perf_counter()
+        num_beams = max(MIN_BEAMS, num_return_sequences)
+        batch_size = input_ids.shape[0]
+        eos_token_id = self.config['eos_token_id']
+        pad_token_id = self.config['pad_token_id']
+
+        encoder_hidden = self.model['encoder'].run(None, {
+            'input_ids': input_ids,
+            'attention_mask': attention_mask
+        })[0]
+        encoder_hidden = np.repeat(encoder_hidden, num_beams, axis=0)
+        encoder_mask = np.repeat(attention_mask, num_beams, axis=0)
+
+        sequences = np.full((batch_size * num_beams, 1), self.config['decoder_start_token_id'], dtype=np.int64)
+        # Only the first beam of each item is live at the start, so the others cannot duplicate it
+        beam_scores = np.zeros((batch_size, num_beams), dtype=np.float32)
+        beam_scores[:, 1:] = -1e9
+        beam_scores = beam_scores.reshape(-1)
+        # Unnormalized log-probability of each beam, for the reported confidence
+        beam_log_probs = np.zeros(batch_size * num_beams, dtype=np.float32)
+
+        hypotheses = [[] for _ in range(batch_size)]
+        done = [False] * batch_size
+        self_past, cross_past = None, None
+
+        while True:
+            logits, self_past, cross_past = self._decode_step(
+                sequences[:, -1:], encoder_hidden, encoder_mask, self_past, cross_past
+            )
+            log_probs = self._log_softmax(logits[:, -1, :])
+            self._block_repeated_ngrams(sequences, log_probs)
+
+            vocab_size = log_probs.shape[-1]
+            scores = (log_probs + beam_scores[:, None]).reshape(batch_size, num_beams * vocab_size)
+            top = self._top_k(scores, 2 * num_beams)
+
+            # Length of the hypotheses once this step's token is appended, minus the start token
+            generated_length = sequences.shape[1]
+            next_scores = np.zeros(batch_size * num_beams, dtype=np.float32)
+            next_tokens = np.full(batch_size * num_beams, pad_token_id, dtype=np.int64)
+            next_indices = np.zeros(batch_size * num_beams, dtype=np.int64)
+            next_log_probs = np.zeros(batch_size * num_beams, dtype=np.float32)
+
+            for b in range(batch_size):
+                offset = b * num_beams
+                if done[b]:
+                    next_indices[offset:offset + num_beams] = offset
+                    continue
+
+                beam = 0
+                for rank, flat_index in enumerate(top[b]):
+                    source = offset + flat_index // vocab_size
+                    token = flat_index % vocab_size
+                    score = scores[b, flat_index]
+                    log_prob = beam_log_probs[source] + log_probs[source, token]
+
+                    if token == eos_token_id:
+                        # Only end-of-sentence tokens ranked within the beam width finish a hypothesis
+                        if rank < num_beams:
+                            self._add_hypothesis(
+                                hypotheses[b], num_beams, score / generated_length,
+                                np.append(sequences[source], eos_token_id), log_prob
+                            )
+                    else:
+                        next_scores[offset + beam] = score
+                        next_tokens[offset + beam] = token
+                        next_indices[offset + beam] = source
+                        next_log_probs[offset + beam] = log_prob
+                        beam += 1
+
+                    if beam == num_beams:
+                        break
+
+                # Early stopping: finished once num_beams hypotheses are complete
+                done[b] = len(hypotheses[b]) >= num_beams
+
+            sequences = np.concatenate([sequences[next_indices], next_tokens[:, None]], axis=1)
+            self_past = [past[next_indices] for past in self_past]
+            beam_scores = next_scores
+            beam_log_probs = next_log_probs
+
+            if all(done) or sequences.shape[1] >= MAX_OUTPUT_LENGTH:
+                break
+
+        # Beams still open at the length limit compete with the finished ones
+        for b in range(batch_size):
+            if done[b]:
+                continue
+            for source in range(b * num_beams, (b + 1) * num_beams):
+                self._add_hypothesis(
+                    hypotheses[b], num_beams, beam_scores[source] / (sequences.shape[1] - 1),
+                    sequences[source], beam_log_probs[source]
+                )
+
+        record('t5_generate', time.perf_counter() - started)
+
+        results = []
+        with span('t5_decode'):
+            for candidates in hypotheses:
+                # Among equal scores the later hypothesis wins, as in generate()
+                best = sorted(candidates, key=lambda hypothesis: hypothesis[0])[::-1][:num_return_sequences]
+                beams = []
+                for _, tokens, log_prob in best:
+                    # Geometric mean of the token probabilities, excluding the decoder start token
+                    confidence = float(np.exp(log_prob / max(1, len(tokens) - 1)))
+                    translation = self.tokenizer.decode(tokens, skip_special_tokens=True)
+                    beams.append((self.postprocess_translation(translation), confidence))
+                results.append(beams)
+
+        return results
+
+    def _decode_step(self, decoder_input_ids: np.ndarray, encoder_hidden: np.ndarray,
+                     encoder_mask: np.ndarray, self_past: Optional[List[np.ndarray]],
+                     cross_past: Optional[List[np.ndarray]]):
+        """Run one decoder step, computing the cross-attention cache on the first step"""
+        feed = {
+            'decoder_input_ids': decoder_input_ids,
+            'encoder_hidden_states': encoder_hidden,
+            'encoder_attention_mask': encoder_mask
+        }
+        num_layers = self.config['num_layers']
+
+        if self_past is None:
+            session = self.model['decoder']
+        else:
+            session = self.model['decoder_with_past']
+            for i in range(num_layers):
+                feed[f'past.{i}.decoder.key'] = self_past[2 * i]
+                feed[f'past.{i}.decoder.value'] = self_past[2 * i + 1]
+                feed[f'past.{i}.encoder.key'] = cross_past[2 * i]
+                feed[f'past.{i}.encoder.value'] = cross_past[2 * i + 1]
+
+        # The exporter drops inputs a graph does not use
+        input_names = {graph_input.name for graph_input in session.get_inputs()}
+        outputs = session.run(None, {name: value for name, value in feed.items() if name in input_names})
+        logits = outputs[0]
+
+        if self_past is None:
+            # Per layer: self-attention key/value, then cross-attention key/value
+            layers = [outputs[1 + 4 * i:5 + 4 * i] for i in range(num_layers)]
+            self_past = [past for layer in layers for past in layer[:2]]
+            cross_past = [past for layer in layers for past in layer[2:]]
+        else:
+            self_past = outputs[1:]
+
+        return logits, self_past, cross_past
+
+    def _log_softmax(self, logits: np.ndarray) -> np.ndarray:
+        """Numerically stable log-softmax over the vocabulary"""
+        logits = logits.astype(np.float32)
+        shifted = logits - logits.max(axis=-1, keepdims=True)
+        return shifted - np.log(np.exp(shifted).sum(axis=-1, keepdims=True))
+
+    def _block_repeated_ngrams(self, sequences: np.ndarray, log_probs: np.ndarray):
+        """Forbid tokens that would repeat an n-gram already present in each beam"""
+        n = NO_REPEAT_NGRAM_SIZE
+        length = sequences.shape[1]
+        if length < n:
+            return
+
+        # Every earlier (n-1)-token window that equals the beam's last n-1 tokens bans the token after it
+        windows = np.lib.stride_tricks.sliding_window_view(sequences[:, :-1], n - 1, axis=1)
+        matches = (windows == sequences[:, None, length - n + 1:]).all(axis=-1)
+        rows, starts = np.nonzero(matches)
+        log_probs[rows, sequences[rows, starts + n - 1]] = -np.inf
+
+    def _top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k highest scores per row, best first"""
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind='stable')
+        return np.take_along_axis(top, order, axis=1)
+
+    def _add_hypothesis(self, hypotheses: List, num_beams: int, score: float,
+                        tokens: np.ndarray, log_prob: float):
+        """Keep the num_beams best finished hypotheses"""
+        if len(hypotheses) < num_beams or score > min(h[0] for h in hypotheses):
+            hypotheses.append((score, tokens, log_prob))
+            if len(hypotheses) > num_beams:
+                worst = min(range(len(hypotheses)), key=lambda i: hypotheses[i][0])
+                del hypotheses[worst]
+
+def export_onnx(model_name: str, output_dir: str, opset: int = 14) -> Dict:
+    """Export a T5 checkpoint to ONNX encoder, decoder and decoder-with-past graphs"""
+    # Export is an offline step, so PyTorch is only needed here
+    import inspect
+    import torch
+    from transformers import T5ForConditionalGeneration
+    from transformers.modeling_outputs import BaseModelOutput
+
+    model = T5ForConditionalGeneration.from_pretrained(model_name).eval()
+    tokenizer = T5Tokenizer.from_pretrained(model_name)
+    num_layers = model.config.num_decoder_layers
+
+    class Encoder(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            return self.model.get_encoder()(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+
+    class Decoder(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, decoder_input_ids, encoder_hidden_states, encoder_attention_mask, *past):
+            past_key_values = None
+            if past:
+                past_key_values = tuple(tuple(past[4 * i:4 * i + 4]) for i in range(num_layers))
+
+            outputs = self.model(
+                encoder_outputs=BaseModelOutput(last_hidden_state=encoder_hidden_states),
+                attention_mask=encoder_attention_mask,
+                decoder_input_ids=decoder_input_ids,
+                past_key_values=past_key_values,
+                use_cache=True,
+                return_dict=True
+            )
+
+            # With a cache only the self-attention entries change
+            present = [tensor for layer in outputs.past_key_values for tensor in (layer[:2] if past else layer)]
+            return (outputs.logits, *present)
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    export_kwargs = {'opset_version': opset, 'do_constant_folding': True}
+    if 'dynamo' in inspect.signature(torch.onnx.export).parameters:
+        # The decoder's cache handling needs the TorchScript-based exporter
+        export_kwargs['dynamo'] = False
+
+    input_ids = torch.ones((2, 8), dtype=torch.long)
+    attention_mask = torch.ones((2, 8), dtype=torch.long)
+    decoder_input_ids = torch.zeros((2, 1), dtype=torch.long)
+    batch = {0: 'batch'}
+    encoder_axes = {0: 'batch', 1: 'encoder_sequence'}
+
+    with torch.no_grad():
+        torch.onnx.export(
+            Encoder(), (input_ids, attention_mask), os.path.join(output_dir, ENCODER_FILE),
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['last_hidden_state'],
+            dynamic_axes={'input_ids': encoder_axes, 'attention_mask': encoder_axes,
+                          'last_hidden_state': encoder_axes},
+            **export_kwargs
+        )
+
+        encoder_hidden = Encoder()(input_ids, attention_mask)
+        decoder_inputs = (decoder_input_ids, encoder_hidden, attention_mask)
+        decoder_input_names = ['decoder_input_ids', 'encoder_hidden_states', 'encoder_attention_mask']
+        decoder_axes = {'decoder_input_ids': batch, 'encoder_hidden_states': encoder_axes,
+                        'encoder_attention_mask': encoder_axes, 'logits': batch}
+
+        present_names = []
+        for i in range(num_layers):
+            for kind in ('decoder', 'encoder'):
+                for tensor in ('key', 'value'):
+                    present_names.append(f'present.{i}.{kind}.{tensor}')
+
+        torch.onnx.export(
+            Decoder(), decoder_inputs, os.path.join(output_dir, DECODER_FILE),
+            input_names=decoder_input_names,
+            output_names=['logits'] + present_names,
+            dynamic_axes={**decoder_axes, **{
+                name: {0: 'batch', 2: 'encoder_sequence'} if '.encoder.' in name else batch
+                for name in present_names
+            }},
+            **export_kwargs
+        )
+
+        past = Decoder()(*decoder_inputs)[1:]
+        past_names = [name.replace('present', 'past', 1) for name in present_names]
+        self_present_names = [name for name in present_names if '.decoder.' in name]
+
+        torch.onnx.export(
+            Decoder(), decoder_inputs + tuple(past), os.path.join(output_dir, DECODER_WITH_PAST_FILE),
+            input_names=decoder_input_names + past_names,
+            output_names=['logits'] + self_present_names,
+            dynamic_axes={**decoder_axes, **{
+                name: {0: 'batch', 2: 'encoder_sequence' if '.encoder.' in name else 'past_sequence'}
+                for name in past_names
+            }, **{
+                name: {0: 'batch', 2: 'past_sequence + 1'} for name in self_present_names
+            }},
+            **export_kwargs
+        )
+
+    tokenizer.save_pretrained(output_dir)
+
+    config = {
+        'model_name': model_name,
+        'num_layers': num_layers,
+        'decoder_start_token_id': model.config.decoder_start_token_id,
+        'eos_token_id': model.config.eos_token_id,
+        'pad_token_id': model.config.pad_token_id,
+        'opset': opset
+    }
+    with open(os.path.join(output_dir, CONFIG_FILE), 'w') as f:
+        json.dump(config, f, indent=2)
+
+    return config
+
+def check_parity(model_name: str, model_dir: str, prompts: List[str] = PARITY_PROMPTS,
+                 num_suggestions: int = 0) -> Dict:
+    """Compare ONNX translations with the PyTorch backend on the same prompts"""
+    from t5 import T5ASLTranslator
+
+    reference = T5ASLTranslator(model_name=model_name, cache_size=0)
+    candidate = ONNXT5ASLTranslator(model_dir, cache_size=0)
+
+    expected = reference.batch_translate(prompts, num_suggestions=num_suggestions)
+    actual = candidate.batch_translate(prompts, num_suggestions=num_suggestions)
+
+    mismatches = []
+    confidence_diffs = []
+    for prompt, torch_result, onnx_result in zip(prompts, expected, actual):
+        if torch_result['translation'] != onnx_result['translation']:
+            mismatches.append({
+                'asl': prompt,
+                'torch': torch_result['translation'],
+                'onnx': onnx_result['translation']
+            })
+        else:
+            confidence_diffs.append(abs(torch_result['confidence'] - onnx_result['confidence']))
+
+    return {
+        'prompts': len(prompts),
+        'matches': len(prompts) - len(mismatches),
+        'max_confidence_diff': max(confidence_diffs) if confidence_diffs else None,
+        'mismatches': mismatches
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='Export a T5 checkpoint to ONNX')
+    export_parser.add_argument('--model', default='t5-base', help='Model name or path')
+    export_parser.add_argument('--output', required=True, help='Directory for the ONNX graphs')
+    export_parser.add_argument('--opset', type=int, default=14, help='ONNX opset version')
+    export_parser.add_argument('--check', action='store_true', help='Check parity after exporting')
+
+    check_parser = subparsers.add_parser('check', help='Compare ONNX and PyTorch translations')
+    check_parser.add_argument('--model', default='t5-base', help='Model name or path')
+    check_parser.add_argument('--onnx-dir', required=True, help='Directory with the exported graphs')
+
+    args = parser.parse_args()
+
+    if args.command == 'export':
+        print(f"📦 Exporting {args.model} to {args.output}...")
+        print(json.dumps(export_onnx(args.model, args.output, args.opset), indent=2))
+        model_dir = args.output
+        if not args.check:
+            return
+    else:
+        model_dir = args.onnx_dir
+
+    report = check_parity(args.model, model_dir)
+    print(json.dumps(report, indent=2))
+    if report['mismatches']:
+        print(f"❌ {len(report['mismatches'])} of {report['prompts']} translations differ")
+        raise SystemExit(1)
+    print(f"✅ All {report['prompts']} translations match")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import bisect
+import json
+import logging
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds, from a millisecond tokenize call to a minutes-long video
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+STAGE_METRIC = 'asl_stage_duration_seconds'
+HTTP_METRIC = 'asl_http_request_duration_seconds'
+
+# Trace of the request handled by the current thread
+_local = threading.local()
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Latency histogram with fixed bucket upper bounds, as Prometheus exposes them"""
+        self.buckets = tuple(sorted(buckets))
+        # One count per bucket plus the +Inf overflow, not cumulative
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        """Add one observation"""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, count) pairs of the cumulative buckets, ending with +Inf"""
+        pairs = []
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            pairs.append(('+Inf' if bound == float('inf') else repr(bound), total))
+        return pairs
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile by linear interpolation inside its bucket, like histogram_quantile()"""
+        if self.count == 0:
+            return None
+
+        rank = q * self.count
+        total = 0
+        for index, count in enumerate(self.counts):
+            if total + count >= rank and count > 0:
+                if index == len(self.buckets):
+                    # Beyond the largest bound, the best estimate is that bound
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - total) / count
+            total += count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Labelled latency histograms of this process, rendered in the Prometheus text format"""
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._help = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, help_text: str):
+        """Set the HELP line of a metric"""
+        self._help[name] = help_text
+
+    def observe(self, name: str, value: float, **labels):
+        """Add one observation to the histogram of a metric and label set"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def get_stats(self, name: str) -> Dict:
+        """Count, mean and p50/p95/p99 estimates per label set of one metric"""
+        stats = {}
+        with self._lock:
+            for (metric, labels), histogram in sorted(self._histograms.items()):
+                if metric != name:
+                    continue
+                stats[','.join(value for _, value in labels)] = {
+                    'count': histogram.count,
+                    'mean': histogram.sum / histogram.count,
+                    'p50': histogram.quantile(0.50),
+                    'p95': histogram.quantile(0.95),
+                    'p99': histogram.quantile(0.99)
+                }
+        return stats
+
+    def render(self) -> str:
+        """All histograms in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            described = set()
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                if name not in described:
+                    described.add(name)
+                    if name in self._help:
+                        lines.append(f"# HELP {name} {self._help[name]}")
+                    lines.append(f"# TYPE {name} histogram")
+
+                for le, count in histogram.cumulative():
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum!r}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+
+class Trace:
+    def __init__(self, request_id: Optional[str] = None):
+        """Stage durations of one request, summed when a stage runs several times (e.g. per batch)"""
+        self.request_id = request_id or uuid.uuid4().hex
+        self.started = time.perf_counter()
+        self.stages = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        """Add time spent in a stage, safe to call from helper threads"""
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def merge(self, stages: Dict[str, float]):
+        """Add the stage durations recorded elsewhere, e.g. by a worker process"""
+        for stage, seconds in stages.items():
+            self.add(stage, seconds)
+
+    def elapsed(self) -> float:
+        """Seconds since the trace started"""
+        return time.perf_counter() - self.started
+
+    def finish(self, registry: Optional[MetricsRegistry] = None) -> Dict[str, float]:
+        """Observe every stage total once in the stage histograms and return the totals"""
+        registry = registry or metrics
+        with self._lock:
+            stages = dict(self.stages)
+        for stage, seconds in stages.items():
+            registry.observe(STAGE_METRIC, seconds, stage=stage)
+        return stages
+
+
+def start_trace(request_id: Optional[str] = None) -> Trace:
+    """Start the trace of the request handled by this thread"""
+    trace = Trace(request_id)
+    _local.trace = trace
+    return trace
+
+def end_trace() -> Optional[Trace]:
+    """Detach and return the trace of this thread"""
+    trace = current_trace()
+    _local.trace = None
+    return trace
+
+def current_trace() -> Optional[Trace]:
+    """Trace of the request handled by this thread, None outside a request"""
+    return getattr(_local, 'trace', None)
+
+def record(stage: str, seconds: float, trace: Optional[Trace] = None):
+    """Account time spent in a stage
+
+    Inside a request the time is added to its trace, which observes each stage
+    once when it finishes; outside a request (e.g. the translation batcher
+    thread) every call is observed directly.
+    """
+    trace = trace if trace is not None else current_trace()
+    if trace is not None:
+        trace.add(stage, seconds)
+    else:
+        metrics.observe(STAGE_METRIC, seconds, stage=stage)
+
+@contextmanager
+def span(stage: str, trace: Optional[Trace] = None) -> Iterator[None]:
+    """Time a block as one stage, see record()"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started, trace)
+
+def render_gauge(name: str, help_text: str, values: Dict[Tuple[Tuple[str, str], ...], float]) -> str:
+    """A gauge in the Prometheus text format, values keyed by label set"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for labels, value in values.items():
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+    return '\n'.join(lines) + '\n'
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Render a label set as {name="value",...}"""
+    if not labels:
+        return ''
+    escaped = (
+        f'{name}="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        """One JSON object per line, tagged with the request ID of the current trace"""
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+
+        request_id = getattr(record, 'request_id', None)
+        if request_id is None:
+            trace = current_trace()
+            request_id = trace.request_id if trace is not None else None
+        if request_id is not None:
+            entry['request_id'] = request_id
+
+        entry.update(getattr(record, 'fields', {}))
+        if record.exc_info:
+            entry['error'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = 'INFO'):
+    """Send the application's logs to stdout as JSON lines, once per process"""
+    logger = logging.getLogger('asl')
+    logger.setLevel(level.upper())
+    if any(isinstance(handler.formatter, JsonFormatter) for handler in logger.handlers):
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    logger.addHandler(handler)
+    logger.propagate = False
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger of one backend module"""
+    return logging.getLogger(f'asl.{name}')
+
+
+metrics = MetricsRegistry()
+metrics.describe(STAGE_METRIC, 'Time spent in each processing stage, once per request or per call outside requests')
+metrics.describe(HTTP_METRIC, 'HTTP request handling time by endpoint and status')
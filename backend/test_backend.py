@@ -84,17 +84,18 @@ def test_file_upload():
     print("\n📁 Testing File Upload...")
     print("Note: This requires a video file to test")
     
-    # Create a simple test video file (1x1 pixel, 1 frame)
+    # Create a small test video (16x16 pixels, 1 frame of random noise)
     try:
         import cv2
         import numpy as np
         
         # Create a simple test video
         fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter('test_video.mp4', fourcc, 1.0, (1, 1))
+        out = cv2.VideoWriter('test_video.mp4', fourcc, 1.0, (16, 16))
         
-        # Create a single frame
-        frame = np.zeros((1, 1, 3), dtype=np.uint8)
+        # Random pixels make the bytes unique per run, so the upload is processed
+        # instead of answered from the deduplication index
+        frame = np.random.randint(0, 256, (16, 16, 3), dtype=np.uint8)
         out.write(frame)
         out.release()
         
@@ -106,21 +107,38 @@ def test_file_upload():
             files = {'video': ('test_video.mp4', f, 'video/mp4')}
             response = requests.post(f"{base_url}/upload", files=files)
             
-            if response.status_code == 200:
+            if response.status_code == 202:
                 data = response.json()
-                print(f"✅ Upload successful: {data['filename']}")
+                print(f"✅ Upload queued: {data['filename']}")
                 print(f"   File ID: {data['file_id']}")
                 
-                # Clean up test file
-                import os
-                os.remove('test_video.mp4')
-                print("✅ Test video cleaned up")
+                # Poll until the background worker has finished
+                for _ in range(60):
+                    result = requests.get(f"{base_url}/result/{data['file_id']}").json()
+                    if result.get('status') in ('done', 'failed'):
+                        break
+                    time.sleep(1)
+                print(f"   Processing status: {result.get('status')}")
+                
+            elif response.status_code == 200 and response.json().get('deduplicated'):
+                # Identical bytes were processed before, the result comes back right away
+                data = response.json()
+                result = data['result']
+                print(f"✅ Upload deduplicated: {data['filename']}")
+                print(f"   File ID: {data['file_id']}")
+                print(f"   Processing status: {data['status']}")
+                print(f"   Translation: {result['translation']['english_text']}")
                 
             else:
                 print(f"❌ Upload failed: {response.status_code}")
                 if response.text:
                     print(f"   Error: {response.text}")
         
+        # Clean up test file
+        import os
+        os.remove('test_video.mp4')
+        print("✅ Test video cleaned up")
+        
     except ImportError:
         print("⚠️  OpenCV not available, skipping file upload test")
     except Exception as e:
@@ -0,0 +1,142 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from telemetry import get_logger
+
+logger = get_logger('translation_cache')
+
+
+class TranslationCache:
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0, path: Optional[str] = None):
+        """Bounded LRU cache with per-entry TTL for translation results"""
+        self.max_size = max(0, max_size)
+        self.ttl = ttl
+        self.path = path
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if self.path:
+            self.load()
+            atexit.register(self.save)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up a cached value, refreshing its LRU position"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            created, value = entry
+            if self._is_expired(created):
+                del self._entries[key]
+                self._dirty = True
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(value)
+
+    def put(self, key: str, value: Dict):
+        """Store a value, evicting the least recently used entries past the size cap"""
+        if self.max_size == 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.time(), dict(value))
+            self._entries.move_to_end(key)
+            self._dirty = True
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def _is_expired(self, created: float) -> bool:
+        """Check whether an entry created at the given time has outlived the TTL"""
+        return self.ttl is not None and self.ttl > 0 and time.time() - created > self.ttl
+
+    def load(self):
+        """Load persisted entries from disk, skipping expired ones"""
+        if not self.path or not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading translation cache {self.path}: {e}")
+            return
+
+        with self._lock:
+            for key, created, value in data.get('entries', []):
+                if not self._is_expired(created):
+                    self._entries[key] = (created, value)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        logger.info(f"Loaded {len(self._entries)} cached translations from {self.path}")
+
+    def save(self):
+        """Persist the cache to disk if it changed since the last save"""
+        if not self.path:
+            return
+
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = [
+                [key, created, value]
+                for key, (created, value) in self._entries.items()
+                if not self._is_expired(created)
+            ]
+            self._dirty = False
+
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # Write to a temporary file first so a crash never leaves a truncated cache
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'entries': entries}, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving translation cache {self.path}: {e}")
+
+    def get_stats(self) -> Dict:
+        """Get cache size and hit/miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl': self.ttl,
+                'persistent': bool(self.path),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
@@ -0,0 +1,250 @@
+import re
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional, Tuple
+
+import numpy as np
+
+from telemetry import get_logger, span
+from translation_cache import TranslationCache
+
+logger = get_logger('translation')
+
+# Beam search settings shared by every inference runtime so their outputs agree
+MAX_OUTPUT_LENGTH = 128
+MIN_BEAMS = 4
+NO_REPEAT_NGRAM_SIZE = 2
+
+TRANSLATOR_BACKENDS = ('torch', 'onnx')
+
+# Ways to compile the torch decoder for CPU inference
+COMPILE_MODES = ('torch_compile',)
+
+def create_translator(backend: str = 'torch', **kwargs) -> 'BaseASLTranslator':
+    """Create a translator for the configured inference runtime"""
+    if backend == 'torch':
+        from t5 import T5ASLTranslator
+        return T5ASLTranslator(**kwargs)
+    
+    if backend == 'onnx':
+        from t5_onnx import ONNXT5ASLTranslator
+        return ONNXT5ASLTranslator(**kwargs)
+    
+    raise ValueError(f"Unknown translation backend: {backend}")
+
+class BaseASLTranslator(ABC):
+    def __init__(self, model_name: str, cache_size: int = 1024,
+                 cache_ttl: float = 3600.0, cache_path: Optional[str] = None):
+        """Shared preprocessing, batching and caching for ASL to English translators
+        
+        Subclasses load self.tokenizer and self.model and implement _generate
+        for their inference runtime.
+        """
+        self.model_name = model_name
+        self.cache = TranslationCache(max_size=cache_size, ttl=cache_ttl, path=cache_path)
+        self.tokenizer = None
+        self.model = None
+    
+    @property
+    def model_version(self) -> str:
+        """Identify the model and runtime producing translations"""
+        return self.model_name
+    
+    def preprocess_asl_sequence(self, asl_sequence: str) -> str:
+        """Preprocess ASL sequence for better translation"""
+        if not asl_sequence:
+            return ""
+        
+        # Clean up the sequence
+        sequence = asl_sequence.upper().strip()
+        
+        # Remove non-alphabetic characters
+        sequence = re.sub(r'[^A-Z]', '', sequence)
+        
+        # Add spaces between letters for better readability
+        sequence = ' '.join(sequence)
+        
+        return sequence
+    
+    def create_translation_prompt(self, asl_sequence: str) -> str:
+        """Create a prompt for T5 translation"""
+        if not asl_sequence:
+            return "translate ASL to English: "
+        
+        # Create a structured prompt
+        prompt = f"translate ASL to English: {asl_sequence}"
+        return prompt
+    
+    def translate_asl_to_english(self, asl_sequence: str) -> Dict:
+        """Translate ASL sequence to English"""
+        return self.batch_translate([asl_sequence])[0]
+    
+    def translate_with_suggestions(self, asl_sequence: str, num_suggestions: int = 3) -> Dict:
+        """Translate ASL sequence and return alternative translations from the same beam search"""
+        return self.batch_translate([asl_sequence], num_suggestions=num_suggestions)[0]
+    
+    def _error_result(self, error: str) -> Dict:
+        """Build a failed translation result"""
+        return {
+            'success': False,
+            'error': error,
+            'translation': '',
+            'confidence': 0.0
+        }
+    
+    def postprocess_translation(self, translation: str) -> str:
+        """Post-process the generated translation"""
+        if not translation:
+            return ""
+        
+        # Clean up the translation
+        translation = translation.strip()
+        
+        # Capitalize first letter
+        if translation:
+            translation = translation[0].upper() + translation[1:]
+        
+        # Ensure proper punctuation
+        if translation and not translation.endswith(('.', '!', '?')):
+            translation += '.'
+        
+        return translation
+    
+    def batch_translate(self, asl_sequences: List[str], batch_size: int = 32,
+                        num_suggestions: int = 0) -> List[Dict]:
+        """Translate multiple ASL sequences in length-bucketed batches"""
+        if self.model is None or self.tokenizer is None:
+            return [self._error_result('Model not loaded') for _ in asl_sequences]
+        
+        results = [None] * len(asl_sequences)
+        
+        # Requests that still need a generate call, grouped by processed sequence
+        pending = {}
+        
+        for i, asl_sequence in enumerate(asl_sequences):
+            try:
+                # Preprocess ASL sequence
+                processed_sequence = self.preprocess_asl_sequence(asl_sequence)
+            except Exception as e:
+                results[i] = self._error_result(str(e))
+                continue
+            
+            if not processed_sequence:
+                results[i] = self._error_result('Empty ASL sequence')
+                continue
+            
+            if processed_sequence in pending:
+                pending[processed_sequence].append((i, asl_sequence))
+                continue
+            
+            cached = self.cache.get(self._cache_key(processed_sequence, num_suggestions))
+            if cached is not None:
+                results[i] = self._success_result(asl_sequence, processed_sequence, cached)
+                continue
+            
+            pending[processed_sequence] = [(i, asl_sequence)]
+        
+        if not pending:
+            return results
+        
+        processed_sequences = list(pending)
+        
+        try:
+            # Tokenize every prompt in one call, padded to the longest one
+            prompts = [self.create_translation_prompt(processed) for processed in processed_sequences]
+            with span('t5_tokenize'):
+                inputs = self.tokenizer(
+                    prompts,
+                    return_tensors="np",
+                    padding=True,
+                    max_length=512,
+                    truncation=True
+                )
+        except Exception as e:
+            for waiting in pending.values():
+                for i, _ in waiting:
+                    results[i] = self._error_result(str(e))
+            return results
+        
+        # Sort by token length so each chunk carries as little padding as possible
+        lengths = inputs['attention_mask'].sum(axis=1).tolist()
+        order = sorted(range(len(processed_sequences)), key=lambda j: lengths[j])
+        batch_size = max(1, batch_size)
+        
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            
+            try:
+                # T5 pads on the right, so trimming to the chunk's longest prompt is lossless
+                chunk_length = max(lengths[j] for j in chunk)
+                input_ids = inputs['input_ids'][chunk, :chunk_length]
+                attention_mask = inputs['attention_mask'][chunk, :chunk_length]
+                
+                candidates = self._generate(input_ids, attention_mask, num_suggestions + 1)
+                
+                for j, beams in zip(chunk, candidates):
+                    processed_sequence = processed_sequences[j]
+                    translation, confidence = beams[0]
+                    
+                    output = {
+                        'translation': translation,
+                        'confidence': confidence
+                    }
+                    if num_suggestions > 0:
+                        output['suggestions'] = [alternative for alternative, _ in beams[1:]]
+                    
+                    self.cache.put(self._cache_key(processed_sequence, num_suggestions), output)
+                    
+                    for i, asl_sequence in pending[processed_sequence]:
+                        results[i] = self._success_result(asl_sequence, processed_sequence, output)
+                
+            except Exception as e:
+                for j in chunk:
+                    for i, _ in pending[processed_sequences[j]]:
+                        results[i] = self._error_result(str(e))
+        
+        return results
+    
+    def _cache_key(self, processed_sequence: str, num_suggestions: int) -> str:
+        """Build the cache key for a processed sequence and generation settings"""
+        return f"{self.model_version}|{num_suggestions}|{processed_sequence}"
+    
+    def _success_result(self, asl_sequence: str, processed_sequence: str, output: Dict) -> Dict:
+        """Build a successful translation result from generated or cached output"""
+        result = {
+            'success': True,
+            'translation': output['translation'],
+            'confidence': output['confidence'],
+            'original_asl': asl_sequence,
+            'processed_asl': processed_sequence
+        }
+        
+        if 'suggestions' in output:
+            result['suggestions'] = list(output['suggestions'])
+        
+        return result
+    
+    def get_cache_stats(self) -> Dict:
+        """Get translation cache statistics"""
+        return self.cache.get_stats()
+    
+    @abstractmethod
+    def _generate(self, input_ids: np.ndarray, attention_mask: np.ndarray,
+                  num_return_sequences: int = 1) -> List[List[Tuple[str, float]]]:
+        """Run beam search on a padded batch and return the top beams with their confidences"""
+    
+    def get_translation_suggestions(self, asl_sequence: str, num_suggestions: int = 3) -> List[str]:
+        """Get multiple translation suggestions for an ASL sequence"""
+        result = self.translate_with_suggestions(asl_sequence, num_suggestions)
+        
+        if not result['success']:
+            logger.error(f"Error generating suggestions: {result['error']}")
+            return []
+        
+        # Results only carry suggestions when some were requested
+        return result.get('suggestions', [])
+    
+    def cleanup(self):
+        """Clean up resources"""
+        self.cache.save()
+        self.model = None
+        self.tokenizer = None
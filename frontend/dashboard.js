@@ -163,7 +163,9 @@ class DashboardManager {
             isLocalVideo = true;
         }
         
-        const videoSrc = isLocalVideo ? video.video : `${this.backendUrl}/video/${fileId}`;
+        // The backend serves byte ranges, so seeking only fetches what is played; the
+        // preview falls back to the original when the server has previews turned off
+        const videoSrc = isLocalVideo ? video.video : `${this.backendUrl}/video/${fileId}?preview=1`;
         const videoTitle = video.name || video.filename || 'Untitled Video';
         const videoDate = video.date || video.upload_time || 'Unknown Date';
         const videoSize = video.size || video.file_size;
@@ -480,12 +482,11 @@ class DashboardManager {
 
     async uploadAndTranslateVideo(videoBlob) {
         try {
-            const formData = new FormData();
-            formData.append('video', videoBlob, 'asl_recording.webm');
-            
-            const response = await fetch(`${this.backendUrl}/upload`, {
+            // Send the raw webm body so the backend can start decoding before the upload finishes
+            const response = await fetch(`${this.backendUrl}/upload/stream?filename=asl_recording.webm`, {
                 method: 'POST',
-                body: formData
+                headers: { 'Content-Type': 'video/webm' },
+                body: videoBlob
             });
             
             if (!response.ok) {
@@ -493,7 +494,10 @@ class DashboardManager {
                 throw new Error(errorData.error || 'Upload failed');
             }
             
-            return await response.json();
+            const job = await response.json();
+            // Identical videos uploaded before are answered with their result right away
+            if (job.status === 'done') return job.result;
+            return await waitForResult(this.backendUrl, job.file_id);
             
         } catch (error) {
             console.error('Error uploading video:', error);
@@ -661,6 +665,21 @@ class DashboardManager {
     }
 }
 
+// Poll the backend until a queued video has been processed
+async function waitForResult(backendUrl, fileId, intervalMs = 1000) {
+    while (true) {
+        const response = await fetch(`${backendUrl}/result/${fileId}`);
+        const result = await response.json();
+        if (!response.ok || result.status === 'failed') {
+            throw new Error(result.error || 'Processing failed');
+        }
+        if (result.status === 'done') {
+            return result;
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
 // Replace backend fetch with PyScript calls
 async function translateASLText(aslText) {
     const result = await pyodide.runPythonAsync(`translate_asl("${aslText}")`);
@@ -743,7 +762,9 @@ function loadLocalVideos() {
                     translationDiv.innerHTML = `<span style="color:red;">Error: ${errorData.error || 'Upload failed'}</span>`;
                     return;
                 }
-                const result = await response.json();
+                const job = await response.json();
+                translationDiv.innerHTML = 'Processing...';
+                const result = job.status === 'done' ? job.result : await waitForResult('http://localhost:5000', job.file_id);
                 // Show only ASL sequence and suggestions
                 let resultHtml = '';
                 if (result.asl_recognition) {
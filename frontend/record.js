@@ -8,6 +8,13 @@ let isRecording = false;
 let backendUrl = 'http://localhost:5000';
 let currentVideoBlob = null;
 
+// Live fingerspelling state
+let liveSessionId = null;
+let liveEventSource = null;
+let liveFrameTimer = null;
+let liveFrameInFlight = false;
+const LIVE_FRAME_INTERVAL_MS = 100;
+
 document.addEventListener('DOMContentLoaded', function() {
     cameraFeed = document.getElementById('cameraFeed');
     startCameraBtn = document.getElementById('startCameraBtn');
@@ -26,6 +33,10 @@ document.addEventListener('DOMContentLoaded', function() {
     if (saveBtn) {
         saveBtn.addEventListener('click', saveVideo);
     }
+    const liveBtn = document.getElementById('liveBtn');
+    if (liveBtn) {
+        liveBtn.addEventListener('click', toggleLiveMode);
+    }
     
     // Add a Translate button event listener
     const translateBtn = document.getElementById('saveBtn');
@@ -260,21 +271,21 @@ function resetRecordingState() {
 
 // Replace uploadAndTranslateVideo with PyScript call
 async function uploadAndTranslateVideo(videoBlob) {
-    // Create FormData for upload
-    const formData = new FormData();
-    formData.append('video', videoBlob, 'asl_recording.webm');
-
     try {
         recordingStatus.textContent = 'Uploading and processing...';
-        const response = await fetch(backendUrl + '/upload', {
+        // Send the raw webm body so the backend can start decoding before the upload finishes
+        const response = await fetch(backendUrl + '/upload/stream?filename=asl_recording.webm', {
             method: 'POST',
-            body: formData
+            headers: { 'Content-Type': 'video/webm' },
+            body: videoBlob
         });
         if (!response.ok) {
             const errorData = await response.json();
             throw new Error(errorData.error || 'Upload failed');
         }
-        const result = await response.json();
+        const job = await response.json();
+        recordingStatus.textContent = 'Processing video...';
+        const result = job.status === 'done' ? job.result : await waitForResult(job.file_id);
         showTranslationResults(result);
         recordingStatus.textContent = 'Translation complete!';
     } catch (error) {
@@ -283,6 +294,103 @@ async function uploadAndTranslateVideo(videoBlob) {
     }
 }
 
+// Stream camera frames to the backend and show letters as they are recognized
+async function toggleLiveMode() {
+    const liveBtn = document.getElementById('liveBtn');
+    if (liveSessionId) {
+        stopLiveMode();
+        liveBtn.innerHTML = '<i class="fas fa-bolt"></i> Live Translate';
+        return;
+    }
+    if (!mediaStream) return;
+
+    try {
+        const response = await fetch(`${backendUrl}/live/session`, { method: 'POST' });
+        const session = await response.json();
+        if (!response.ok) {
+            throw new Error(session.error || 'Could not start live session');
+        }
+        liveSessionId = session.session_id;
+    } catch (error) {
+        console.error('Error starting live session:', error);
+        recordingStatus.textContent = 'Live translation is not available.';
+        return;
+    }
+
+    document.getElementById('liveResults').style.display = 'block';
+    document.getElementById('liveSequence').textContent = '';
+    document.getElementById('liveTranslation').textContent = '';
+    liveBtn.innerHTML = '<i class="fas fa-stop"></i> Stop Live';
+    recordingStatus.textContent = 'Live translation running...';
+
+    liveEventSource = new EventSource(`${backendUrl}/live/${liveSessionId}/events`);
+    liveEventSource.addEventListener('letter', (e) => {
+        const data = JSON.parse(e.data);
+        document.getElementById('liveSequence').textContent = data.sequence;
+    });
+    liveEventSource.addEventListener('translation', (e) => {
+        const data = JSON.parse(e.data);
+        if (data.success) {
+            document.getElementById('liveTranslation').textContent = data.translation;
+        }
+        document.getElementById('liveSequence').textContent = '';
+    });
+    liveEventSource.addEventListener('closed', () => {
+        liveEventSource.close();
+    });
+
+    const canvas = document.createElement('canvas');
+    canvas.width = 320;
+    canvas.height = 240;
+    const context = canvas.getContext('2d');
+
+    liveFrameTimer = setInterval(() => {
+        // Skip this tick if the previous frame is still uploading
+        if (liveFrameInFlight || !liveSessionId) return;
+        liveFrameInFlight = true;
+        context.drawImage(cameraFeed, 0, 0, canvas.width, canvas.height);
+        canvas.toBlob(async (blob) => {
+            try {
+                await fetch(`${backendUrl}/live/${liveSessionId}/frame`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'image/jpeg' },
+                    body: blob
+                });
+            } catch (error) {
+                console.error('Error sending live frame:', error);
+            } finally {
+                liveFrameInFlight = false;
+            }
+        }, 'image/jpeg', 0.7);
+    }, LIVE_FRAME_INTERVAL_MS);
+}
+
+function stopLiveMode() {
+    clearInterval(liveFrameTimer);
+    liveFrameTimer = null;
+    if (liveSessionId) {
+        // Closing the session translates any letters still buffered
+        fetch(`${backendUrl}/live/${liveSessionId}`, { method: 'DELETE' }).catch(() => {});
+    }
+    liveSessionId = null;
+    recordingStatus.textContent = 'Ready to record';
+}
+
+// Poll the backend until a queued video has been processed
+async function waitForResult(fileId, intervalMs = 1000) {
+    while (true) {
+        const response = await fetch(`${backendUrl}/result/${fileId}`);
+        const result = await response.json();
+        if (!response.ok || result.status === 'failed') {
+            throw new Error(result.error || 'Processing failed');
+        }
+        if (result.status === 'done') {
+            return result;
+        }
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
 // New function to show translation results
 function showTranslationResults(result) {
     // Hide recording controls